@@ -16,13 +16,37 @@
 # limitations under the License.
 
 from setuptools import setup
-import sys
+from setuptools.command.build_py import build_py
+from distutils import log
+import os, subprocess, sys
 
 if sys.version_info < (2, 7):
     sys.exit('ARIA requires Python 2.7+')
 if sys.version_info >= (3, 0):
     sys.exit('ARIA does not support Python 3')
 
+class build_py_with_compiled_profiles(build_py):
+    """
+    Also compiles the TOSCA profiles in the build, so that installed copies can load them without
+    parsing their YAML (see aria_extension_tosca.compiled_profiles). If they can't be compiled (for
+    example, if the requirements are not installed yet) the profiles are read from YAML at runtime.
+    """
+
+    def run(self):
+        build_py.run(self)
+        if self.dry_run:
+            return
+        log.info('compiling TOSCA profiles')
+        python_path = [os.path.abspath(self.build_lib)]
+        if os.environ.get('PYTHONPATH'):
+            python_path.append(os.environ['PYTHONPATH'])
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+        try:
+            subprocess.check_call([sys.executable, '-m', 'aria_extension_tosca.compiled_profiles'],
+                                  env=env)
+        except (OSError, subprocess.CalledProcessError) as e:
+            log.warn('could not compile TOSCA profiles: %s' % e)
+
 setup(
     name='aria',
     version='0.1',
@@ -75,10 +99,14 @@ setup(
             'web/**'],
         'aria_extension_tosca': [
             'profiles/tosca-simple-1.0/**',
-            'profiles/tosca-simple-nfv-1.0/**'],
+            'profiles/tosca-simple-nfv-1.0/**',
+            'profiles/*/*.compiled'],
         'aria_extension_open_o': [
             'web/**']},
     
+    cmdclass={
+        'build_py': build_py_with_compiled_profiles},
+    
     scripts=[
         'src/aria/scripts/aria',
         'src/aria/scripts/aria-rest',
@@ -91,7 +119,6 @@ setup(
         'Jinja2==2.8',
         'requests==2.11.1',
         'CacheControl[filecache]==0.11.6',
-        'shortuuid==0.4.3',
         'python-daemon==2.1.2'])
 
 setup(
@@ -146,10 +173,14 @@ setup(
             'web/**'],
         'aria_extension_tosca': [
             'profiles/tosca-simple-1.0/**',
-            'profiles/tosca-simple-nfv-1.0/**'],
+            'profiles/tosca-simple-nfv-1.0/**',
+            'profiles/*/*.compiled'],
         'aria_extension_open_o': [
             'web/**']},
     
+    cmdclass={
+        'build_py': build_py_with_compiled_profiles},
+    
     scripts=[
         'src/aria/scripts/aria',
         'src/aria/scripts/aria-rest',
@@ -162,5 +193,4 @@ setup(
         'Jinja2==2.8',
         'requests==2.11.1',
         'CacheControl[filecache]==0.11.6',
-        'shortuuid==0.4.3',
         'python-daemon==2.1.2'])
@@ -20,8 +20,9 @@ from .style import Style
 from .consumer import Consumer, ConsumerChain
 from .presentation import Read
 from .validation import Validate
-from .modeling import Model, Types, Instance
+from .modeling import Model, Types, Instance, InstallPlan
 from .inputs import Inputs
+from .snapshot import SaveSnapshot, LoadSnapshot, InstanceFromSnapshot
 
 __all__ = (
     'ConsumerException',
@@ -34,4 +35,8 @@ __all__ = (
     'Model',
     'Types',
     'Instance',
-    'Inputs')
+    'InstallPlan',
+    'Inputs',
+    'SaveSnapshot',
+    'LoadSnapshot',
+    'InstanceFromSnapshot')
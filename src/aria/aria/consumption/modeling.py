@@ -15,7 +15,7 @@
 #
 
 from .consumer import Consumer, ConsumerChain
-from ..utils import json_dumps, yaml_dumps
+from ..utils import json_dumps, yaml_dumps, json_dump, yaml_dump, puts
 
 class Derive(Consumer):
     """
@@ -39,6 +39,7 @@ class CoerceModelValues(Consumer):
     """
 
     def consume(self):
+        self.context.modeling.start_coercion_pass()
         self.context.modeling.model.coerce_values(self.context, None, True)
 
 class ValidateModel(Consumer):
@@ -60,12 +61,12 @@ class Model(ConsumerChain):
     def dump(self):
         if self.context.has_arg_switch('yaml'):
             indent = self.context.get_arg_value_int('indent', 2)
-            raw = self.context.modeling.model_as_raw
-            self.context.write(yaml_dumps(raw, indent=indent))
+            raw = self.context.modeling.model_as_lazy_raw
+            yaml_dump(raw, self.context, indent=indent)
         elif self.context.has_arg_switch('json'):
             indent = self.context.get_arg_value_int('indent', 2)
-            raw = self.context.modeling.model_as_raw
-            self.context.write(json_dumps(raw, indent=indent))
+            raw = self.context.modeling.model_as_lazy_raw
+            json_dump(raw, self.context, indent=indent)
         else:
             self.context.modeling.model.dump(self.context)
 
@@ -101,9 +102,12 @@ class Instantiate(Consumer):
 class CoerceInstanceValues(Consumer):
     """
     Coerces values in the service instance.
+    
+    Values that were made final by a previous pass are skipped.
     """
 
     def consume(self):
+        self.context.modeling.start_coercion_pass()
         self.context.modeling.instance.coerce_values(self.context, None, True)
 
 class ValidateInstance(Consumer):
@@ -143,11 +147,42 @@ class Instance(ConsumerChain):
             self.context.modeling.instance.dump_graph(self.context)
         elif self.context.has_arg_switch('yaml'):
             indent = self.context.get_arg_value_int('indent', 2)
-            raw = self.context.modeling.instance_as_raw
+            raw = self.context.modeling.instance_as_lazy_raw
+            yaml_dump(raw, self.context, indent=indent)
+        elif self.context.has_arg_switch('json'):
+            indent = self.context.get_arg_value_int('indent', 2)
+            raw = self.context.modeling.instance_as_lazy_raw
+            json_dump(raw, self.context, indent=indent)
+        else:
+            self.context.modeling.instance.dump(self.context)
+
+class InstallPlan(Consumer):
+    """
+    Generates the install plan: nodes partitioned into dependency waves that can each be
+    installed in parallel.
+    """
+
+    def consume(self):
+        if self.context.modeling.instance is None:
+            self.context.validation.report('InstallPlan consumer: missing service instance')
+            return
+
+        self.context.modeling.install_waves = self.context.modeling.instance.get_install_waves(self.context)
+
+    def dump(self):
+        if self.context.has_arg_switch('yaml'):
+            indent = self.context.get_arg_value_int('indent', 2)
+            raw = self.context.modeling.install_plan_as_raw
             self.context.write(yaml_dumps(raw, indent=indent))
         elif self.context.has_arg_switch('json'):
             indent = self.context.get_arg_value_int('indent', 2)
-            raw = self.context.modeling.instance_as_raw
+            raw = self.context.modeling.install_plan_as_raw
             self.context.write(json_dumps(raw, indent=indent))
         else:
-            self.context.modeling.instance.dump(self.context)
+            waves = self.context.modeling.install_waves
+            puts('Critical path length: %d' % len(waves))
+            for index, wave in enumerate(waves):
+                puts(self.context.style.section('Wave %d (%d nodes):' % (index + 1, len(wave))))
+                with self.context.style.indent:
+                    for node_id in wave:
+                        puts(self.context.style.node(node_id))
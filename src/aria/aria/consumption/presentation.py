@@ -28,7 +28,9 @@ class Read(Consumer):
     :class:`aria.reader.Reader`, and :class:`aria.presenter.Presenter` instances.
 
     It supports agnostic raw data composition for presenters that have
-    :code:`_get_import_locations` and :code:`_merge_import`.
+    :code:`_get_import_locations` and :code:`_merge_import`. Presenters that have
+    :code:`_get_compiled_import` can provide the agnostic raw data of imports without them being
+    read.
     
     To improve performance, loaders are called asynchronously on separate threads.
     
@@ -90,7 +92,12 @@ class Read(Consumer):
         # Link the context to this thread
         self.context.set_thread_local()
         
-        raw = self._read(location, origin_location)
+        raw = None
+        if (presenter_class is not None) and hasattr(presenter_class, '_get_compiled_import'):
+            # The presenter may have a precompiled version of the import
+            raw = presenter_class._get_compiled_import(self.context, location, origin_location)
+        if raw is None:
+            raw = self._read(location, origin_location)
 
         if self.context.presentation.presenter_class is not None:
             # The presenter class we specified in the context overrides everything 
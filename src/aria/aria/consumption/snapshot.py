@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .consumer import Consumer, ConsumerChain
+from .inputs import Inputs
+from .modeling import Instance
+from ..loading import UriLocation
+from ..modeling import save_snapshot, load_snapshot
+from cStringIO import StringIO
+
+class SaveSnapshot(Consumer):
+    """
+    Saves a binary snapshot of the service model and types to the file given by the
+    :code:`--snapshot` argument.
+    
+    The snapshot is keyed by the hash of all the documents that were read.
+    """
+    
+    def consume(self):
+        if self.context.modeling.model is None:
+            self.context.validation.report('SaveSnapshot consumer: missing service model')
+            return
+
+        path = self.context.get_arg_value('snapshot')
+        if path is None:
+            self.context.validation.report('SaveSnapshot consumer: missing "--snapshot" argument')
+            return
+
+        # Save into memory first, so that a failure doesn't leave a broken file behind
+        snapshot = StringIO()
+        save_snapshot(self.context.modeling, snapshot, self.context.reading.documents_hash)
+        with open(path, 'wb') as f:
+            f.write(snapshot.getvalue())
+
+    def dump(self):
+        self.context.write('%s\n' % self.context.reading.documents_hash)
+
+class LoadSnapshot(Consumer):
+    """
+    Loads the service model and types from a binary snapshot file given by the :code:`--snapshot`
+    argument, or else from the presentation location.
+    
+    If documents were read before (usually the service template the snapshot was saved from), the
+    snapshot's key must match their hash, so that a stale snapshot is not loaded.
+    
+    The key of the loaded snapshot is stored in :code:`snapshot_key`.
+    """
+    
+    def __init__(self, context):
+        super(LoadSnapshot, self).__init__(context)
+        self.snapshot_key = None
+
+    def consume(self):
+        path = self.context.get_arg_value('snapshot')
+        if (path is None) and isinstance(self.context.presentation.location, UriLocation):
+            path = self.context.presentation.location.uri
+        if path is None:
+            self.context.validation.report('LoadSnapshot consumer: missing "--snapshot" argument')
+            return
+
+        key = self.context.reading.documents_hash if self.context.reading.documents_count else None
+        with open(path, 'rb') as f:
+            self.snapshot_key = load_snapshot(self.context.modeling, f, key)
+
+class InstanceFromSnapshot(ConsumerChain):
+    """
+    Generates the service instance from a binary snapshot, skipping reading, validation, and
+    modeling.
+    """
+    
+    def __init__(self, context):
+        super(InstanceFromSnapshot, self).__init__(context, (LoadSnapshot, Inputs, Instance))
+
+    def dump(self):
+        self.consumers[-1].dump()
@@ -14,8 +14,13 @@
 # under the License.
 #
 
-from .exceptions import CannotEvaluateFunctionException
-from .context import IdType, ModelingContext
+from .exceptions import CannotEvaluateFunctionException, InvalidSnapshotException
+from .context import IdType, CoercionCounters, ModelingContext
+from .evaluation import EvaluationGraph
+from .indexes import NodeTemplateIndex, ValueIndex
+from .utils import IdGenerator
+from .snapshot import save_snapshot, load_snapshot, read_snapshot_key
+from .diff import diff_instances
 from .elements import Element, ModelElement, Function, Parameter, Metadata
 from .instance_elements import ServiceInstance, Node, Capability, Relationship, Artifact, Group, Policy, GroupPolicy, GroupPolicyTrigger, Mapping, Substitution, Interface, Operation
 from .model_elements import ServiceModel, NodeTemplate, RequirementTemplate, CapabilityTemplate, RelationshipTemplate, ArtifactTemplate, GroupTemplate, PolicyTemplate, GroupPolicyTemplate, GroupPolicyTriggerTemplate, MappingTemplate, SubstitutionTemplate, InterfaceTemplate, OperationTemplate
@@ -23,8 +28,18 @@ from .types import TypeHierarchy, Type, RelationshipType, PolicyType, PolicyTrig
 
 __all__ = (
     'CannotEvaluateFunctionException',
+    'InvalidSnapshotException',
     'IdType',
+    'CoercionCounters',
     'ModelingContext',
+    'EvaluationGraph',
+    'NodeTemplateIndex',
+    'ValueIndex',
+    'IdGenerator',
+    'save_snapshot',
+    'load_snapshot',
+    'read_snapshot_key',
+    'diff_instances',
     'Element',
     'ModelElement',
     'Function',
@@ -14,11 +14,13 @@
 # under the License.
 #
 
-from .utils import generate_id_string
+from .utils import IdGenerator
 from .types import TypeHierarchy
+from .evaluation import EvaluationGraph
+from .indexes import NodeTemplateIndex, InstanceIndex
 from ..utils import StrictDict, prune, puts, as_raw
 import itertools
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 class IdType(object):
     LOCAL_SERIAL = 0
@@ -36,14 +38,40 @@ class IdType(object):
     Universally unique ID (UUID): 25 random safe characters.
     """
 
+class CoercionCounters(object):
+    """
+    Counts the parameters handled in a single coercion pass.
+    
+    Properties:
+    
+    * :code:`coerced`: Number of parameters that were coerced
+    * :code:`skipped`: Number of parameters that were skipped because their values were already final
+    """
+    
+    def __init__(self):
+        self.coerced = 0
+        self.skipped = 0
+
+    @property
+    def as_raw(self):
+        return OrderedDict((
+            ('coerced', self.coerced),
+            ('skipped', self.skipped)))
+
 class ModelingContext(object):
     """
     Properties:
     
     * :code:`model`: The generated service model
     * :code:`instance`: The generated service instance
+    * :code:`install_waves`: The install plan for the service instance: list of waves of node IDs
+    * :code:`coercion_passes`: List of :class:`CoercionCounters`, one per coercion pass
+    * :code:`evaluation_graph`: :class:`EvaluationGraph` of memoized function values
+    * :code:`node_template_index`: :class:`NodeTemplateIndex` of the model (built on first use)
+    * :code:`instance_index`: :class:`InstanceIndex` of the instance (built on first use)
     * :code:`id_type`: Type of IDs to use for instances
     * :code:`id_max_length`: Maximum allowed instance ID length
+    * :code:`id_generator`: :class:`IdGenerator` for random IDs (create it with a seed for reproducible IDs)
     * :code:`inputs`: Dict of inputs values
     * :code:`node_types`: The generated hierarchy of node types
     * :code:`group_types`: The generated hierarchy of group types
@@ -56,12 +84,16 @@ class ModelingContext(object):
     """
 
     def __init__(self):
+        self.evaluation_graph = EvaluationGraph(self._add_dependent)
         self.model = None
         self.instance = None
+        self.install_waves = None
+        self.coercion_passes = []
         #self.id_type = IdType.LOCAL_SERIAL
         #self.id_type = IdType.LOCAL_RANDOM
         self.id_type = IdType.UNIVERSAL_RANDOM
         self.id_max_length = 63 # See: http://www.faqs.org/rfcs/rfc1035.html
+        self.id_generator = IdGenerator()
         self.inputs = StrictDict(key_class=basestring)
         self.node_types = TypeHierarchy()
         self.group_types = TypeHierarchy()
@@ -74,22 +106,129 @@ class ModelingContext(object):
         
         self._serial_id_counter = itertools.count(1)
         self._locally_unique_ids = set()
+        self._evaluating_parameters = []
+        self._input_dependents = {}
+        self._parameter_dependents = {}
+        self._node_template_index = None
+        self._instance_index = None
     
     def generate_id(self):
         if self.id_type == IdType.LOCAL_SERIAL:
             return self._serial_id_counter.next()
         
         elif self.id_type == IdType.LOCAL_RANDOM:
-            the_id = generate_id_string(6)
+            the_id = self.id_generator.generate(6)
             while the_id in self._locally_unique_ids:
-                the_id = generate_id_string(6)
+                the_id = self.id_generator.generate(6)
             self._locally_unique_ids.add(the_id)
             return the_id
         
-        return generate_id_string()
+        return self.id_generator.generate()
     
+    @property
+    def instance(self):
+        return self._instance
+
+    @instance.setter
+    def instance(self, value):
+        self._instance = value
+        self.evaluation_graph.invalidate()
+        self._input_dependents = {}
+        self._parameter_dependents = {}
+        self._node_template_index = None
+        self._instance_index = None
+
+    @property
+    def node_template_index(self):
+        if (self._node_template_index is None) or (self._node_template_index.model is not self.model):
+            self._node_template_index = NodeTemplateIndex(self.model)
+        return self._node_template_index
+
+    @property
+    def instance_index(self):
+        if (self._instance_index is None) or (self._instance_index.instance is not self.instance):
+            self._instance_index = InstanceIndex(self.instance)
+        return self._instance_index
+
+    def reset_instance_index(self):
+        """
+        Discards the :class:`InstanceIndex`. Must be called when nodes or relationships are added to
+        the instance.
+        """
+
+        self._instance_index = None
+
+    def begin_parameter_evaluation(self, parameter, container):
+        self._evaluating_parameters.append((parameter, container))
+
+    def end_parameter_evaluation(self):
+        self._evaluating_parameters.pop()
+
+    def record_input_dependency(self, name):
+        """
+        Records that the parameter currently being evaluated depends on an input.
+        
+        Should be called by functions that read inputs.
+        """
+        
+        self._record_dependency(('input', name))
+
+    def record_parameter_dependency(self, parameter):
+        """
+        Records that the parameter currently being evaluated depends on another parameter.
+        
+        Should be called by functions that read parameters.
+        """
+
+        self._record_dependency(('parameter', parameter))
+
+    def _record_dependency(self, dependency):
+        self.evaluation_graph.add_dependency(dependency)
+        self._add_dependent(dependency)
+
+    def _add_dependent(self, dependency):
+        if not self._evaluating_parameters:
+            return
+        parameter, container = self._evaluating_parameters[-1]
+        kind, value = dependency
+        if kind == 'input':
+            self._input_dependents.setdefault(value, OrderedDict())[id(parameter)] = (parameter, container)
+        elif value is not parameter:
+            self._parameter_dependents.setdefault(id(value), OrderedDict())[id(parameter)] = (parameter, container)
+
+    def get_input_dependents(self, names):
+        """
+        Returns all parameters that depend on the inputs, directly or via other parameters, as a list
+        of (parameter, container) tuples.
+        """
+        
+        dependents = OrderedDict()
+        pending = deque()
+        for name in names:
+            pending.extend(self._input_dependents.get(name, {}).iteritems())
+        while pending:
+            key, dependent = pending.popleft()
+            if key not in dependents:
+                dependents[key] = dependent
+                pending.extend(self._parameter_dependents.get(key, {}).iteritems())
+        return dependents.values()
+
+    def start_coercion_pass(self):
+        counters = CoercionCounters()
+        self.coercion_passes.append(counters)
+        return counters
+
+    def count_coercion(self, coerced):
+        if self.coercion_passes:
+            counters = self.coercion_passes[-1]
+            if coerced:
+                counters.coerced += 1
+            else:
+                counters.skipped += 1
+
     def set_input(self, name, value):
         self.inputs[name] = value
+        self.evaluation_graph.invalidate()
         # TODO: coerce to validate type
     
     @property
@@ -106,15 +245,33 @@ class ModelingContext(object):
 
     @property
     def model_as_raw(self):
-        raw = self.model.as_raw
-        prune(raw)
-        return raw
+        return prune(self.model.as_raw)
 
     @property
     def instance_as_raw(self):
-        raw = self.instance.as_raw
-        prune(raw)
-        return raw
+        return prune(self.instance.as_raw)
+
+    @property
+    def install_plan_as_raw(self):
+        """
+        The install waves as raw data. :code:`fan_out` is the size of each wave, which is the
+        number of nodes that can be installed in parallel at that point in the plan.
+        """
+        
+        waves = [list(wave) for wave in self.install_waves]
+        return OrderedDict((
+            ('critical_path_length', len(waves)),
+            ('fan_out', [len(wave) for wave in waves]),
+            ('install', waves),
+            ('uninstall', waves[::-1])))
+
+    @property
+    def model_as_lazy_raw(self):
+        return self.model.as_lazy_raw
+
+    @property
+    def instance_as_lazy_raw(self):
+        return self.instance.as_lazy_raw
 
     def dump_types(self, context):
         if self.node_types.children:
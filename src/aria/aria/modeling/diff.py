@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from ..utils import JsonAsRawEncoder, as_raw, as_raw_dict
+from collections import OrderedDict
+import hashlib
+
+NODE_SECTIONS = ('properties', 'interfaces', 'artifacts', 'capabilities', 'relationships')
+
+_ENCODER = JsonAsRawEncoder(sort_keys=True, separators=(',', ':'))
+
+def diff_instances(old, new):
+    """
+    Computes the structural difference between two :class:`ServiceInstance` instances, returning a
+    compact patch that turns the old instance into the new one.
+
+    The patch is a list of steps in the format used by Cloudify deployment updates: each is a dict
+    with :code:`action` ("add", "remove" or "modify"), :code:`entity_type`, :code:`entity_id` (a
+    colon-separated path, e.g. "nodes:web_server_x:properties:port") and, for additions and
+    modifications, the new raw :code:`value`.
+
+    Nodes and groups are matched by ID first and then, for the remaining ones, by template name in
+    order, so that a freshly instantiated service (with new IDs) can still be compared against a
+    deployed one. Matched elements keep their old IDs in the patch, and references to nodes in the
+    new instance are translated accordingly. Relationships are matched by (source node,
+    requirement index, target node).
+
+    Elements are compared by cheap keys first: elements that are only in one of the instances are
+    added or removed, and nodes that changed their type are replaced, without fingerprinting them.
+    Only the remaining ones are compared via hashed fingerprints computed bottom-up, so that
+    unchanged subtrees are skipped without comparing their contents.
+    """
+
+    steps = []
+
+    node_ids = _match_ids(old.nodes, new.nodes)
+    group_ids = _match_ids(old.groups, new.groups)
+    translate_node_id = lambda node_id: node_ids.get(node_id, node_id)
+    translate_group_id = lambda group_id: group_ids.get(group_id, group_id)
+
+    # Nodes
+    old_nodes = OrderedDict((v.id, v) for v in old.nodes.itervalues())
+    new_nodes = OrderedDict((node_ids[v.id], v) for v in new.nodes.itervalues())
+    new_raw = lambda node_id: _translate_node(as_raw(new_nodes[node_id]), node_id, translate_node_id)
+    for node_id, node in old_nodes.iteritems():
+        new_node = new_nodes.get(node_id)
+        if new_node is None:
+            steps.append(_step('remove', 'node', ('nodes', node_id)))
+            continue
+        if new_node.type_name != node.type_name:
+            # Nodes cannot change their type, so we must replace them
+            steps.append(_step('remove', 'node', ('nodes', node_id)))
+            steps.append(_step('add', 'node', ('nodes', node_id), new_raw(node_id)))
+            continue
+        fingerprint, _, sections = _fingerprint_node(as_raw(node))
+        new_fingerprint, _, new_sections = _fingerprint_node(new_raw(node_id))
+        if new_fingerprint == fingerprint:
+            continue
+        for section in NODE_SECTIONS:
+            _diff_fingerprints(steps, _SECTION_ENTITY_TYPES[section], ('nodes', node_id, section), sections[section], new_sections[section])
+    for node_id in new_nodes.iterkeys():
+        if node_id not in old_nodes:
+            steps.append(_step('add', 'node', ('nodes', node_id), new_raw(node_id)))
+
+    # Groups
+    old_groups = OrderedDict((v.id, as_raw(v)) for v in old.groups.itervalues())
+    new_groups = OrderedDict()
+    for v in new.groups.itervalues():
+        raw = as_raw(v)
+        raw['id'] = group_ids[v.id]
+        raw['member_node_ids'] = [translate_node_id(i) for i in raw['member_node_ids']]
+        raw['member_group_ids'] = [translate_group_id(i) for i in raw['member_group_ids']]
+        new_groups[raw['id']] = raw
+    _diff_raws(steps, 'group', ('groups',), old_groups, new_groups)
+
+    # Policies
+    old_policies = OrderedDict((k, as_raw(v)) for k, v in old.policies.iteritems())
+    new_policies = OrderedDict()
+    for k, v in new.policies.iteritems():
+        raw = as_raw(v)
+        raw['target_node_ids'] = [translate_node_id(i) for i in raw['target_node_ids']]
+        raw['target_group_ids'] = [translate_group_id(i) for i in raw['target_group_ids']]
+        new_policies[k] = raw
+    _diff_raws(steps, 'policy', ('policies',), old_policies, new_policies)
+
+    # Inputs, outputs and operations
+    _diff_raws(steps, 'input', ('inputs',), as_raw_dict(old.inputs), as_raw_dict(new.inputs))
+    _diff_raws(steps, 'output', ('outputs',), as_raw_dict(old.outputs), as_raw_dict(new.outputs))
+    _diff_raws(steps, 'operation', ('operations',), as_raw_dict(old.operations), as_raw_dict(new.operations))
+
+    return steps
+
+#
+# Utils
+#
+
+_SECTION_ENTITY_TYPES = {
+    'properties': 'property',
+    'interfaces': 'interface',
+    'artifacts': 'artifact',
+    'capabilities': 'capability',
+    'relationships': 'relationship'}
+
+def _match_ids(old_elements, new_elements):
+    """
+    Returns a dict mapping IDs of new elements to the IDs of their matching old elements. Unmatched
+    new elements are mapped to their own IDs.
+    """
+
+    ids = {}
+    new_elements = OrderedDict((v.id, v) for v in new_elements.itervalues())
+    unmatched_old = OrderedDict()
+    for element in old_elements.itervalues():
+        new_element = new_elements.get(element.id)
+        if (new_element is not None) and (new_element.template_name == element.template_name):
+            ids[element.id] = element.id
+        else:
+            unmatched_old.setdefault(element.template_name, []).append(element.id)
+    for element_id, element in new_elements.iteritems():
+        if element_id not in ids:
+            candidates = unmatched_old.get(element.template_name)
+            ids[element_id] = candidates.pop(0) if candidates else element_id
+    return ids
+
+def _translate_node(raw, node_id, translate_node_id):
+    raw['id'] = node_id
+    for relationship in raw['relationships']:
+        relationship['target_node_id'] = translate_node_id(relationship['target_node_id'])
+    return raw
+
+def _fingerprint(raw):
+    return hashlib.sha1(_ENCODER.encode(raw)).hexdigest()
+
+def _fingerprint_dict(raws):
+    return OrderedDict((k, (_fingerprint(v), v)) for k, v in raws.iteritems())
+
+def _fingerprint_node(raw):
+    """
+    Returns a (fingerprint, raw, sections) tuple, where each section is an ordered dict of
+    (fingerprint, raw) tuples. The node's fingerprint is computed from the fingerprints of its
+    sections' elements, so none are encoded twice.
+    """
+
+    sections = OrderedDict()
+    sections['properties'] = _fingerprint_dict(raw['properties'])
+    for section in ('interfaces', 'artifacts', 'capabilities'):
+        sections[section] = _fingerprint_dict(OrderedDict((v['name'], v) for v in raw[section]))
+    relationships = OrderedDict()
+    for relationship in raw['relationships']:
+        key = '[%s]:%s' % (relationship['source_requirement_index'], relationship['target_node_id'])
+        unique_key = key
+        occurrence = 1
+        while unique_key in relationships:
+            occurrence += 1
+            unique_key = '%s:%d' % (key, occurrence)
+        relationships[unique_key] = relationship
+    sections['relationships'] = _fingerprint_dict(relationships)
+
+    fingerprint = hashlib.sha1()
+    fingerprint.update(_fingerprint((raw['type_name'], raw['template_name'])))
+    for section, elements in sections.iteritems():
+        fingerprint.update(section)
+        for key, (element_fingerprint, _) in elements.iteritems():
+            fingerprint.update(key)
+            fingerprint.update(element_fingerprint)
+    return fingerprint.hexdigest(), raw, sections
+
+def _diff_fingerprints(steps, entity_type, path, old, new):
+    for key, (fingerprint, _) in old.iteritems():
+        if key not in new:
+            steps.append(_step('remove', entity_type, path + (key,)))
+        elif new[key][0] != fingerprint:
+            steps.append(_step('modify', entity_type, path + (key,), new[key][1]))
+    for key, (_, raw) in new.iteritems():
+        if key not in old:
+            steps.append(_step('add', entity_type, path + (key,), raw))
+
+def _diff_raws(steps, entity_type, path, old, new):
+    """
+    Like :code:`_diff_fingerprints`, but for raw values, so that only those that are in both are
+    fingerprinted.
+    """
+
+    for key, raw in old.iteritems():
+        if key not in new:
+            steps.append(_step('remove', entity_type, path + (key,)))
+        elif _fingerprint(new[key]) != _fingerprint(raw):
+            steps.append(_step('modify', entity_type, path + (key,), new[key]))
+    for key, raw in new.iteritems():
+        if key not in old:
+            steps.append(_step('add', entity_type, path + (key,), raw))
+
+def _step(action, entity_type, path, value=None):
+    step = OrderedDict((
+        ('action', action),
+        ('entity_type', entity_type),
+        ('entity_id', ':'.join(path))))
+    if value is not None:
+        step['value'] = value
+    return step
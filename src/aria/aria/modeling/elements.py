@@ -14,9 +14,9 @@
 # under the License.
 #
 
-from .utils import coerce_value
+from .utils import coerce_value, is_value_final
 from .. import UnimplementedFunctionalityError
-from ..utils import StrictDict, full_type_name, puts
+from ..utils import StrictDict, full_type_name, puts, deepcopy_with_locators
 from collections import OrderedDict
 
 class Function(object):
@@ -74,6 +74,24 @@ class Parameter(ModelElement):
     Represents a typed value.
 
     This class is used by both service model and service instance elements.
+    
+    Once coercion leaves no unevaluated functions in the value, it is considered final and
+    further coercion passes skip it. Assigning a new value resets this.
+    
+    The value as it was before functions were evaluated is kept, so that it can be restored via
+    :code:`reset_value` and coerced again (for example, when inputs change).
+    
+    Instantiated parameters share their value with the template (copy-on-write), and coercion keeps
+    sharing the parts of the value that contain no functions. Use :code:`mutable_value` in order
+    to modify the value in place, and assign :code:`value` in order to replace it.
+    
+    Properties:
+    
+    * :code:`type_name`: Name of the value's type
+    * :code:`value`: The value
+    * :code:`description`: Description
+    * :code:`is_final`: True if coercing the value again would not change it
+    * :code:`is_shared`: True if the value (or parts of it) may be shared with other values
     """
     
     def __init__(self, type_name, value, description):
@@ -81,6 +99,39 @@ class Parameter(ModelElement):
         self.value = value
         self.description = description
 
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._source_value = None
+        self.is_final = False
+        self.is_shared = False
+
+    @property
+    def mutable_value(self):
+        """
+        The value for modifying in place. If it is still shared, it is copied first.
+        """
+        
+        if self.is_shared:
+            self._value = deepcopy_with_locators(self._value)
+            self.is_shared = False
+        return self._value
+
+    def reset_value(self):
+        """
+        Restores the value to what it was before functions were evaluated.
+        """
+        
+        if self._source_value is not None:
+            # The source value is kept for further resets (and may be the template's value)
+            self._value = self._source_value
+            self.is_shared = True
+        self.is_final = False
+
     @property
     def as_raw(self):
         return OrderedDict((
@@ -89,11 +140,33 @@ class Parameter(ModelElement):
             ('description', self.description)))
 
     def instantiate(self, context, container):
-        return Parameter(self.type_name, self.value, self.description)
+        r = Parameter(self.type_name, self.value, self.description)
+        r.is_final = self.is_final
+        if isinstance(self._value, (list, dict)):
+            # Both must copy the value before modifying it
+            self.is_shared = True
+            r.is_shared = True
+        return r
 
     def coerce_values(self, context, container, report_issues):
-        if self.value is not None:
-            self.value = coerce_value(context, container, self.value, report_issues)
+        if self.is_final:
+            context.modeling.count_coercion(False)
+            return
+        if self._value is not None:
+            context.modeling.begin_parameter_evaluation(self, container)
+            try:
+                value = coerce_value(context, container, self._value, report_issues)
+            finally:
+                context.modeling.end_parameter_evaluation()
+            if (self._source_value is None) and (not is_value_final(self._value)):
+                self._source_value = self._value
+            if value is not self._value:
+                # The value was replaced, but a new list or dict may still contain parts of the
+                # source value or the values of other parameters (returned by functions)
+                self._value = value
+                self.is_shared = isinstance(value, (list, dict))
+        self.is_final = is_value_final(self._value)
+        context.modeling.count_coercion(True)
 
 class Metadata(ModelElement):
     """
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import InvalidValueError
+from ..validation import Issue
+from collections import OrderedDict
+
+class EvaluationGraph(object):
+    """
+    Memoizes the results of intrinsic function evaluation.
+    
+    Nodes of the graph are either (entity, property path) pairs, used by functions that read
+    properties (such as :code:`get_property`), or (container, function) pairs, used for every
+    function evaluated via :code:`evaluate_function` (the coercer evaluates all functions this way,
+    and functions should evaluate their nested functions this way, too). Evaluating a node that
+    depends on other nodes evaluates them first, so that dependencies are always resolved in
+    topological order, and each node is evaluated only once. A dependency cycle raises
+    :class:`InvalidValueError`, which is reported as an issue by the coercer.
+    
+    Functions that cannot be evaluated yet (such as :code:`get_attribute` while modeling) raise
+    :class:`CannotEvaluateFunctionException`, so nothing is memoized for them.
+    
+    Results that depend on inputs are only valid as long as the inputs don't change, so the
+    :class:`ModelingContext` invalidates the graph when inputs are set or a new instance is
+    created.
+    
+    Dependencies (such as inputs) reported via :code:`add_dependency` while a node is being
+    evaluated are remembered with the node's value. When a memoized value is reused, its
+    dependencies are reported again to :code:`on_dependency`, so that the caller's dependency
+    tracking stays accurate.
+    
+    Supports :code:`cache_info` like :class:`cachedmethod`.
+    """
+    
+    def __init__(self, on_dependency=None):
+        self.on_dependency = on_dependency
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+        self._dependencies = {}
+        self._evaluating = OrderedDict()
+    
+    def evaluate(self, entity, path, fn, locator=None, name=None):
+        """
+        Returns the memoized value of the (entity, path) node, calling :code:`fn` to evaluate it
+        if it has not been evaluated yet. The name by which the entity was referred to (such as
+        :code:`SELF` or a template name) is only used, with the path, to describe the node in case
+        of a cycle, so the same node is shared however the entity is referred to.
+        
+        Exceptions raised by :code:`fn` (such as :class:`CannotEvaluateFunctionException`) are
+        propagated and nothing is memoized, so that evaluation can be retried later.
+        """
+        
+        description = ([name] if name is not None else []) + list(path)
+        return self._evaluate((id(entity), tuple(path)), entity, '.'.join(str(v) for v in description), fn, locator)
+
+    def evaluate_function(self, context, container, function):
+        """
+        Returns the memoized value of the function evaluated for the container, calling the
+        function's :code:`_evaluate` if it has not been evaluated yet.
+        
+        Exceptions are propagated as in :code:`evaluate`.
+        """
+        
+        return self._evaluate((id(container), id(function)), (container, function), None, lambda: function._evaluate(context, container), getattr(function, 'locator', None))
+    
+    def add_dependency(self, dependency):
+        """
+        Adds a dependency to all nodes currently being evaluated.
+        """
+        
+        for _, dependencies in self._evaluating.itervalues():
+            dependencies.append(dependency)
+
+    def invalidate(self):
+        self._values = {}
+        self._dependencies = {}
+
+    def cache_info(self):
+        return (self.hits, self.misses, None, len(self._values))
+
+    def reset_cache_info(self):
+        self.hits = 0
+        self.misses = 0
+
+    def _evaluate(self, key, owner, description, fn, locator):
+        if key in self._values:
+            self.hits += 1
+            for dependency in self._dependencies[key]:
+                self.add_dependency(dependency)
+                if self.on_dependency is not None:
+                    self.on_dependency(dependency)
+            return self._values[key][1]
+        
+        if key in self._evaluating:
+            # Function nodes are not described, because the property paths say it all
+            keys = self._evaluating.keys()
+            cycle = [self._evaluating[k][0] for k in keys[keys.index(key):] if self._evaluating[k][0] is not None]
+            raise InvalidValueError('cyclical function evaluation: %s' % ' -> '.join(cycle + cycle[:1]), locator=locator, level=Issue.BETWEEN_TYPES)
+
+        self._evaluating[key] = (description, [])
+        try:
+            value = fn()
+        finally:
+            _, dependencies = self._evaluating.pop(key)
+
+        # We are keeping a reference to the owner in order to make sure its id (and those of its
+        # parts) are not reused
+        self._values[key] = (owner, value)
+        self._dependencies[key] = dependencies
+        self.misses += 1
+        return value
@@ -20,3 +20,8 @@ class CannotEvaluateFunctionException(AriaException):
     """
     ARIA modeling exception: cannot evaluate the function at this time.
     """
+
+class InvalidSnapshotException(AriaException):
+    """
+    ARIA modeling exception: the snapshot could not be saved or loaded.
+    """
@@ -0,0 +1,224 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from bisect import bisect_left, bisect_right
+
+class NodeTemplateIndex(object):
+    """
+    Indexes the node templates of a :class:`ServiceModel`, so that finding the targets of
+    requirements does not require scanning the whole topology.
+
+    Node templates are identified by their position in the model, so that results keep the model's
+    order. The indexes are built lazily, the first time they are queried, and are not updated if
+    the model changes: :class:`ModelingContext` discards them when the model is replaced or a new
+    instance is set.
+
+    Constraints in :code:`target_node_template_constraints` may support the index by having a
+    :code:`select` method (see :meth:`find_candidates`).
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.node_templates = model.node_templates.values() if model is not None else []
+        self._type_positions = {}
+        self._value_indexes = {}
+        self._candidates = {}
+        self._relationship_templates = None
+
+    def find_candidates(self, context, type_name, constraints):
+        """
+        Returns the node templates of the type or its descendants that may match all the
+        constraints, in order.
+
+        A constraint supports the index if it has a :code:`select(context, index)` method that
+        returns the set of positions of the node templates that may match it, or None if it cannot
+        be answered by the index. The result must not depend on the container (constraints that do
+        should return None), because candidates are cached per type and constraints. Constraints are
+        only used to narrow down the candidates, so they must still be applied to each of them.
+        """
+
+        constraints = tuple(constraints) if constraints else ()
+        key = (type_name,) + tuple(id(v) for v in constraints)
+        cached = self._candidates.get(key)
+        if cached is not None:
+            return cached[1]
+
+        positions = self.get_type_positions(context, type_name)
+        for constraint in constraints:
+            select = getattr(constraint, 'select', None)
+            if select is not None:
+                selected = select(context, self)
+                if selected is not None:
+                    positions = selected.intersection(positions)
+        candidates = [self.node_templates[position] for position in sorted(positions)]
+
+        # We are keeping a reference to the constraints in order to make sure their ids are not reused
+        self._candidates[key] = (constraints, candidates)
+        return candidates
+
+    def get_type_positions(self, context, type_name):
+        """
+        Returns the set of positions of the node templates of the type or its descendants.
+        """
+
+        positions = self._type_positions.get(type_name)
+        if positions is None:
+            positions = set()
+            for position, node_template in enumerate(self.node_templates):
+                if context.modeling.node_types.is_descendant(type_name, node_template.type_name):
+                    positions.add(position)
+            positions = frozenset(positions)
+            self._type_positions[type_name] = positions
+        return positions
+
+    def get_value_index(self, key, get_value):
+        """
+        Returns the :class:`ValueIndex` of a value of the node templates, which is built on first use
+        by calling :code:`get_value` with each node template. The key identifies the value (e.g. a
+        property name).
+        """
+
+        value_index = self._value_indexes.get(key)
+        if value_index is None:
+            value_index = ValueIndex([get_value(v) for v in self.node_templates])
+            self._value_indexes[key] = value_index
+        return value_index
+
+    def get_relationship_templates(self, template_name):
+        """
+        Returns the relationship templates of the requirement templates with the template name, in
+        order.
+        """
+
+        if self._relationship_templates is None:
+            relationship_templates = {}
+            for node_template in self.node_templates:
+                for requirement_template in node_template.requirement_templates:
+                    relationship_template = requirement_template.relationship_template
+                    if relationship_template is not None:
+                        relationship_templates.setdefault(relationship_template.template_name, []).append(relationship_template)
+            self._relationship_templates = relationship_templates
+        return self._relationship_templates.get(template_name, [])
+
+class InstanceIndex(object):
+    """
+    Indexes the nodes of a :class:`ServiceInstance` and their relationships by the names of their
+    templates, in order.
+
+    The index is built when created and is not updated if the instance changes:
+    :class:`ModelingContext` discards it when a new instance is set, after the nodes are
+    instantiated, and after requirements are satisfied.
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
+        self._nodes = {}
+        self._relationships = {}
+        if instance is not None:
+            for node in instance.nodes.itervalues():
+                self._nodes.setdefault(node.template_name, []).append(node)
+                for relationship in node.relationships:
+                    if relationship.template_name is not None:
+                        self._relationships.setdefault(relationship.template_name, []).append(relationship)
+
+    def find_nodes(self, node_template_name):
+        """
+        Returns the nodes instantiated from the node template, in order.
+        """
+
+        return self._nodes.get(node_template_name, [])
+
+    def find_relationships(self, relationship_template_name):
+        """
+        Returns the relationships instantiated from the relationship template, in order.
+        """
+
+        return self._relationships.get(relationship_template_name, [])
+
+class ValueIndex(object):
+    """
+    Indexes a value of node templates for equality and range queries, which return sets of node
+    template positions.
+
+    Only plain values (strings, numbers, booleans and None) are indexed for equality, and only
+    numbers and None for ranges. We can't tell whether other values (such as data type instances
+    with their own comparison methods) would match, so their positions are included in the results
+    of all queries.
+    """
+
+    PLAIN_TYPES = (basestring, int, long, float, bool, type(None))
+    NUMBER_TYPES = (int, long, float, bool)
+
+    def __init__(self, values):
+        self._positions = {}
+        self._unindexed = set()
+        self._unsorted = set()
+
+        sorted_values = []
+        for position, value in enumerate(values):
+            if isinstance(value, self.PLAIN_TYPES) and (value == value): # NaN is not equal to itself
+                self._positions.setdefault(value, set()).add(position)
+                if (value is None) or isinstance(value, self.NUMBER_TYPES):
+                    sorted_values.append((value, position))
+                else:
+                    self._unsorted.add(position)
+            else:
+                self._unindexed.add(position)
+                self._unsorted.add(position)
+
+        sorted_values.sort()
+        self._sorted_values = [v for v, _ in sorted_values]
+        self._sorted_positions = [p for _, p in sorted_values]
+
+    def select_equal(self, value):
+        """
+        Returns the positions of values that may be equal to the value, or None if it can't be
+        answered by the index.
+        """
+
+        if not isinstance(value, self.PLAIN_TYPES):
+            return None
+        return self._unindexed.union(self._positions.get(value, ()))
+
+    def select_equal_any(self, values):
+        """
+        Returns the positions of values that may be equal to any of the values, or None if it can't
+        be answered by the index.
+        """
+
+        positions = set(self._unindexed)
+        for value in values:
+            if not isinstance(value, self.PLAIN_TYPES):
+                return None
+            positions.update(self._positions.get(value, ()))
+        return positions
+
+    def select_range(self, lower=None, upper=None, include_lower=True, include_upper=True):
+        """
+        Returns the positions of values that may be within the range, or None if it can't be
+        answered by the index. Bounds must be numbers, or None if unbounded.
+        """
+
+        for bound in (lower, upper):
+            if (bound is not None) and ((not isinstance(bound, self.NUMBER_TYPES)) or (bound != bound)):
+                return None
+        start = 0
+        end = len(self._sorted_values)
+        if lower is not None:
+            start = bisect_left(self._sorted_values, lower) if include_lower else bisect_right(self._sorted_values, lower)
+        if upper is not None:
+            end = bisect_right(self._sorted_values, upper) if include_upper else bisect_left(self._sorted_values, upper)
+        return self._unsorted.union(self._sorted_positions[start:end])
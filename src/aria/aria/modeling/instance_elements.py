@@ -15,9 +15,9 @@
 #
 
 from .elements import Element, Parameter
-from .utils import validate_dict_values, validate_list_values, coerce_dict_values, coerce_list_values, dump_list_values, dump_dict_values, dump_parameters, dump_interfaces
+from .utils import iter_pruned_raw, validate_dict_values, validate_list_values, coerce_dict_values, coerce_list_values, dump_list_values, dump_dict_values, dump_parameters, dump_interfaces
 from ..validation import Issue
-from ..utils import StrictList, StrictDict, FrozenList, puts, indent, as_raw, as_raw_list, as_raw_dict, as_agnostic, safe_repr 
+from ..utils import StrictList, StrictDict, FrozenList, puts, indent, as_raw, as_raw_list, as_raw_dict, as_agnostic, safe_repr, prune, is_removable
 from collections import OrderedDict
 
 class ServiceInstance(Element):
@@ -50,12 +50,14 @@ class ServiceInstance(Element):
         self.inputs = StrictDict(key_class=basestring, value_class=Parameter)
         self.outputs = StrictDict(key_class=basestring, value_class=Parameter)
         self.operations = StrictDict(key_class=basestring, value_class=Operation)
+        self._node_groups = None
 
     def satisfy_requirements(self, context):
         satisfied = True
         for node in self.nodes.itervalues():
             if not node.satisfy_requirements(context):
                 satisfied = False
+        context.modeling.reset_instance_index()
         return satisfied
     
     def validate_capabilities(self, context):
@@ -84,6 +86,32 @@ class ServiceInstance(Element):
 
     def get_group_ids(self, group_template_name):
         return FrozenList((group.id for group in self.find_groups(group_template_name)))
+
+    def find_node_groups(self, node_id):
+        """
+        Returns the groups of which the node is a member, in order.
+        
+        Uses the index built by :meth:`index_node_groups`, which is built on first use if it wasn't
+        built when the groups were instantiated.
+        """
+        
+        if self._node_groups is None:
+            self.index_node_groups()
+        return self._node_groups.get(node_id, FrozenList())
+
+    def index_node_groups(self):
+        """
+        Indexes the groups by their member node IDs. Must be called again if groups or their members
+        change.
+        """
+        
+        node_groups = OrderedDict()
+        for group in self.groups.itervalues():
+            for node_id in group.member_node_ids:
+                groups = node_groups.setdefault(node_id, [])
+                if (not groups) or (groups[-1] is not group):
+                    groups.append(group)
+        self._node_groups = dict((k, FrozenList(v)) for k, v in node_groups.iteritems())
     
     def is_node_a_target(self, context, target_node):
         for node in self.nodes.itervalues():
@@ -103,6 +131,90 @@ class ServiceInstance(Element):
                             return True
         return False
 
+    def update_inputs(self, context, inputs):
+        """
+        Changes input values and re-coerces only the parameters that depend on them, keeping all
+        node IDs.
+        
+        Dependencies are those recorded while the parameters were last coerced.
+        
+        Returns the nodes that have changed.
+        """
+        
+        names = []
+        for name, value in inputs.iteritems():
+            if name not in self.inputs:
+                context.validation.report('input "%s" is not supported' % name)
+                continue
+            context.modeling.set_input(name, value)
+            the_input = self.inputs[name]
+            if the_input.value != value:
+                the_input.value = value
+                names.append(name)
+        
+        dependents = context.modeling.get_input_dependents(names)
+        
+        # All values must be reset before any is coerced, because they may depend on each other
+        old_values = []
+        for parameter, _ in dependents:
+            old_values.append(parameter.value)
+            parameter.reset_value()
+        
+        nodes = OrderedDict()
+        for (parameter, container), old_value in zip(dependents, old_values):
+            parameter.coerce_values(context, container, True)
+            if isinstance(container, Node) and (parameter.value != old_value):
+                nodes[container.id] = container
+        
+        return FrozenList(nodes.itervalues())
+
+    def get_install_waves(self, context):
+        """
+        Partitions the nodes into dependency waves using Kahn's algorithm, in O(V+E).
+        
+        A node depends on the targets of its relationships, so every node in a wave can be
+        installed in parallel once all previous waves are installed. Uninstall order is the
+        reverse. The number of waves is the critical path length.
+        
+        Nodes participating in a relationship cycle cannot be ordered and are reported as a
+        validation issue. Nodes that only depend on a cycle cannot be ordered either, but are not
+        reported, so that the issue names only the nodes in the cycle.
+        """
+        
+        in_degrees = OrderedDict()
+        dependents = {}
+        for node_id in self.nodes.iterkeys():
+            in_degrees[node_id] = 0
+            dependents[node_id] = []
+        for node in self.nodes.itervalues():
+            for relationship in node.relationships:
+                target_node_id = relationship.target_node_id
+                if (target_node_id in dependents) and (target_node_id != node.id):
+                    in_degrees[node.id] += 1
+                    dependents[target_node_id].append(node.id)
+
+        waves = []
+        wave = [node_id for node_id, in_degree in in_degrees.iteritems() if in_degree == 0]
+        count = 0
+        while wave:
+            waves.append(FrozenList(wave))
+            count += len(wave)
+            next_wave = []
+            for node_id in wave:
+                for dependent_id in dependents[node_id]:
+                    in_degrees[dependent_id] -= 1
+                    if in_degrees[dependent_id] == 0:
+                        next_wave.append(dependent_id)
+            wave = next_wave
+        
+        if count < len(in_degrees):
+            unordered_node_ids = [node_id for node_id, in_degree in in_degrees.iteritems() if in_degree > 0]
+            cyclical_node_ids = _find_cyclical_node_ids(unordered_node_ids, dependents)
+            cyclic_node_ids = [node_id for node_id in unordered_node_ids if node_id in cyclical_node_ids]
+            context.validation.report('nodes have cyclical relationships and cannot be ordered: %s' % ', '.join(safe_repr(v) for v in cyclic_node_ids), level=Issue.BETWEEN_INSTANCES)
+        
+        return FrozenList(waves)
+
     @property
     def as_raw(self):
         return OrderedDict((
@@ -116,6 +228,30 @@ class ServiceInstance(Element):
             ('outputs', as_raw_dict(self.outputs)),
             ('operations', as_raw_list(self.operations))))
     
+    @property
+    def as_lazy_raw(self):
+        """
+        Like :code:`as_raw`, but already pruned, and with generators instead of lists of elements.
+        Elements are thus converted one at a time while being consumed, which allows for streaming
+        via :code:`json_dump`, :code:`yaml_dump` and :code:`iter_json` without materializing the
+        whole instance.
+        """
+        
+        raw = OrderedDict((
+            ('description', self.description),
+            ('metadata', prune(as_raw(self.metadata))),
+            ('nodes', iter_pruned_raw(self.nodes) if self.nodes else None),
+            ('groups', iter_pruned_raw(self.groups) if self.groups else None),
+            ('policies', iter_pruned_raw(self.policies) if self.policies else None),
+            ('substitution', prune(as_raw(self.substitution))),
+            ('inputs', prune(as_raw_dict(self.inputs))),
+            ('outputs', prune(as_raw_dict(self.outputs))),
+            ('operations', iter_pruned_raw(self.operations) if self.operations else None)))
+        for k, v in raw.items():
+            if is_removable(raw, k, v):
+                del raw[k]
+        return raw
+
     def validate(self, context):
         if self.metadata is not None:
             self.metadata.validate(context)
@@ -948,3 +1084,57 @@ class Operation(Element):
             if self.retry_interval is not None:
                 puts('Retry interval: %s' % context.style.literal(self.retry_interval))
             dump_parameters(context, self.inputs, 'Inputs')
+
+#
+# Utils
+#
+
+def _find_cyclical_node_ids(node_ids, dependents):
+    """
+    Returns the set of node IDs that are in a cycle, using Tarjan's strongly connected components
+    algorithm (iteratively, so that long dependency chains don't exceed the recursion limit). Only
+    edges between the given nodes are followed.
+    """
+
+    node_ids = set(node_ids)
+    indexes = {}
+    lowlinks = {}
+    stack = []
+    on_stack = set()
+    cyclical_node_ids = set()
+    for root_id in node_ids:
+        if root_id in indexes:
+            continue
+        indexes[root_id] = lowlinks[root_id] = len(indexes)
+        stack.append(root_id)
+        on_stack.add(root_id)
+        work = [(root_id, iter(dependents[root_id]))]
+        while work:
+            node_id, dependent_ids = work[-1]
+            for dependent_id in dependent_ids:
+                if dependent_id not in node_ids:
+                    continue
+                if dependent_id not in indexes:
+                    indexes[dependent_id] = lowlinks[dependent_id] = len(indexes)
+                    stack.append(dependent_id)
+                    on_stack.add(dependent_id)
+                    work.append((dependent_id, iter(dependents[dependent_id])))
+                    break
+                if dependent_id in on_stack:
+                    lowlinks[node_id] = min(lowlinks[node_id], indexes[dependent_id])
+            else:
+                work.pop()
+                if work:
+                    parent_id = work[-1][0]
+                    lowlinks[parent_id] = min(lowlinks[parent_id], lowlinks[node_id])
+                if lowlinks[node_id] == indexes[node_id]:
+                    component = []
+                    while True:
+                        member_id = stack.pop()
+                        on_stack.discard(member_id)
+                        component.append(member_id)
+                        if member_id == node_id:
+                            break
+                    if len(component) > 1:
+                        cyclical_node_ids.update(component)
+    return cyclical_node_ids
@@ -18,11 +18,10 @@ from __future__ import absolute_import # so we can import standard 'types'
 
 from .elements import ModelElement, Parameter
 from .instance_elements import ServiceInstance, Node, Capability, Relationship, Artifact, Group, Policy, GroupPolicy, GroupPolicyTrigger, Mapping, Substitution, Interface, Operation
-from .utils import validate_dict_values, validate_list_values, coerce_dict_values, coerce_list_values, instantiate_dict, dump_list_values, dump_dict_values, dump_parameters, dump_interfaces
+from .utils import iter_pruned_raw, validate_dict_values, validate_list_values, coerce_dict_values, coerce_list_values, instantiate_dict, dump_list_values, dump_dict_values, dump_parameters, dump_interfaces
 from ..validation import Issue
-from ..utils import StrictList, StrictDict, puts, safe_repr, as_raw, as_raw_list, as_raw_dict, as_agnostic, deepcopy_with_locators
+from ..utils import StrictList, StrictDict, puts, safe_repr, as_raw, as_raw_list, as_raw_dict, as_agnostic, prune, is_removable
 from collections import OrderedDict
-from types import FunctionType
 
 class ServiceModel(ModelElement):
     """
@@ -69,11 +68,33 @@ class ServiceModel(ModelElement):
             ('outputs', as_raw_dict(self.outputs)),
             ('operation_templates', as_raw_list(self.operation_templates))))
 
+    @property
+    def as_lazy_raw(self):
+        """
+        Like :code:`as_raw`, but already pruned, and with generators instead of lists of elements.
+        See :code:`ServiceInstance.as_lazy_raw`.
+        """
+        
+        raw = OrderedDict((
+            ('description', self.description),
+            ('metadata', prune(as_raw(self.metadata))),
+            ('node_templates', iter_pruned_raw(self.node_templates) if self.node_templates else None),
+            ('group_templates', iter_pruned_raw(self.group_templates) if self.group_templates else None),
+            ('policy_templates', iter_pruned_raw(self.policy_templates) if self.policy_templates else None),
+            ('substitution_template', prune(as_raw(self.substitution_template))),
+            ('inputs', prune(as_raw_dict(self.inputs))),
+            ('outputs', prune(as_raw_dict(self.outputs))),
+            ('operation_templates', iter_pruned_raw(self.operation_templates) if self.operation_templates else None)))
+        for k, v in raw.items():
+            if is_removable(raw, k, v):
+                del raw[k]
+        return raw
+
     def instantiate(self, context, container):
         r = ServiceInstance()
         context.modeling.instance = r
         
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         
         if self.metadata is not None:
             r.metadata = self.metadata.instantiate(context, container)
@@ -82,8 +103,10 @@ class ServiceModel(ModelElement):
             for _ in range(node_template.default_instances):
                 node = node_template.instantiate(context, container)
                 r.nodes[node.id] = node
+        context.modeling.reset_instance_index()
 
         instantiate_dict(context, self, r.groups, self.group_templates)
+        r.index_node_groups()
         instantiate_dict(context, self, r.policies, self.policy_templates)
         instantiate_dict(context, self, r.operations, self.operation_templates)
         
@@ -159,7 +182,7 @@ class NodeTemplate(ModelElement):
     * :code:`artifact_templates`: Dict of :class:`ArtifactTemplate`
     * :code:`capability_templates`: Dict of :class:`CapabilityTemplate`
     * :code:`requirement_templates`: List of :class:`RequirementTemplate`
-    * :code:`target_node_template_constraints`: List of :class:`FunctionType`
+    * :code:`target_node_template_constraints`: List of callables that accept context, target node template, and container (see :class:`NodeTemplateIndex` for optional support of the index)
     """
     
     def __init__(self, name, type_name):
@@ -179,12 +202,12 @@ class NodeTemplate(ModelElement):
         self.artifact_templates = StrictDict(key_class=basestring, value_class=ArtifactTemplate)
         self.capability_templates = StrictDict(key_class=basestring, value_class=CapabilityTemplate)
         self.requirement_templates = StrictList(value_class=RequirementTemplate)
-        self.target_node_template_constraints = StrictList(value_class=FunctionType)
+        self.target_node_template_constraints = StrictList()
     
-    def is_target_node_valid(self, target_node_template):
+    def is_target_node_valid(self, context, target_node_template):
         if self.target_node_template_constraints:
             for node_type_constraint in self.target_node_template_constraints:
-                if not node_type_constraint(target_node_template, self):
+                if not node_type_constraint(context, target_node_template, self):
                     return False
         return True
 
@@ -253,7 +276,7 @@ class RequirementTemplate(ModelElement):
     * :code:`name`: Name
     * :code:`target_node_type_name`: Must be represented in the :class:`ModelingContext`
     * :code:`target_node_template_name`: Must be represented in the :class:`ServiceModel`
-    * :code:`target_node_template_constraints`: List of :class:`FunctionType`
+    * :code:`target_node_template_constraints`: List of callables that accept context, target node template, and container (see :class:`NodeTemplateIndex` for optional support of the index)
     * :code:`target_capability_type_name`: Type of capability in target node
     * :code:`target_capability_name`: Name of capability in target node
     * :code:`relationship_template`: :class:`RelationshipTemplate`
@@ -278,7 +301,7 @@ class RequirementTemplate(ModelElement):
         self.name = name
         self.target_node_type_name = target_node_type_name
         self.target_node_template_name = target_node_template_name
-        self.target_node_template_constraints = StrictList(value_class=FunctionType)
+        self.target_node_template_constraints = StrictList()
         self.target_capability_type_name = target_capability_type_name
         self.target_capability_name = target_capability_name
         self.relationship_template = None # optional
@@ -288,7 +311,7 @@ class RequirementTemplate(ModelElement):
         if self.target_node_template_name is not None:
             target_node_template = context.modeling.model.node_templates.get(self.target_node_template_name)
             
-            if not source_node_template.is_target_node_valid(target_node_template):
+            if not source_node_template.is_target_node_valid(context, target_node_template):
                 context.validation.report('requirement "%s" of node template "%s" is for node template "%s" but it does not match constraints' % (self.name, self.target_node_template_name, source_node_template.name), level=Issue.BETWEEN_TYPES)
                 return None, None
             
@@ -303,11 +326,10 @@ class RequirementTemplate(ModelElement):
 
         # Find first node that matches the type
         elif self.target_node_type_name is not None:
-            for target_node_template in context.modeling.model.node_templates.itervalues():
-                if not context.modeling.node_types.is_descendant(self.target_node_type_name, target_node_template.type_name):
-                    continue
-                
-                if not source_node_template.is_target_node_valid(target_node_template):
+            # The index narrows down the candidates to those of the type that may match the constraints
+            constraints = list(source_node_template.target_node_template_constraints) + list(self.target_node_template_constraints)
+            for target_node_template in context.modeling.node_template_index.find_candidates(context, self.target_node_type_name, constraints):
+                if not source_node_template.is_target_node_valid(context, target_node_template):
                     continue
     
                 target_node_capability = self.find_target_capability(context, source_node_template, target_node_template)
@@ -415,7 +437,7 @@ class CapabilityTemplate(ModelElement):
         # Apply requirement constraints
         if requirement.target_node_template_constraints:
             for node_type_constraint in requirement.target_node_template_constraints:
-                if not node_type_constraint(target_node_template, source_node_template):
+                if not node_type_constraint(context, target_node_template, source_node_template):
                     return False
         
         return True
@@ -577,7 +599,7 @@ class ArtifactTemplate(ModelElement):
 
     def instantiate(self, context, container):
         r = Artifact(self.name, self.type_name, self.source_path)
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         r.target_path = self.target_path
         r.repository_url = self.repository_url
         r.repository_credential = self.repository_credential
@@ -794,7 +816,7 @@ class GroupPolicyTemplate(ModelElement):
 
     def instantiate(self, context, container):
         r = GroupPolicy(self.name, self.type_name)
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         instantiate_dict(context, container, r.properties, self.properties)
         instantiate_dict(context, container, r.triggers, self.triggers)
         return r
@@ -852,7 +874,7 @@ class GroupPolicyTriggerTemplate(ModelElement):
 
     def instantiate(self, context, container):
         r = GroupPolicyTrigger(self.name, self.implementation)
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         instantiate_dict(context, container, r.properties, self.properties)
         return r
 
@@ -993,12 +1015,12 @@ class InterfaceTemplate(ModelElement):
             ('name', self.name),
             ('description', self.description),
             ('type_name', self.type_name),
-            ('inputs', as_raw_dict(self.properties)),
+            ('inputs', as_raw_dict(self.inputs)),
             ('operation_templates', as_raw_list(self.operation_templates))))
 
     def instantiate(self, context, container):
         r = Interface(self.name, self.type_name)
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         instantiate_dict(context, container, r.inputs, self.inputs)
         instantiate_dict(context, container, r.operations, self.operation_templates)
         return r
@@ -1067,7 +1089,7 @@ class OperationTemplate(ModelElement):
 
     def instantiate(self, context, container):
         r = Operation(self.name)
-        r.description = deepcopy_with_locators(self.description)
+        r.description = self.description
         r.implementation = self.implementation
         r.dependencies = self.dependencies
         r.executor = self.executor
@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .exceptions import InvalidSnapshotException
+from collections import OrderedDict
+import cPickle, zlib, struct
+
+SNAPSHOT_MAGIC = 'ARIASNAP'
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_TYPE_HIERARCHIES = (
+    'node_types',
+    'group_types',
+    'capability_types',
+    'relationship_types',
+    'policy_types',
+    'policy_trigger_types',
+    'artifact_types',
+    'interface_types')
+
+def save_snapshot(modeling_context, out, key):
+    """
+    Writes a binary snapshot of the service model and type hierarchies of a
+    :class:`ModelingContext` to :code:`out` (anything with a :code:`write` method).
+    
+    The format is a header (magic, version, key) followed by a zlib-compressed pickle. The key
+    should identify the source of the model, usually via :code:`ReadingContext.documents_hash`.
+    
+    Nothing is written if the model cannot be pickled.
+    """
+    
+    content = OrderedDict()
+    content['model'] = modeling_context.model
+    for name in SNAPSHOT_TYPE_HIERARCHIES:
+        content[name] = getattr(modeling_context, name)
+    try:
+        data = zlib.compress(cPickle.dumps(content, cPickle.HIGHEST_PROTOCOL))
+    except (cPickle.PicklingError, TypeError) as e:
+        raise InvalidSnapshotException('service model cannot be saved in an ARIA snapshot: %s' % e)
+
+    out.write(SNAPSHOT_MAGIC)
+    out.write(struct.pack('!HH', SNAPSHOT_VERSION, len(key)))
+    out.write(key)
+    out.write(data)
+
+def load_snapshot(modeling_context, the_input, key=None):
+    """
+    Reads a binary snapshot written by :code:`save_snapshot` from :code:`the_input` (anything with
+    a :code:`read` method) into a :class:`ModelingContext`, replacing its service model and type
+    hierarchies.
+    
+    If :code:`key` is not None, the snapshot must have been saved with the same key, otherwise it
+    is considered stale and is not loaded.
+    
+    Returns the snapshot's key.
+    """
+    
+    snapshot_key = read_snapshot_key(the_input)
+    if (key is not None) and (snapshot_key != key):
+        raise InvalidSnapshotException('stale ARIA snapshot: key is %s, expected %s' % (snapshot_key, key))
+    try:
+        content = cPickle.loads(zlib.decompress(the_input.read()))
+    except Exception as e:
+        raise InvalidSnapshotException('malformed ARIA snapshot content: %s' % e)
+    
+    modeling_context.model = content['model']
+    for name in SNAPSHOT_TYPE_HIERARCHIES:
+        setattr(modeling_context, name, content[name])
+    return snapshot_key
+
+def read_snapshot_key(the_input):
+    """
+    Reads just the header of a binary snapshot written by :code:`save_snapshot` from
+    :code:`the_input` (anything with a :code:`read` method), returning the snapshot's key.
+    """
+    
+    if the_input.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise InvalidSnapshotException('not an ARIA snapshot')
+    try:
+        version, key_length = struct.unpack('!HH', the_input.read(struct.calcsize('!HH')))
+    except struct.error as e:
+        raise InvalidSnapshotException('malformed ARIA snapshot header: %s' % e)
+    if version != SNAPSHOT_VERSION:
+        raise InvalidSnapshotException('unsupported ARIA snapshot version: %d' % version)
+    return the_input.read(key_length)
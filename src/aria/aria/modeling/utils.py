@@ -17,25 +17,66 @@
 from .exceptions import CannotEvaluateFunctionException
 from .. import InvalidValueError
 from ..presentation import Value
-from ..utils import puts
+from ..utils import puts, prune, as_raw
 from collections import OrderedDict
-from shortuuid import ShortUUID
-from random import randrange
+from random import Random, randrange
+from threading import Lock
+import os
 
-#UUID = ShortUUID() # default alphabet is base57, which is alphanumeric without visually ambiguous characters; ID length is 22
-UUID = ShortUUID(alphabet='abcdefghijklmnopqrstuvwxyz0123456789') # alphanumeric; ID length is 25
+ID_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789' # alphanumeric
+ID_LENGTH = 25 # 25 alphanumeric characters hold more entropy than a UUID's 122 random bits
 
-def generate_id_string(length=None):
+# Maps each random byte to an alphabet character; bytes beyond the largest multiple of the
+# alphabet length are rejected, so that all characters are equally likely
+_ID_MAX_BYTE = 256 - (256 % len(ID_ALPHABET))
+_ID_TABLE = ''.join(ID_ALPHABET[b % len(ID_ALPHABET)] if b < _ID_MAX_BYTE else '\0' for b in xrange(256))
+_ID_REJECTED_BYTES = ''.join(chr(b) for b in xrange(_ID_MAX_BYTE, 256))
+
+class IdGenerator(object):
     """
-    A random string with a strong guarantee of universal uniqueness (uses UUID).
+    Generates random ID strings from :code:`ID_ALPHABET`.
+    
+    Entropy is drawn in bulk (from :code:`os.urandom` by default) and encoded via a translation
+    table, so that generating many IDs is cheap.
+    
+    If a seed is provided the IDs are generated by a seeded pseudo-random generator instead, which
+    is useful for reproducible instantiation (in tests, or for diffing instances).
     
-    The default length is 25 characters.
+    Safe to use from multiple threads. After a fork, an unseeded generator discards the entropy it
+    buffered in the parent process, so that the child process doesn't generate the same IDs.
     """
     
-    the_id = UUID.uuid()
-    if length is not None:
-        the_id = the_id[:length]
-    return the_id
+    def __init__(self, seed=None, batch_size=4096):
+        self.batch_size = batch_size
+        self._random = Random(seed) if seed is not None else None
+        self._buffer = ''
+        self._position = 0
+        self._pid = os.getpid()
+        self._lock = Lock()
+
+    def generate(self, length=None):
+        if length is None:
+            length = ID_LENGTH
+        with self._lock:
+            if (self._random is None) and (self._pid != os.getpid()):
+                self._buffer = ''
+                self._position = 0
+                self._pid = os.getpid()
+            end = self._position + length
+            while end > len(self._buffer):
+                self._fill()
+                end = self._position + length
+            the_id = self._buffer[self._position:end]
+            self._position = end
+            return the_id
+
+    def _fill(self):
+        if self._random is not None:
+            entropy = str(bytearray(self._random.getrandbits(8) for _ in xrange(self.batch_size)))
+        else:
+            entropy = os.urandom(self.batch_size)
+        self._buffer = self._buffer[self._position:] + entropy.translate(_ID_TABLE, _ID_REJECTED_BYTES)
+        self._position = 0
 
 def generate_hex_string():
     """
@@ -45,24 +86,62 @@ def generate_hex_string():
     return '%05x' % randrange(16 ** 5)
 
 def coerce_value(context, container, value, report_issues=False):
+    """
+    Returns the value with all functions evaluated.
+    
+    Lists and dicts are only copied if their contents changed, so parts of the value without
+    functions are shared with the original.
+    """
+    
     if isinstance(value, Value):
         value = value.value
 
     if isinstance(value, list):
-        return [coerce_value(context, container, v, report_issues) for v in value]
+        r = [coerce_value(context, container, v, report_issues) for v in value]
+        return value if all(a is b for a, b in zip(r, value)) else r
     elif isinstance(value, dict):
-        return OrderedDict((k, coerce_value(context, container, v, report_issues)) for k, v in value.iteritems())
+        r = OrderedDict((k, coerce_value(context, container, v, report_issues)) for k, v in value.iteritems())
+        return value if all(r[k] is v for k, v in value.iteritems()) else r
     elif hasattr(value, '_evaluate'):
         try:
-            value = value._evaluate(context, container)
+            value = context.modeling.evaluation_graph.evaluate_function(context, container, value)
             value = coerce_value(context, container, value, report_issues)
         except CannotEvaluateFunctionException:
             pass
         except InvalidValueError as e:
             if report_issues:
-                context.validation.report(e.issue)
+                context.validation.report(issue=e.issue)
     return value
 
+def is_value_final(value):
+    """
+    True if the value contains no unevaluated functions, meaning that coercing it again would
+    not change it.
+    """
+    
+    if isinstance(value, Value):
+        value = value.value
+
+    if isinstance(value, list):
+        for v in value:
+            if not is_value_final(v):
+                return False
+    elif isinstance(value, dict):
+        for v in value.itervalues():
+            if not is_value_final(v):
+                return False
+    elif hasattr(value, '_evaluate'):
+        return False
+    return True
+
+def iter_pruned_raw(the_dict):
+    """
+    Generates the pruned raw representations of the dict's values, one at a time.
+    """
+    
+    for value in the_dict.itervalues():
+        yield prune(as_raw(value))
+
 def validate_dict_values(context, the_dict):
     if not the_dict:
         return
@@ -15,7 +15,9 @@
 #
 
 from .source import DefaultReaderSource
+from .exceptions import AlreadyReadException
 from ..utils import LockedList
+from hashlib import sha1
 
 class ReadingContext(object):
     """
@@ -30,3 +32,56 @@ class ReadingContext(object):
         self.reader = None
         
         self._locations = LockedList() # for keeping track of locations already read
+        self._hashes = LockedList() # for keeping track of the content of documents already read
+
+    @property
+    def locations(self):
+        """
+        The locations read so far (including imports), in order.
+        """
+        
+        with self._locations:
+            return list(self._locations)
+
+    def add_location(self, location, *included_locations):
+        """
+        Records that the location was read, along with locations included in it (which are not
+        checked).
+        
+        Raises :class:`AlreadyReadException` if the location was already read.
+        """
+        
+        with self._locations:
+            for read_location in self._locations:
+                if read_location.is_equivalent(location):
+                    raise AlreadyReadException('already read: %s' % location)
+            self._locations.append(location)
+            self._locations.extend(included_locations)
+
+    def add_hash(self, content_hash):
+        """
+        Records the hash of the content of a document that was read.
+        """
+        
+        with self._hashes:
+            self._hashes.append(content_hash)
+
+    @property
+    def documents_count(self):
+        """
+        The number of documents read so far (including imports).
+        """
+        
+        with self._hashes:
+            return len(self._hashes)
+
+    @property
+    def documents_hash(self):
+        """
+        A hash of the content of all documents read so far (including imports), regardless of the
+        order in which they were read.
+        """
+        
+        with self._hashes:
+            hashes = sorted(self._hashes)
+        return sha1(''.join(hashes)).hexdigest()
@@ -16,7 +16,8 @@
 
 from .. import UnimplementedFunctionalityError
 from ..utils import OpenClose, full_type_name
-from .exceptions import ReaderException, AlreadyReadException
+from .exceptions import ReaderException
+from hashlib import sha1
 
 class Reader(object):
     """
@@ -33,15 +34,13 @@ class Reader(object):
     def load(self):
         with OpenClose(self.loader) as loader:
             if self.context is not None:
-                with self.context._locations:
-                    for location in self.context._locations:
-                        if location.is_equivalent(loader.location):
-                            raise AlreadyReadException('already read: %s' % loader.location)
-                    self.context._locations.append(loader.location)
+                self.context.add_location(loader.location)
             
             data = loader.load()
             if data is None:
                 raise ReaderException('loader did not provide data: %s' % loader)
+            if self.context is not None:
+                self.context.add_hash(sha1(data.encode('utf8') if isinstance(data, unicode) else data).hexdigest())
             return data
     
     def read(self):
@@ -15,7 +15,7 @@
 #
 
 from .. import install_aria_extensions
-from ..consumption import ConsumerChain, Read, Validate, Model, Types, Inputs, Instance
+from ..consumption import ConsumerChain, Read, Validate, Model, Types, Inputs, Instance, InstallPlan, SaveSnapshot, InstanceFromSnapshot
 from ..utils import print_exception, import_fullname
 from .utils import CommonArgumentParser, create_context_from_namespace
 
@@ -47,6 +47,17 @@ def main():
             consumer.append(Model, Types)
         elif consumer_class_name == 'instance':
             consumer.append(Model, Inputs, Instance)
+        elif consumer_class_name == 'snapshot':
+            consumer.append(Model, SaveSnapshot)
+        elif consumer_class_name == 'instance-from-snapshot':
+            if context.get_arg_value('snapshot') is not None:
+                # The URI is the service template, so read it in order to make sure the snapshot is not stale
+                consumer = ConsumerChain(context, (Read, InstanceFromSnapshot))
+            else:
+                # The URI is the snapshot file, so there is nothing to read
+                consumer = ConsumerChain(context, (InstanceFromSnapshot,))
+        elif consumer_class_name == 'plan':
+            consumer.append(Model, Inputs, Instance, InstallPlan)
         else:
             consumer.append(Model, Inputs, Instance)
             consumer.append(import_fullname(consumer_class_name))
@@ -16,6 +16,7 @@
 
 from .. import VERSION
 from ..consumption import ConsumptionContext
+from ..modeling import IdGenerator
 from ..loading import UriLocation, URI_LOADER_PREFIXES
 from ..utils import ArgumentParser, import_fullname, cachedmethod
 
@@ -32,6 +33,7 @@ class CommonArgumentParser(BaseArgumentParser):
         self.add_argument('--presenter-source', default='aria.presentation.DefaultPresenterSource', help='presenter source class for the parser')
         self.add_argument('--presenter', help='force use of this presenter class in parser')
         self.add_argument('--prefix', nargs='*', help='prefixes for imports')
+        self.add_argument('--id-seed', help='seed for generating reproducible instance IDs')
         self.add_flag_argument('debug', help_true='print debug info', help_false='don\'t print debug info')
         self.add_flag_argument('cached-methods', help_true='enable cached methods', help_false='disable cached methods', default=True)
 
@@ -51,7 +53,7 @@ def create_context_from_namespace(ns, **kwargs):
     args.update(kwargs)
     return create_context(**args)
 
-def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, **kwargs):
+def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, id_seed=None, **kwargs):
     context = ConsumptionContext()
     context.loading.loader_source = import_fullname(loader_source)()
     context.reading.reader_source = import_fullname(reader_source)()
@@ -59,4 +61,6 @@ def create_context(uri, loader_source, reader_source, presenter_source, presente
     context.presentation.presenter_source = import_fullname(presenter_source)()
     context.presentation.presenter_class = import_fullname(presenter)
     context.presentation.print_exceptions = debug
+    if id_seed is not None:
+        context.modeling.id_generator = IdGenerator(id_seed)
     return context
@@ -15,9 +15,9 @@
 #
 
 from .openclose import OpenClose
-from .caching import cachedmethod, HasCachedMethods
-from .formatting import JsonAsRawEncoder, YamlAsRawDumper, full_type_name, safe_str, safe_repr, string_list_as_string, as_raw, as_raw_list, as_raw_dict, as_agnostic, json_dumps, yaml_dumps, yaml_loads
-from .collections import FrozenList, EMPTY_READ_ONLY_LIST, FrozenDict, EMPTY_READ_ONLY_DICT, StrictList, StrictDict, merge, prune, deepcopy_with_locators, copy_locators, is_removable
+from .caching import cachedmethod, HasCachedMethods, LRUCache
+from .formatting import JsonAsRawEncoder, YamlAsRawDumper, full_type_name, safe_str, safe_repr, string_list_as_string, as_raw, as_raw_list, as_raw_dict, as_agnostic, json_dumps, yaml_dumps, iter_json, json_dump, yaml_dump, yaml_loads
+from .collections import FrozenList, EMPTY_READ_ONLY_LIST, FrozenDict, EMPTY_READ_ONLY_DICT, StrictList, StrictDict, SequencedDict, FrozenSequencedDict, merge, prune, deepcopy_with_locators, copy_raw_value, copy_locators, is_removable
 from .exceptions import print_exception, print_traceback
 from .imports import import_fullname, import_modules
 from .threading import ExecutorException, FixedThreadPoolExecutor, LockedList
@@ -32,6 +32,7 @@ __all__ = (
     'OpenClose',
     'cachedmethod',
     'HasCachedMethods',
+    'LRUCache',
     'JsonAsRawEncoder',
     'YamlAsRawDumper',
     'full_type_name',
@@ -44,6 +45,9 @@ __all__ = (
     'as_agnostic',
     'json_dumps',
     'yaml_dumps',
+    'iter_json',
+    'json_dump',
+    'yaml_dump',
     'yaml_loads',
     'FrozenList',
     'EMPTY_READ_ONLY_LIST',
@@ -51,9 +55,12 @@ __all__ = (
     'EMPTY_READ_ONLY_DICT',
     'StrictList',
     'StrictDict',
+    'SequencedDict',
+    'FrozenSequencedDict',
     'merge',
     'prune',
     'deepcopy_with_locators',
+    'copy_raw_value',
     'copy_locators',
     'is_removable',
     'print_exception',
@@ -87,6 +87,65 @@ class cachedmethod(object):
             
         return r
 
+class LRUCache(object):
+    """
+    A cache of limited size that discards the least recently used entries first.
+    
+    The implementation is thread-safe. Values are created outside the lock, so two threads may
+    create the same value at once, but both will end up using the one that was stored first.
+    
+    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`.
+    
+    Like :class:`cachedmethod`, the cache is bypassed if :code:`cachedmethod.ENABLED` is False.
+    """
+    
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+        self._values = OrderedDict()
+
+    def get(self, key, create_fn):
+        """
+        Returns the cached value for the key, calling :code:`create_fn` to create it if it is not
+        cached. Exceptions raised by :code:`create_fn` are propagated and nothing is cached.
+        """
+        
+        if not cachedmethod.ENABLED:
+            return create_fn()
+        
+        with self.lock:
+            try:
+                value = self._values.pop(key)
+                self._values[key] = value # move to end
+                self.hits += 1
+                return value
+            except KeyError:
+                pass
+
+        value = create_fn()
+
+        with self.lock:
+            value = self._values.setdefault(key, value)
+            self.misses += 1
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self._values.clear()
+
+    def cache_info(self):
+        with self.lock:
+            return (self.hits, self.misses, self.maxsize, len(self._values))
+    
+    def reset_cache_info(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
 class HasCachedMethods(object):
     """
     Provides convenience methods for working with :class:`cachedmethod`.
@@ -197,6 +197,102 @@ class StrictDict(OrderedDict):
             value = self.wrapper_fn(value)
         return super(StrictDict, self).__setitem__(key, value)
 
+class SequencedDict(object):
+    """
+    An ordered sequence of (key, value) pairs in which keys may repeat.
+
+    Iterating it yields (key, value) tuples in order, like a list of tuples, but values are also
+    indexed by key, so that getting, counting, overriding and removing them by key does not require
+    scanning the sequence.
+
+    Setting a key removes all its existing values and appends the new value at the end.
+    """
+
+    def __init__(self, items=None):
+        self._entries = OrderedDict()
+        self._serials = {}
+        self._next_serial = 0
+        if items:
+            for k, v in items:
+                self.append(k, v)
+
+    def append(self, key, value):
+        serial = self._next_serial
+        self._next_serial += 1
+        self._entries[serial] = (key, value)
+        self._serials.setdefault(key, []).append(serial)
+
+    def get(self, key, default=None):
+        serials = self._serials.get(key)
+        return self._entries[serials[0]][1] if serials else default
+
+    def get_all(self, key):
+        return [self._entries[serial][1] for serial in self._serials.get(key, ())]
+
+    def count(self, key):
+        return len(self._serials.get(key, ()))
+
+    def keys(self):
+        """
+        Returns the keys in order of their first appearance in the sequence, without repeats.
+        """
+
+        return sorted(self._serials, key=lambda k: self._serials[k][0])
+
+    def __getitem__(self, key):
+        serials = self._serials.get(key)
+        if not serials:
+            raise KeyError(key)
+        return self._entries[serials[0]][1]
+
+    def __setitem__(self, key, value):
+        if key in self._serials:
+            del self[key]
+        self.append(key, value)
+
+    def __delitem__(self, key):
+        for serial in self._serials.pop(key):
+            del self._entries[serial]
+
+    def __contains__(self, key):
+        return key in self._serials
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return self._entries.itervalues()
+
+class FrozenSequencedDict(SequencedDict):
+    """
+    An immutable :class:`SequencedDict`.
+
+    After initialization it will raise :class:`TypeError` exceptions if modification
+    is attempted.
+
+    Note that objects stored in the dict may not be immutable.
+    """
+
+    def __init__(self, items=None):
+        self.locked = False
+        super(FrozenSequencedDict, self).__init__(items)
+        self.locked = True
+
+    def append(self, key, value):
+        if self.locked:
+            raise TypeError('frozen sequenced dict')
+        return super(FrozenSequencedDict, self).append(key, value)
+
+    def __setitem__(self, key, value):
+        if self.locked:
+            raise TypeError('frozen sequenced dict')
+        return super(FrozenSequencedDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if self.locked:
+            raise TypeError('frozen sequenced dict')
+        return super(FrozenSequencedDict, self).__delitem__(key)
+
 def merge(a, b, path=[], strict=False):
     """
     Merges dicts, recursively.
@@ -223,22 +319,36 @@ def is_removable(container, k, v):
 
 def prune(value, is_removable_fn=is_removable):
     """
-    Deletes :code:`None` and empty lists and dicts, recursively.
+    Returns the value without :code:`None` and empty lists and dicts, recursively.
+    
+    The value itself is not modified: lists and dicts are copied only if something was removed from
+    them (or from their contents), so the rest is shared with the original.
     """
     
     if isinstance(value, list):
-        for i in range(len(value)):
-            v = value[i]
+        r = []
+        changed = False
+        for i, v in enumerate(value):
             if is_removable_fn(value, i, v):
-                del value[i]
+                changed = True
             else:
-                prune(v, is_removable_fn)
+                pruned = prune(v, is_removable_fn)
+                if pruned is not v:
+                    changed = True
+                r.append(pruned)
+        return r if changed else value
     elif isinstance(value, dict):
+        r = OrderedDict()
+        changed = False
         for k, v in value.iteritems():
             if is_removable_fn(value, k, v):
-                del value[k]
+                changed = True
             else:
-                prune(v, is_removable_fn)
+                pruned = prune(v, is_removable_fn)
+                if pruned is not v:
+                    changed = True
+                r[k] = pruned
+        return r if changed else value
 
     return value
 
@@ -251,6 +361,16 @@ def deepcopy_with_locators(value):
     copy_locators(r, value)
     return r
 
+def copy_raw_value(value):
+    """
+    Like :code:`deepcopy_with_locators`, but shares primitive values instead of copying them.
+    """
+
+    # Primitives (including locatable ones) are immutable, so they can be shared
+    if isinstance(value, (basestring, int, float)):
+        return value
+    return deepcopy_with_locators(value)
+
 def copy_locators(target, source):
     """
     Copies over :code:`_locator` for all elements, recursively.
@@ -18,7 +18,7 @@ from .collections import FrozenList, FrozenDict, StrictList, StrictDict
 import json
 from collections import OrderedDict
 from ruamel import yaml # @UnresolvedImport
-from types import MethodType
+from types import MethodType, GeneratorType
 
 # Add our types to ruamel.yaml (for round trips)
 yaml.representer.RoundTripRepresenter.add_representer(FrozenList, yaml.representer.RoundTripRepresenter.represent_list)
@@ -48,6 +48,10 @@ class YamlAsRawDumper(yaml.dumper.RoundTripDumper):
     """
     A :class:`RoundTripDumper` that will use the :code:`as_raw` property of objects
     if available.
+    
+    Values that are shared in memory are written out in full every time rather than as anchors
+    and aliases, so that the output does not depend on how it was generated (see
+    :code:`yaml_dump`).
     """
     
     def represent_data(self, data):
@@ -55,6 +59,9 @@ class YamlAsRawDumper(yaml.dumper.RoundTripDumper):
             data = as_raw(data)
         return super(YamlAsRawDumper, self).represent_data(data)
 
+    def ignore_aliases(self, data):
+        return True
+
 def full_type_name(value):
     """
     The full class name of a type or object.
@@ -176,5 +183,109 @@ def yaml_dumps(value, indent=2):
     
     return yaml.dump(value, indent=indent, allow_unicode=True, Dumper=YamlAsRawDumper)
 
+def iter_json(value, indent=2, encoder=None):
+    """
+    Like :code:`json_dumps`, but generates the output in chunks.
+    
+    Generators in the value (either at the top or nested in dicts) are consumed lazily and emitted
+    as JSON lists, so that a structure can be streamed without ever being fully materialized.
+    
+    If :code:`encoder` is provided then :code:`indent` is ignored in favor of the encoder's.
+    """
+    
+    if encoder is None:
+        encoder = JsonAsRawEncoder(indent=indent, ensure_ascii=False)
+    return _iter_json(value, encoder, 0)
+
+def json_dump(value, out, indent=2):
+    """
+    Streams JSON to :code:`out` (anything with a :code:`write` method) using :code:`iter_json`.
+    """
+    
+    for chunk in iter_json(value, indent):
+        out.write(chunk)
+
+def yaml_dump(value, out, indent=2):
+    """
+    Streams YAML to :code:`out` (anything with a :code:`write` method).
+    
+    Generators at the top of the value, or in a top dict, are consumed lazily and each of their
+    items is dumped separately. The keys of such a top dict are expected to be plain strings.
+    Generators nested deeper are materialized.
+    
+    The output is the same as that of :code:`yaml_dumps` for the materialized value, because
+    :class:`YamlAsRawDumper` does not use anchors and aliases (which could otherwise span items).
+    """
+    
+    if isinstance(value, GeneratorType):
+        _yaml_dump_items(value, out, indent)
+    elif isinstance(value, dict) and _has_generators(value):
+        for k, v in value.iteritems():
+            if isinstance(v, GeneratorType):
+                out.write('%s:' % k)
+                _yaml_dump_items(v, out, indent)
+            else:
+                out.write(yaml_dumps(OrderedDict(((k, _materialize(v)),)), indent=indent))
+    else:
+        out.write(yaml_dumps(_materialize(value), indent=indent))
+
 def yaml_loads(value):
     return yaml.load(value, Loader=yaml.SafeLoader)
+
+def _iter_json(value, encoder, level):
+    if isinstance(value, GeneratorType):
+        opening, closing = '[', ']'
+        items = ((None, v) for v in value)
+    elif isinstance(value, dict) and _has_generators(value):
+        opening, closing = '{', '}'
+        items = value.iteritems()
+    else:
+        chunk = encoder.encode(value)
+        if level and (encoder.indent is not None):
+            # JSON strings never contain raw newlines, so these can only be indentation
+            chunk = chunk.replace('\n', _json_newline(encoder, level))
+        yield chunk
+        return
+
+    yield opening
+    empty = True
+    for k, v in items:
+        if not empty:
+            yield encoder.item_separator
+        yield _json_newline(encoder, level + 1)
+        if k is not None:
+            yield encoder.encode(k if isinstance(k, basestring) else str(k)) + encoder.key_separator
+        for chunk in _iter_json(v, encoder, level + 1):
+            yield chunk
+        empty = False
+    if not empty:
+        yield _json_newline(encoder, level)
+    yield closing
+
+def _json_newline(encoder, level):
+    if encoder.indent is None:
+        return ''
+    return '\n' + (' ' * (encoder.indent * level))
+
+def _has_generators(value):
+    for v in value.itervalues():
+        if isinstance(v, GeneratorType) or (isinstance(v, dict) and _has_generators(v)):
+            return True
+    return False
+
+def _materialize(value):
+    if isinstance(value, GeneratorType):
+        return [_materialize(v) for v in value]
+    elif isinstance(value, dict) and _has_generators(value):
+        return OrderedDict((k, _materialize(v)) for k, v in value.iteritems())
+    return value
+
+def _yaml_dump_items(items, out, indent):
+    empty = True
+    for item in items:
+        if empty:
+            out.write('\n')
+            empty = False
+        out.write(yaml_dumps([_materialize(item)], indent=indent))
+    if empty:
+        out.write(' []\n')
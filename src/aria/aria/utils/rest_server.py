@@ -14,8 +14,8 @@
 # under the License.
 #
 
-from ..utils import puts, colored
-import os, re, shutil, json, sys, BaseHTTPServer
+from ..utils import puts, colored, iter_json
+import os, re, shutil, json, sys, tempfile, BaseHTTPServer
 from collections import OrderedDict
 
 class RestServer(object):
@@ -34,6 +34,7 @@ class RestServer(object):
     * :code:`json_encoder`: :class:`JSONEncoder` for responses
     * :code:`json_decoder`: :class:`JSONDecoder` for requests
     * :code:`unicode`: True to support Unicode
+    * :code:`spool_size`: Maximum size in bytes of a response body to keep in memory
     
     The route keys are regular expressions for matching the path. They are checked in order, which
     is why it's important to use :class:`OrderedDict`.
@@ -53,7 +54,10 @@ class RestServer(object):
     If you return None, then a 404 error will be generated. Otherwise, it will be a 200 response with
     the return value will be written to it. If the :code:`media_type` for the route was set to
     "application/json", then the return value will first be encoded into JSON using the configured
-    :code:`json_encoder`.
+    :code:`json_encoder`. Generators in the return value are encoded as JSON lists (see
+    :code:`iter_json`). The body is generated in full before the response is sent, into a buffer
+    that spills over to a temporary file if it exceeds :code:`spool_size` bytes, so that an
+    exception during encoding can still result in a 500 error.
     
     If you want to write the response yourself, set :code:`handled=True` on the
     :class:`RestRequestHandler`, which will cause the return value to be ignored (you won't have to
@@ -77,6 +81,7 @@ class RestServer(object):
         self.json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
         self.json_decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
         self.unicode = True
+        self.spool_size = 1024 * 1024
         
     def start(self, daemon=False):
         """
@@ -183,6 +188,10 @@ class RestRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             
         try:
             content = self.matched_route[method](self)
+            body = None
+            if (not self.handled) and (content is not None) and (method != 'DELETE'):
+                # No content for DELETE
+                body = self.encode_content(content)
         except Exception as e:
             self.send_plain_text_response(500, 'Internal error: %s\n' % e)
             return
@@ -195,17 +204,33 @@ class RestRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             return
             
         self.send_response(200)
-        media_type = self.send_content_type(self.matched_route)
+        self.send_content_type(self.matched_route)
         self.end_headers()
 
-        if method == 'DELETE':
-            # No content for DELETE
-            return
-            
-        if media_type == 'application/json':
-            self.wfile.write(self.rest_server.json_encoder.encode(content))
-        else:
-            self.wfile.write(content)
+        if body is not None:
+            try:
+                shutil.copyfileobj(body, self.wfile)
+            finally:
+                body.close()
+
+    def encode_content(self, content):
+        """
+        Encodes the content into a spooled temporary file, rewound and ready to be read.
+        """
+        
+        body = tempfile.SpooledTemporaryFile(max_size=self.rest_server.spool_size)
+        try:
+            if self.matched_route.get('media_type') == 'application/json':
+                # Encoded in chunks, in order to support generators in the content
+                for chunk in iter_json(content, encoder=self.rest_server.json_encoder):
+                    body.write(_encode(chunk))
+            else:
+                body.write(_encode(content))
+            body.seek(0)
+        except:
+            body.close()
+            raise
+        return body
 
     # BaseHTTPRequestHandler
 
@@ -230,3 +255,6 @@ class RestRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
 
 def rest_request_handler(rest_server):
     return lambda *args, **kwargs: RestRequestHandler(rest_server, *args, **kwargs)
+
+def _encode(value):
+    return value.encode('utf8') if isinstance(value, unicode) else value
@@ -16,10 +16,10 @@
 
 from .elements import find_by_name, get_type_parent_name
 from .parameters import has_intrinsic_functions
-from .nodes import is_host, find_host_node_template, find_host_node
-from .groups import find_groups, iter_scaling_groups, prune_redundant_members
+from .nodes import is_host, find_host_node_template, find_host_node, create_node_template_containment, create_node_containment
+from .groups import find_groups, iter_scaling_groups, prune_redundant_members, Implications
 from .relationships import is_contained_in
-from .plugins import CENTRAL_DEPLOYMENT_AGENT, SCRIPT_PLUGIN_NAME, plugins_to_install_for_operations, add_plugins_to_install_for_node_template, parse_implementation, is_file
+from .plugins import CENTRAL_DEPLOYMENT_AGENT, SCRIPT_PLUGIN_NAME, plugins_to_install_for_operations, add_plugins_to_install_for_node_template, parse_implementation, is_file, PluginResolver
 from .policies import SCALING_POLICY_NAME
 from aria import InvalidValueError
 from aria.consumption import Consumer
@@ -40,6 +40,12 @@ class ClassicDeploymentPlan(Consumer):
         plugins = self.context.presentation.get('service_template', 'plugins')
         plugins = [convert_plugin(self.context, v) for v in plugins.itervalues()] if plugins is not None else []
         setattr(self.context.modeling, 'plugins', plugins)
+        setattr(self.context.modeling, 'classic_plugin_resolver', PluginResolver(self.context, plugins))
+
+        # The model and instance might have changed since the last plan, so we rebuild the containment
+        setattr(self.context.modeling, 'classic_node_template_containment', create_node_template_containment(self.context))
+        setattr(self.context.modeling, 'classic_node_containment', create_node_containment(self.context))
+        setattr(self.context.modeling, 'classic_implications', Implications(self.context))
 
         deployment_plan = convert_instance(self.context)
         setattr(self.context.modeling, 'classic_deployment_plan', deployment_plan)
@@ -22,11 +22,7 @@ def find_groups(context, node):
     Returns a list of all groups that contain the node.
     """
     
-    groups = []
-    for group in context.modeling.instance.groups.itervalues():
-        if node.id in group.member_node_ids:
-            groups.append(group)
-    return groups
+    return context.modeling.instance.find_node_groups(node.id)
 
 def iter_scaling_groups(context):
     """
@@ -45,106 +41,150 @@ def prune_redundant_members(context, node_template_names, group_template_names=s
     The final result will produce exactly the same list of nodes as the original.
     """
     
+    implications = get_implications(context)
+    
     # Remove groups that are implied by other groups
-    redundant_group_template_names = set()
+    implied_group_template_names = set()
     for group_template_name in group_template_names:
-        implied = False
-        for other_group_template_name in group_template_names:
-            if other_group_template_name == group_template_name:
-                continue
-            if _is_group_template_implied_by_group_template(context, group_template_name, other_group_template_name):
-                implied = True
-                break
-        if implied:
-            redundant_group_template_names.add(group_template_name)
-    group_template_names -= redundant_group_template_names
+        implied_group_template_names |= implications.get_group_templates_implied_by_group_template(group_template_name)
+    group_template_names -= implied_group_template_names
 
     # Remove nodes that are implied by other nodes or groups
+    member_node_template_names = set()
+    for group_template_name in group_template_names:
+        member_node_template_names |= implications.get_member_node_templates(group_template_name)
     redundant_node_template_names = set()
     for node_template_name in node_template_names:
-        implied = False
-        for other_node_template_name in node_template_names:
-            if other_node_template_name == node_template_name:
-                continue
-            if _is_node_template_implied_by_node_template(context, node_template_name, other_node_template_name):
-                implied = True
-                break
-        if not implied:
-            for group_template_name in group_template_names:
-                if _is_node_template_implied_by_group_template(context, node_template_name, group_template_name):
-                    implied = True
-                    break
-        if implied:
+        containers = implications.get_node_templates_implied_by_node_template(node_template_name)
+        if ((containers - set((node_template_name,))) & node_template_names) or (containers & member_node_template_names):
             redundant_node_template_names.add(node_template_name)
     node_template_names -= redundant_node_template_names
 
-    # Remove groups that don't add any new nodes
+    # Remove groups that don't add any new nodes: we count how many of the remaining groups imply
+    # each node, so that we can tell whether the other groups imply all our nodes
+    counts = {}
+    nonempty_count = 0
+    for group_template_name in group_template_names:
+        implied_node_template_names = implications.get_node_templates_implied_by_group_template(group_template_name)
+        for node_template_name in implied_node_template_names:
+            counts[node_template_name] = counts.get(node_template_name, 0) + 1
+        if implied_node_template_names:
+            nonempty_count += 1
+    
     redundant_group_template_names = set()
     for group_template_name in group_template_names:
         # Our nodes
-        our_implied_node_template_names = _get_node_templates_implied_by_group_template(context, group_template_name)
-        prune_redundant_members(context, our_implied_node_template_names)
+        our_implied_node_template_names = implications.get_node_templates_implied_by_group_template(group_template_name)
+        our_root_node_template_names = implications.get_root_node_templates(our_implied_node_template_names)
         
-        # The other nodes
-        other_implied_node_template_names = set(node_template_names)
-        for other_group_template_name in group_template_names:
-            if (other_group_template_name == group_template_name) or (other_group_template_name in redundant_group_template_names): 
-                continue
-            other_implied_node_template_names |= _get_node_templates_implied_by_group_template(context, other_group_template_name)
+        # Do the other nodes include them?
+        if our_root_node_template_names:
+            redundant = all((v in node_template_names) or (counts[v] > 1) for v in our_root_node_template_names)
+        else:
+            redundant = bool(node_template_names) or (nonempty_count - (1 if our_implied_node_template_names else 0) > 0)
         
-        if other_implied_node_template_names and our_implied_node_template_names <= other_implied_node_template_names:
+        if redundant:
             redundant_group_template_names.add(group_template_name)
+            for node_template_name in our_implied_node_template_names:
+                counts[node_template_name] -= 1
+            if our_implied_node_template_names:
+                nonempty_count -= 1
     group_template_names -= redundant_group_template_names
 
-#
-# Utils
-#
+def get_implications(context):
+    """
+    The :class:`Implications` of the service model, created on first use.
+    """
+    
+    implications = getattr(context.modeling, 'classic_implications', None)
+    if (implications is None) or (implications.source is not context.modeling.model):
+        implications = Implications(context)
+        setattr(context.modeling, 'classic_implications', implications)
+    return implications
 
-def _is_node_template_implied_by_node_template(context, node_template_name, other_node_template_name):
-    node_template = context.modeling.model.node_templates.get(node_template_name)
-    for requirement in node_template.requirements:
-        if is_contained_in(context, requirement.relationship_template):
-            if requirement.target_node_template_name == other_node_template_name:
-                return True
-            if _is_node_template_implied_by_node_template(context, requirement.target_node_template_name, other_node_template_name):
-                return True
-    return False
+class Implications(object):
+    """
+    Which node templates and group templates are implied by being members of a group. A node template
+    implies all the node templates it is contained in, and a group template implies its members and
+    all that they imply.
+    
+    Each closure is computed once (following the contained-in relationships and group memberships) and
+    memoized as a frozenset.
+    
+    Properties:
+    
+    * :code:`source`: The service model
+    """
+    
+    def __init__(self, context):
+        self.source = context.modeling.model
+        self._context = context
+        self._node_templates_implied_by_node_template = {}
+        self._node_templates_implied_by_group_template = {}
+        self._group_templates_implied_by_group_template = {}
+        self._member_node_templates = {}
 
-def _is_node_template_implied_by_group_template(context, node_template_name, group_template_name):
-    group_template = context.modeling.model.group_templates.get(group_template_name)
-    for member_node_template_name in group_template.member_node_template_names:
-        if node_template_name == member_node_template_name:
-            return True
-        if _is_node_template_implied_by_node_template(context, node_template_name, member_node_template_name):
-            return True
-        for member_group_template_name in group_template.member_group_template_names:
-            if _is_node_template_implied_by_group_template(context, node_template_name, member_group_template_name):
-                return True
-    return False
+    def get_node_templates_implied_by_node_template(self, node_template_name):
+        """
+        The node template together with all the node templates it is contained in.
+        """
+        
+        r = self._node_templates_implied_by_node_template.get(node_template_name)
+        if r is None:
+            node_template_names = set((node_template_name,))
+            node_template = self.source.node_templates.get(node_template_name)
+            for requirement in node_template.requirement_templates:
+                if is_contained_in(self._context, requirement.relationship_template):
+                    node_template_names |= self.get_node_templates_implied_by_node_template(requirement.target_node_template_name)
+            r = self._node_templates_implied_by_node_template[node_template_name] = frozenset(node_template_names)
+        return r
+
+    def get_node_templates_implied_by_group_template(self, group_template_name):
+        """
+        The node templates implied by all the member node templates of the group template and its member
+        group templates.
+        """
+        
+        r = self._node_templates_implied_by_group_template.get(group_template_name)
+        if r is None:
+            node_template_names = set()
+            for member_node_template_name in self.get_member_node_templates(group_template_name):
+                node_template_names |= self.get_node_templates_implied_by_node_template(member_node_template_name)
+            r = self._node_templates_implied_by_group_template[group_template_name] = frozenset(node_template_names)
+        return r
 
-def _is_group_template_implied_by_group_template(context, group_template_name, other_group_template_name):
-    other_group_template = context.modeling.model.group_templates.get(other_group_template_name)
-    for member_group_template_name in other_group_template.member_group_template_names:
-        if member_group_template_name == group_template_name:
-            return True
-        elif _is_group_template_implied_by_group_template(context, group_template_name, member_group_template_name):
-            return True
-    return False
+    def get_group_templates_implied_by_group_template(self, group_template_name):
+        """
+        The member group templates of the group template and of its member group templates (recursively).
+        """
+        
+        r = self._group_templates_implied_by_group_template.get(group_template_name)
+        if r is None:
+            group_template_names = set()
+            group_template = self.source.group_templates.get(group_template_name)
+            for member_group_template_name in group_template.member_group_template_names:
+                group_template_names.add(member_group_template_name)
+                group_template_names |= self.get_group_templates_implied_by_group_template(member_group_template_name)
+            r = self._group_templates_implied_by_group_template[group_template_name] = frozenset(group_template_names)
+        return r
 
-def _get_node_templates_implied_by_node_template(context, node_template_name):
-    node_template_names = set()
-    node_template_names.add(node_template_name)
-    node_template = context.modeling.model.node_templates.get(node_template_name)
-    for requirement in node_template.requirements:
-        if is_contained_in(context, requirement.relationship_template):
-            node_template_names |= _get_node_templates_implied_by_node_template(context, requirement.target_node_template_name)
-    return node_template_names
+    def get_member_node_templates(self, group_template_name):
+        """
+        The member node templates of the group template and of its member group templates (recursively).
+        """
+        
+        r = self._member_node_templates.get(group_template_name)
+        if r is None:
+            group_template = self.source.group_templates.get(group_template_name)
+            node_template_names = set(group_template.member_node_template_names)
+            for member_group_template_name in self.get_group_templates_implied_by_group_template(group_template_name):
+                node_template_names.update(self.source.group_templates.get(member_group_template_name).member_node_template_names)
+            r = self._member_node_templates[group_template_name] = frozenset(node_template_names)
+        return r
 
-def _get_node_templates_implied_by_group_template(context, group_template_name):
-    node_template_names = set()
-    group_template = context.modeling.model.group_templates.get(group_template_name)
-    for member_node_template_name in group_template.member_node_template_names:
-        node_template_names |= _get_node_templates_implied_by_node_template(context, member_node_template_name)
-    for member_group_template_name in group_template.member_group_template_names:
-        node_template_names |= _get_node_templates_implied_by_group_template(context, member_group_template_name)
-    return node_template_names
+    def get_root_node_templates(self, node_template_names):
+        """
+        The node templates that are not contained in any of the other node templates.
+        """
+        
+        return set(v for v in node_template_names if not ((self.get_node_templates_implied_by_node_template(v) - set((v,))) & node_template_names))
@@ -14,7 +14,7 @@
 # under the License.
 #
 
-from .relationships import is_contained_in
+from .relationships import CONTAINED_IN_RELATIONSHIP_NAME
 
 COMPUTE_NODE_NAME = 'cloudify.nodes.Compute'
 
@@ -31,14 +31,7 @@ def find_host_node_template(context, node_template):
     a compute node template.
     """
     
-    if is_host(context, node_template):
-        return node_template
-    
-    for requirement in node_template.requirement_templates:
-        if is_contained_in(context, requirement.relationship_template):
-            return find_host_node_template(context, context.modeling.model.node_templates.get(requirement.target_node_template_name))
-
-    return None
+    return get_node_template_containment(context).get_host(node_template.name)
 
 def find_host_node(context, node):
     """
@@ -46,15 +39,7 @@ def find_host_node(context, node):
     a compute node.
     """
 
-    node_template = context.modeling.model.node_templates.get(node.template_name)
-    if is_host(context, node_template):
-        return node
-    
-    for relationship in node.relationships:
-        if is_contained_in(context, relationship):
-            return find_host_node(context, context.modeling.instance.nodes.get(relationship.target_node_id))
-
-    return None
+    return get_node_containment(context).get_host(node.id)
 
 def find_hosted_node_templates(context, node_template):
     """
@@ -62,9 +47,150 @@ def find_hosted_node_templates(context, node_template):
     path of contained-in relationships. 
     """
     
-    hosted = []
-    if is_host(context, node_template):
-        for t in context.modeling.model.node_templates.itervalues():
-            if (t is not node_template) and (find_host_node_template(context, t) is node_template):
-                hosted.append(t)
-    return hosted
+    return get_node_template_containment(context).get_hosted(node_template.name)
+
+def get_node_template_containment(context):
+    """
+    The :class:`Containment` of the service model's node templates, built on first use.
+    """
+    
+    containment = getattr(context.modeling, 'classic_node_template_containment', None)
+    if (containment is None) or (containment.source is not context.modeling.model):
+        containment = create_node_template_containment(context)
+        setattr(context.modeling, 'classic_node_template_containment', containment)
+    return containment
+
+def get_node_containment(context):
+    """
+    The :class:`Containment` of the service instance's nodes, built on first use.
+    """
+    
+    containment = getattr(context.modeling, 'classic_node_containment', None)
+    if (containment is None) or (containment.source is not context.modeling.instance):
+        containment = create_node_containment(context)
+        setattr(context.modeling, 'classic_node_containment', containment)
+    return containment
+
+def create_node_template_containment(context):
+    model = context.modeling.model
+    is_host_type = _TypeTest(context.modeling.node_types, COMPUTE_NODE_NAME)
+    is_contained_in_type = _TypeTest(context.modeling.relationship_types, CONTAINED_IN_RELATIONSHIP_NAME)
+
+    def get_container(node_template):
+        for requirement in node_template.requirement_templates:
+            if (requirement.relationship_template is not None) and is_contained_in_type(requirement.relationship_template.type_name):
+                return requirement.target_node_template_name
+        return None
+
+    return Containment(model, model.node_templates, get_container, lambda v: is_host_type(v.type_name))
+
+def create_node_containment(context):
+    instance = context.modeling.instance
+    node_templates = context.modeling.model.node_templates
+    is_host_type = _TypeTest(context.modeling.node_types, COMPUTE_NODE_NAME)
+    is_contained_in_type = _TypeTest(context.modeling.relationship_types, CONTAINED_IN_RELATIONSHIP_NAME)
+
+    def get_container(node):
+        for relationship in node.relationships:
+            if is_contained_in_type(relationship.type_name):
+                return relationship.target_node_id
+        return None
+
+    return Containment(instance, instance.nodes, get_container, lambda v: is_host_type(node_templates.get(v.template_name).type_name))
+
+class Containment(object):
+    """
+    The forest of contained-in relationships between node templates or nodes, with the hosts (compute node
+    templates or nodes) at the roots.
+    
+    It is built in one pass over the elements, after which finding an element's host is a dict lookup and
+    finding the elements a host hosts is proportional to their number.
+    
+    Elements in contained-in cycles that do not include a host, or that are contained in unknown elements,
+    have no host.
+    
+    Properties:
+    
+    * :code:`source`: The service model or instance that was the source of the elements
+    """
+    
+    def __init__(self, source, elements, get_container, is_a_host):
+        """
+        :code:`elements` is a dict of elements by key, :code:`get_container` returns the key of the element
+        in which an element is contained (or None), and :code:`is_a_host` whether an element is a host.
+        """
+        
+        self.source = source
+        self._elements = elements
+        self._hosts = {}
+        self._hosted = {}
+        
+        containers = dict((key, get_container(element)) for key, element in elements.iteritems())
+        for key, element in elements.iteritems():
+            if key in self._hosts:
+                continue
+            
+            # Follow the path of contained-in relationships until we hit a host (or a key we already know)
+            path = []
+            visited = set()
+            host_key = None
+            current = key
+            while (current is not None) and (current in elements):
+                if current in self._hosts:
+                    host_key = self._hosts[current]
+                    break
+                if current in visited:
+                    # Cycle
+                    break
+                if is_a_host(elements[current]):
+                    host_key = current
+                    break
+                path.append(current)
+                visited.add(current)
+                current = containers[current]
+            
+            if host_key is not None:
+                self._hosts[host_key] = host_key
+            for k in path:
+                self._hosts[k] = host_key
+
+        for key in elements.iterkeys():
+            host_key = self._hosts.get(key)
+            if (host_key is not None) and (host_key != key):
+                self._hosted.setdefault(host_key, []).append(elements[key])
+
+    def get_host(self, key):
+        """
+        The element that hosts the element, which could be itself, or None.
+        """
+        
+        host_key = self._hosts.get(key)
+        return self._elements.get(host_key) if host_key is not None else None
+
+    def get_hosted(self, key):
+        """
+        A list of the elements hosted by the element (not including itself), in order.
+        """
+        
+        return list(self._hosted.get(key, ()))
+
+#
+# Utils
+#
+
+class _TypeTest(object):
+    """
+    Whether type names are descendants of a type, memoized.
+    """
+    
+    def __init__(self, hierarchy, base_type_name):
+        self.hierarchy = hierarchy
+        self.base_type_name = base_type_name
+        self._results = {}
+
+    def __call__(self, type_name):
+        try:
+            return self._results[type_name]
+        except KeyError:
+            result = self._results[type_name] = self.hierarchy.is_descendant(self.base_type_name, type_name)
+            return result
@@ -67,11 +67,7 @@ def is_file(context, name):
     Returns True if the name points to a file under one of our loading prefixes.
     """
     
-    for prefix in context.loading.prefixes:
-        path = os.path.join(prefix, name)
-        if os.path.isfile(path):
-            return True
-    return False
+    return get_plugin_resolver(context).is_file(name)
 
 def parse_implementation(context, implementation, is_workflow=False):
     """
@@ -81,69 +77,124 @@ def parse_implementation(context, implementation, is_workflow=False):
     Note that workflow operations use a special script runner plugin.
     """
     
-    parsed = False
-
-    if not implementation:
-        plugin_name = None
-        plugin_executor = None
-        operation_name = None
-        inputs = OrderedDict()
-        parsed = True
+    return get_plugin_resolver(context).parse_implementation(implementation, is_workflow)
+
+def get_plugin_resolver(context):
+    """
+    The :class:`PluginResolver` for the plugins of the deployment plan, created on first use.
+    """
+    
+    plugins = getattr(context.modeling, 'plugins', None) or []
+    resolver = getattr(context.modeling, 'classic_plugin_resolver', None)
+    if (resolver is None) or (resolver.plugins is not plugins):
+        resolver = PluginResolver(context, plugins)
+        setattr(context.modeling, 'classic_plugin_resolver', resolver)
+    return resolver
+
+class PluginResolver(object):
+    """
+    Resolves operation implementations to plugins, caching the results for the deployment plan: the parsed
+    implementations, the plugins by name, and whether names are files under our loading prefixes.
+    
+    Properties:
+    
+    * :code:`plugins`: The list of plugins (as converted for the plan)
+    """
     
-    if not parsed:
-        if is_file(context, implementation):
+    def __init__(self, context, plugins):
+        self.plugins = plugins
+        self._prefixes = list(context.loading.prefixes)
+        self._plugins_by_name = OrderedDict()
+        for plugin in plugins:
+            self._plugins_by_name.setdefault(plugin['name'], []).append(plugin)
+        self._files = {}
+        self._implementations = {}
+
+    def is_file(self, name):
+        """
+        Returns True if the name points to a file under one of our loading prefixes.
+        """
+        
+        if not isinstance(name, basestring):
+            return self._is_file(name)
+        r = self._files.get(name)
+        if r is None:
+            r = self._files[name] = self._is_file(name)
+        return r
+
+    def find_plugin(self, name):
+        plugins = self._plugins_by_name.get(name)
+        if not plugins:
+            raise InvalidValueError('can\'t find plugin: %s' % safe_repr(name), level=Issue.BETWEEN_TYPES)
+        return plugins[0]
+
+    def parse_implementation(self, implementation, is_workflow=False):
+        """
+        See :func:`parse_implementation`.
+        """
+        
+        key = (implementation, is_workflow)
+        parsed = self._implementations.get(key)
+        if parsed is None:
+            parsed = self._implementations[key] = self._parse_implementation(implementation, is_workflow)
+        plugin_name, plugin_executor, operation_name, is_script = parsed
+        
+        # The inputs are always new, because they are merged into
+        if not is_script:
+            inputs = OrderedDict()
+        elif is_workflow:
+            inputs = OrderedDict((
+                ('script_path', OrderedDict((('default', implementation),))),)) 
+        else:
+            inputs = OrderedDict((('script_path', implementation),))
+        
+        return plugin_name, plugin_executor, operation_name, inputs
+
+    def _is_file(self, name):
+        for prefix in self._prefixes:
+            path = os.path.join(prefix, name)
+            if os.path.isfile(path):
+                return True
+        return False
+
+    def _parse_implementation(self, implementation, is_workflow):
+        if not implementation:
+            return None, None, None, False
+        
+        if self.is_file(implementation):
             # Explicit script
-            plugin = _find_plugin(context, SCRIPT_PLUGIN_NAME)
-            plugin_name = plugin['name'] 
-            plugin_executor = plugin['executor']
-            if is_workflow:
-                operation_name = SCRIPT_RUNNER_EXECUTE_WORKFLOW_OPERATION
-                inputs = OrderedDict((
-                    ('script_path', OrderedDict((('default', implementation),))),)) 
-            else:
-                operation_name = SCRIPT_RUNNER_RUN_OPERATION
-                inputs = OrderedDict((('script_path', implementation),))
-            parsed = True
-
-    if not parsed:
+            plugin = self.find_plugin(SCRIPT_PLUGIN_NAME)
+            operation_name = SCRIPT_RUNNER_EXECUTE_WORKFLOW_OPERATION if is_workflow else SCRIPT_RUNNER_RUN_OPERATION
+            return plugin['name'], plugin['executor'], operation_name, True
+        
         # plugin.operation
-        plugin, operation_name = _parse_implementation(context, implementation)
-        plugin_name = plugin['name'] 
-        plugin_executor = plugin['executor']
-        inputs = OrderedDict()
-
-    return plugin_name, plugin_executor, operation_name, inputs
+        plugins = []
+        index = implementation.find('.')
+        while index != -1:
+            plugins += self._plugins_by_name.get(implementation[:index], ())
+            index = implementation.find('.', index + 1)
+                
+        length = len(plugins)
+        if length > 1:
+            raise InvalidValueError('ambiguous plugin name in implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
+        elif length == 1:
+            plugin = plugins[0]
+            operation_name = implementation[len(plugin['name']) + 1:]
+            if not operation_name:
+                raise InvalidValueError('no operation name in implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
+        elif self.plugins:
+            plugin = self.plugins[0]
+            operation_name = implementation
+        else:
+            raise InvalidValueError('unknown plugin for implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
+        return plugin['name'], plugin['executor'], operation_name, False
 
 #
 # Utils
 #
 
 def _find_plugin(context, name):
-    for plugin in context.modeling.plugins:
-        if plugin['name'] == name:
-            return plugin
-    raise InvalidValueError('can\'t find plugin: %s' % safe_repr(name), level=Issue.BETWEEN_TYPES)
-
-def _parse_implementation(context, implementation):
-    plugins = []
-    
-    for plugin in context.modeling.plugins:
-        if implementation.startswith(plugin['name'] + '.'):
-            plugins.append(plugin)
-            
-    length = len(plugins)
-    if length > 1:
-        raise InvalidValueError('ambiguous plugin name in implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
-    elif length == 1:
-        plugin = plugins[0]
-        operation = implementation[len(plugin['name']) + 1:]
-        if not operation:
-            raise InvalidValueError('no operation name in implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
-        return plugin, operation
-    elif context.modeling.plugins:
-        plugin = context.modeling.plugins[0]
-        return plugin, implementation
-    raise InvalidValueError('unknown plugin for implementation: %s' % safe_repr(implementation), level=Issue.BETWEEN_TYPES)
+    return get_plugin_resolver(context).find_plugin(name)
 
 def _add_plugins_to_install_for_interface(context, plugins_to_install, interfaces, agent):
     for interface in interfaces.itervalues():
@@ -16,6 +16,8 @@
 
 from aria import InvalidValueError
 from aria.utils import deepcopy_with_locators, safe_repr
+from collections import OrderedDict
+from copy import copy
 
 class PostProcessingContext(object):
     """
@@ -52,6 +54,31 @@ class PostProcessingContext(object):
                 else:
                     self.process(v)
 
+    def processed(self, value, function_paths=None):
+        """
+        Returns the value with functions evaluated, recursively, without changing it. Lists and dicts are
+        only copied if functions were evaluated in them, so the rest of the value is shared with the
+        original.
+        
+        If :code:`function_paths` (see :func:`get_function_paths`) are provided, only they are visited.
+        """
+        
+        if function_paths is None:
+            function_paths = get_function_paths(value)
+        if not function_paths:
+            return value
+        
+        r = copy(value)
+        for k, paths in function_paths.iteritems():
+            v = value[k]
+            if paths is True:
+                fn = get_function(v)
+                if fn:
+                    r[k] = fn.evaluate(self)
+            else:
+                r[k] = self.processed(v, paths)
+        return r
+
     def evalue(self, payload):
         """
         Processes the payload.
@@ -78,7 +105,8 @@ class GetInput(object):
             raise InvalidValueError('input does not exist for function "get_input": %s' % safe_repr(self.input_property_name), locator=self.locator)
         the_input = inputs[self.input_property_name]
         value = the_input.get('value', the_input.get('default'))
-        return deepcopy_with_locators(value)
+        # Lists and dicts may be changed in place where they end up, but other values are immutable
+        return deepcopy_with_locators(value) if isinstance(value, (list, dict)) else value
 
 class GetProperty(object):
     def __init__(self, value):
@@ -122,6 +150,31 @@ def get_function(value):
             return FUNCTIONS[key](value[key])
     return None
 
+def get_function_paths(value):
+    """
+    Returns the paths to the functions in the value, as an ordered dict of keys (or indexes) to either
+    True (for a function) or the nested paths, or None if there are no functions.
+    """
+    
+    paths = OrderedDict()
+    if isinstance(value, list):
+        for i, v in enumerate(value):
+            if get_function(v):
+                paths[i] = True
+            else:
+                nested_paths = get_function_paths(v)
+                if nested_paths:
+                    paths[i] = nested_paths
+    elif isinstance(value, dict):
+        for k, v in value.iteritems():
+            if get_function(v):
+                paths[k] = True
+            else:
+                nested_paths = get_function_paths(v)
+                if nested_paths:
+                    paths[k] = nested_paths
+    return paths or None
+
 #
 # Utils
 #
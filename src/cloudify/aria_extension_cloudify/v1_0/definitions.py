@@ -17,6 +17,7 @@
 from .misc import Description
 from .presentation.field_validators import data_type_validator, data_value_validator
 from .modeling.data_types import get_data_type
+from .modeling.interfaces import get_raw_interface_template
 from aria import dsl_specification
 from aria.presentation import Presentation, has_fields, allow_unknown_fields, short_form_field, primitive_field, object_field, object_dict_field, object_dict_unknown_fields, field_validator
 from aria.utils import cachedmethod
@@ -96,6 +97,10 @@ class InterfaceDefinition(Presentation):
         :rtype: dict of str, :class:`OperationDefinition`
         """
 
+    @cachedmethod
+    def _get_raw_template(self, context):
+        return get_raw_interface_template(context, self)
+
 @short_form_field('mapping')
 @has_fields
 @dsl_specification('workflows', 'cloudify-1.0')
@@ -16,8 +16,8 @@
 
 from .properties import coerce_property_value, convert_property_definitions_to_values
 from aria.validation import Issue
-from aria.presentation import get_locator
-from aria.utils import merge, deepcopy_with_locators
+from aria.presentation import Value, get_locator
+from aria.utils import FrozenDict, merge, deepcopy_with_locators, copy_raw_value
 from collections import OrderedDict
 
 #
@@ -103,9 +103,42 @@ def convert_interface_definition_from_type_to_template(context, presentation, co
         # Nothing to convert, so just clone
         return presentation._clone(container)
     
-    raw = convert_interface_definition_from_type_to_raw_template(context, presentation)
+    # The type's table is resolved only once, so we just need our own copy to assign values into
+    raw = copy_raw_interface_template(presentation._get_raw_template(context))
     return cls(name=presentation._name, raw=raw, container=container)
 
+def get_raw_interface_template(context, presentation):
+    """
+    Returns the interface definition converted to a raw interface template (see
+    :func:`convert_interface_definition_from_type_to_raw_template`), frozen so that it can be shared
+    by all templates of the type.
+    
+    Use :func:`copy_raw_interface_template` to get a copy that can be modified.
+    """
+    
+    raw = convert_interface_definition_from_type_to_raw_template(context, presentation)
+    for operation_name, operation in raw.iteritems():
+        if 'inputs' in operation:
+            operation['inputs'] = FrozenDict(operation['inputs'])
+        raw[operation_name] = FrozenDict(operation)
+    return FrozenDict(raw)
+
+def copy_raw_interface_template(raw):
+    """
+    Copies a raw interface template, such that its operation dicts and input values can be modified
+    without affecting the original.
+    """
+    
+    the_copy = OrderedDict()
+    for operation_name, operation in raw.iteritems():
+        the_copy[operation_name] = OrderedDict()
+        for key, value in operation.iteritems():
+            if key == 'inputs':
+                the_copy[operation_name][key] = OrderedDict((k, Value(v.type, v.value, v.description)) for k, v in value.iteritems())
+            else:
+                the_copy[operation_name][key] = copy_raw_value(value)
+    return the_copy
+
 def convert_interface_definition_from_type_to_raw_template(context, presentation):
     raw = OrderedDict()
     
@@ -16,31 +16,47 @@
 
 from .exceptions import UnknownInputError, MissingRequiredInputError
 from aria_extension_cloudify.classic_modeling import add_deployment_plan_attributes
-from aria_extension_cloudify.classic_modeling.post_processing import PostProcessingContext
+from aria_extension_cloudify.classic_modeling.post_processing import PostProcessingContext, get_function_paths
 from aria.utils import deepcopy_with_locators, string_list_as_string
+from collections import OrderedDict
+from copy import copy
+from weakref import ref
+
+# Paths to the functions of parsed plans, by plan ID
+FUNCTION_PATHS = {}
+
+# Sections of the prepared plan that callers may change in place
+MUTABLE_SECTIONS = ('node_instances', 'workflows')
 
 def prepare_deployment_plan(plan, inputs=None, **kwargs):
     """
     Prepare a plan for deployment
+    
+    The parsed plan is not changed. The prepared plan has its own copy of its inputs, of the values
+    of evaluated functions (and the lists and dicts that contain them), and of its node instances and
+    workflows, so these can be changed in place. The rest, including the other parts of the nodes, is
+    shared with the parsed plan (copying it would cost about as much as preparing the plan), so it
+    must be replaced rather than changed in place. The paths to the functions are found once per
+    parsed plan.
     """
     
-    #print '!!! prepare_deployment_plan', inputs, kwargs
+    function_paths = get_plan_function_paths(plan)
     
-    plan = deepcopy_with_locators(plan)
-    add_deployment_plan_attributes(plan)
+    prepared_plan = plan.__class__(plan)
+    prepared_plan['inputs'] = OrderedDict((k, copy(v)) for k, v in plan['inputs'].iteritems())
     
     if inputs:
         unknown_inputs = []
         for input_name, the_input in inputs.iteritems():
-            if input_name in plan['inputs']:
-                plan['inputs'][input_name]['value'] = deepcopy_with_locators(the_input)
+            if input_name in prepared_plan['inputs']:
+                prepared_plan['inputs'][input_name]['value'] = deepcopy_with_locators(the_input)
             else:
                 unknown_inputs.append(input_name)
         if unknown_inputs:
             raise UnknownInputError('unknown inputs specified: %s' % string_list_as_string(unknown_inputs))
 
     missing_inputs = []    
-    for input_name, the_input in plan['inputs'].iteritems():
+    for input_name, the_input in prepared_plan['inputs'].iteritems():
         if the_input.get('value') is None:
             the_input['value'] = the_input.get('default')
         if the_input.get('value') is None:
@@ -51,7 +67,48 @@ def prepare_deployment_plan(plan, inputs=None, **kwargs):
     # TODO: now that we have inputs, we should scan properties and inputs
     # and evaluate functions
     
-    context = PostProcessingContext(plan, None, None, None, None)
-    context.process(plan)
+    context = PostProcessingContext(prepared_plan, None, None, None, None)
+    
+    # The inputs come first, because the other functions may refer to them (and they may have new values
+    # with functions, so we can't rely on the function paths)
+    prepared_plan['inputs'] = context.processed(prepared_plan['inputs'])
+    for k, paths in function_paths.iteritems():
+        if k != 'inputs':
+            prepared_plan[k] = context.processed(plan[k], paths)
+    for k in MUTABLE_SECTIONS:
+        if k in prepared_plan:
+            prepared_plan[k] = copy_structure(prepared_plan[k])
+    
+    add_deployment_plan_attributes(prepared_plan)
+    
+    return prepared_plan
+
+def get_plan_function_paths(plan):
+    """
+    Returns the paths to the functions in the parsed plan (see :func:`get_function_paths`), which are
+    found on first use and kept for as long as the plan exists.
+    """
+    
+    plan_id = id(plan)
+    cached = FUNCTION_PATHS.get(plan_id)
+    if (cached is not None) and (cached[0]() is plan):
+        return cached[1]
+    
+    function_paths = get_function_paths(plan) or OrderedDict()
+    FUNCTION_PATHS[plan_id] = (ref(plan, lambda _: FUNCTION_PATHS.pop(plan_id, None)), function_paths)
+    return function_paths
+
+def copy_structure(value):
+    """
+    Copies the lists and dicts in the value, recursively, sharing everything else.
+    """
     
-    return plan
+    if isinstance(value, list):
+        return [copy_structure(v) for v in value]
+    elif isinstance(value, dict):
+        r = copy(value)
+        for k, v in value.iteritems():
+            if isinstance(v, (list, dict)):
+                r[k] = copy_structure(v)
+        return r
+    return value
@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from collections import OrderedDict
+
+import testtools
+
+from aria_extension_cloudify.classic_modeling.nodes import Containment
+from framework.abstract_test_parser import AbstractTestParser
+
+
+class TestContainment(testtools.TestCase):
+
+    def create_containment(self, containers, hosts):
+        # Elements are their own keys
+        elements = OrderedDict((key, key) for key in containers)
+        return Containment(None, elements, containers.get, lambda key: key in hosts)
+
+    def test_host_lookups(self):
+        containment = self.create_containment(OrderedDict((
+            ('db', 'app'),
+            ('host', None),
+            ('app', 'host'),
+            ('other_host', None),
+            ('web', 'other_host'),
+            ('free', None))), ('host', 'other_host'))
+        self.assertEqual('host', containment.get_host('host'))
+        self.assertEqual('host', containment.get_host('app'))
+        self.assertEqual('host', containment.get_host('db'))
+        self.assertEqual('other_host', containment.get_host('web'))
+        self.assertIsNone(containment.get_host('free'))
+        self.assertIsNone(containment.get_host('unknown'))
+
+        # In the order of the elements, not including the host itself
+        self.assertEqual(['db', 'app'], containment.get_hosted('host'))
+        self.assertEqual(['web'], containment.get_hosted('other_host'))
+        self.assertEqual([], containment.get_hosted('app'))
+        self.assertEqual([], containment.get_hosted('unknown'))
+
+    def test_contained_in_unknown(self):
+        containment = self.create_containment({'app': 'missing'}, ())
+        self.assertIsNone(containment.get_host('app'))
+
+    def test_contained_in_cycle(self):
+        containment = self.create_containment(OrderedDict((
+            ('a', 'b'),
+            ('b', 'c'),
+            ('c', 'a'),
+            ('d', 'a'),
+            ('host', None),
+            ('e', 'host'))), ('host',))
+        for key in ('a', 'b', 'c', 'd'):
+            self.assertIsNone(containment.get_host(key))
+        self.assertEqual('host', containment.get_host('e'))
+        self.assertEqual(['e'], containment.get_hosted('host'))
+
+    def test_host_in_cycle(self):
+        # A cycle that includes a host ends at it
+        containment = self.create_containment(OrderedDict((
+            ('host', 'app'),
+            ('app', 'host'))), ('host',))
+        self.assertEqual('host', containment.get_host('host'))
+        self.assertEqual('host', containment.get_host('app'))
+        self.assertEqual(['app'], containment.get_hosted('host'))
+
+
+class TestHostIds(AbstractTestParser):
+
+    def test_node_host_ids(self):
+        yaml = """
+node_types:
+    cloudify.nodes.Compute: {}
+    app_type: {}
+relationships:
+    cloudify.relationships.contained_in: {}
+node_templates:
+    db:
+        type: app_type
+        relationships:
+            - type: cloudify.relationships.contained_in
+              target: app
+    host:
+        type: cloudify.nodes.Compute
+    app:
+        type: app_type
+        relationships:
+            - type: cloudify.relationships.contained_in
+              target: host
+    free:
+        type: app_type
+"""
+        plan = self.parse(yaml)
+        host_ids = dict((node['id'], node.get('host_id')) for node in plan['nodes'])
+        self.assertEqual({'db': 'host', 'host': 'host', 'app': 'host', 'free': None}, host_ids)
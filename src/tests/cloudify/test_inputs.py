@@ -14,7 +14,12 @@
 # under the License.
 #
 
-from dsl_parser.tasks import prepare_deployment_plan
+from copy import deepcopy
+
+from mock import patch
+
+from aria_extension_cloudify.classic_modeling.post_processing import get_function_paths
+from dsl_parser.tasks import prepare_deployment_plan, get_plan_function_paths
 from dsl_parser.exceptions import (MissingRequiredInputError,
                                   UnknownInputError,
                                   DSLParsingLogicException)
@@ -431,6 +436,96 @@ outputs:
         outputs = prepared.outputs
         self.assertEqual(8080, outputs['a']['value'])
 
+    def test_prepared_plans_share_parsed_plan(self):
+        yaml = """
+inputs:
+    port:
+        default: 9000
+node_types:
+    webserver_type:
+        properties:
+            port: {}
+            server: {}
+node_templates:
+    webserver:
+        type: webserver_type
+        properties:
+            port: { get_input: port }
+            server:
+                name: web
+outputs:
+    port:
+        value: { get_input: port }
+"""
+        plan = self.parse(yaml)
+        parsed = deepcopy(plan)
+
+        with patch('dsl_parser.tasks.get_function_paths',
+                   side_effect=get_function_paths) as mock_get_function_paths:
+            first = prepare_deployment_plan(plan, inputs={'port': 8000})
+            function_paths = get_plan_function_paths(plan)
+            second = prepare_deployment_plan(plan)
+        self.assertEqual(1, mock_get_function_paths.call_count)
+        self.assertIs(function_paths, get_plan_function_paths(plan))
+        self.assertFalse(hasattr(plan, 'function_paths'))
+        self.assertIn('nodes', function_paths)
+        self.assertIn('outputs', function_paths)
+
+        # The prepared plans don't alter the parsed plan or each other
+        self.assertEqual(parsed, plan)
+        self.assertEqual(8000, first['nodes'][0]['properties']['port'])
+        self.assertEqual(8000, first.outputs['port']['value'])
+        self.assertEqual(9000, second['nodes'][0]['properties']['port'])
+        self.assertEqual(9000, second.outputs['port']['value'])
+        self.assertEqual(8000, first['inputs']['port']['value'])
+        self.assertNotIn('value', plan['inputs']['port'])
+
+        # Everything without functions is shared with the parsed plan, except for the sections
+        # that callers may change
+        for prepared in (first, second):
+            self.assertIsNot(plan['nodes'], prepared['nodes'])
+            self.assertIs(plan['nodes'][0]['properties']['server'],
+                          prepared['nodes'][0]['properties']['server'])
+            self.assertIsNot(plan['node_instances'][0], prepared['node_instances'][0])
+            self.assertIsNot(plan['workflows'], prepared['workflows'])
+            self.assertIs(plan['relationships'], prepared['relationships'])
+
+    def test_prepared_plans_can_be_changed(self):
+        yaml = """
+inputs:
+    port:
+        default: 9000
+node_types:
+    webserver_type:
+        properties:
+            port: {}
+            server: {}
+node_templates:
+    webserver:
+        type: webserver_type
+        properties:
+            port: { get_input: port }
+            server:
+                name: web
+"""
+        plan = self.parse(yaml)
+        parsed = deepcopy(plan)
+
+        prepared = prepare_deployment_plan(plan)
+        prepared['nodes'][0]['properties']['port'] = 1
+        prepared['nodes'][0]['properties']['server'] = {'name': 'changed'}
+        prepared['node_instances'][0]['id'] = 'changed'
+        prepared['node_instances'][0]['relationships'].append({'target_id': 'added'})
+        prepared['node_instances'].append({'id': 'added'})
+        prepared['workflows']['added'] = {}
+        self.assertEqual(parsed, plan)
+
+        prepared = prepare_deployment_plan(plan)
+        self.assertEqual(9000, prepared['nodes'][0]['properties']['port'])
+        self.assertEqual({'name': 'web'}, prepared['nodes'][0]['properties']['server'])
+        self.assertEqual(parsed['node_instances'], prepared['node_instances'])
+        self.assertNotIn('added', prepared['workflows'])
+
     def test_missing_input_exception(self):
         yaml = """
 node_types:
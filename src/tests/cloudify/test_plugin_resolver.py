@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+import os
+import shutil
+import tempfile
+
+import testtools
+from mock import patch
+
+from aria import InvalidValueError
+from aria.consumption import ConsumptionContext
+from aria_extension_cloudify.classic_modeling.plugins import (PluginResolver,
+                                                              SCRIPT_RUNNER_RUN_OPERATION,
+                                                              SCRIPT_RUNNER_EXECUTE_WORKFLOW_OPERATION)
+
+
+def plugin(name, executor='central_deployment_agent'):
+    return {'name': name, 'executor': executor}
+
+
+class TestPluginResolver(testtools.TestCase):
+
+    def setUp(self):
+        super(TestPluginResolver, self).setUp()
+        self.prefix = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.prefix)
+        os.mkdir(os.path.join(self.prefix, 'scripts'))
+        with open(os.path.join(self.prefix, 'scripts', 'install.sh'), 'w') as f:
+            f.write('#!/bin/sh\n')
+
+    def create_resolver(self, *plugins):
+        context = ConsumptionContext()
+        context.loading.prefixes.append(self.prefix)
+        return PluginResolver(context, list(plugins))
+
+    def assert_invalid(self, message, resolver, implementation):
+        e = self.assertRaises(InvalidValueError, resolver.parse_implementation, implementation)
+        self.assertEqual(message, e.issue.message)
+
+    def test_plugin_operation(self):
+        resolver = self.create_resolver(plugin('first'), plugin('other', 'host_agent'))
+        self.assertEqual(('other', 'host_agent', 'tasks.run', {}),
+                         resolver.parse_implementation('other.tasks.run'))
+
+        # Defaults to the first plugin
+        self.assertEqual(('first', 'central_deployment_agent', 'unknown.run', {}),
+                         resolver.parse_implementation('unknown.run'))
+
+    def test_dotted_plugin_name(self):
+        resolver = self.create_resolver(plugin('first'), plugin('my.plugin'))
+        self.assertEqual(('my.plugin', 'central_deployment_agent', 'tasks.run', {}),
+                         resolver.parse_implementation('my.plugin.tasks.run'))
+
+    def test_ambiguous_plugin_name(self):
+        resolver = self.create_resolver(plugin('my'), plugin('my.plugin'))
+        self.assert_invalid('ambiguous plugin name in implementation: \'my.plugin.run\'',
+                            resolver, 'my.plugin.run')
+        self.assertEqual(('my', 'central_deployment_agent', 'other.run', {}),
+                         resolver.parse_implementation('my.other.run'))
+
+        # Two plugins with the same name are ambiguous, too
+        resolver = self.create_resolver(plugin('my'), plugin('my', 'host_agent'))
+        self.assert_invalid('ambiguous plugin name in implementation: \'my.run\'', resolver,
+                            'my.run')
+
+    def test_invalid_implementations(self):
+        self.assert_invalid('no operation name in implementation: \'my.\'',
+                            self.create_resolver(plugin('my')), 'my.')
+        self.assert_invalid('unknown plugin for implementation: \'my.run\'',
+                            self.create_resolver(), 'my.run')
+
+    def test_script(self):
+        resolver = self.create_resolver(plugin('script'))
+        plugin_name, executor, operation_name, inputs = \
+            resolver.parse_implementation('scripts/install.sh')
+        self.assertEqual(('script', 'central_deployment_agent', SCRIPT_RUNNER_RUN_OPERATION),
+                         (plugin_name, executor, operation_name))
+        self.assertEqual({'script_path': 'scripts/install.sh'}, inputs)
+
+        _, _, operation_name, inputs = resolver.parse_implementation('scripts/install.sh', True)
+        self.assertEqual(SCRIPT_RUNNER_EXECUTE_WORKFLOW_OPERATION, operation_name)
+        self.assertEqual({'script_path': {'default': 'scripts/install.sh'}}, inputs)
+
+        # The inputs are new every time, because they are merged into
+        inputs['script_path'] = None
+        self.assertEqual({'script_path': {'default': 'scripts/install.sh'}},
+                         resolver.parse_implementation('scripts/install.sh', True)[3])
+
+    def test_cached_is_file(self):
+        resolver = self.create_resolver(plugin('script'), plugin('my'))
+        with patch('os.path.isfile', side_effect=os.path.isfile) as isfile:
+            self.assertTrue(resolver.is_file('scripts/install.sh'))
+            self.assertFalse(resolver.is_file('scripts/missing.sh'))
+            self.assertEqual(2, isfile.call_count)
+
+            self.assertTrue(resolver.is_file('scripts/install.sh'))
+            self.assertFalse(resolver.is_file('scripts/missing.sh'))
+            resolver.parse_implementation('scripts/install.sh')
+            resolver.parse_implementation('my.run')
+            resolver.parse_implementation('my.run')
+            self.assertEqual(3, isfile.call_count) # only "my.run" was new
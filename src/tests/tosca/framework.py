@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, ConsumerChain, Read, Validate, Model, Instance
+from aria.loading import LiteralLocation
+from testtools import TestCase
+
+install_aria_extensions()
+
+TOSCA_VERSION_SECTION = 'tosca_definitions_version: tosca_simple_yaml_1_0\n'
+
+
+class AbstractTestTosca(TestCase):
+
+    def consume(self, template, consumers=(Read, Validate, Model, Instance), inputs=None,
+                fail_on_issues=True):
+        """
+        Consumes the TOSCA service template (without the version section), and returns the
+        context. Fails if there are any validation issues, unless told otherwise.
+        """
+
+        context = ConsumptionContext()
+        context.presentation.location = LiteralLocation(TOSCA_VERSION_SECTION + template)
+        if inputs:
+            for name, value in inputs.iteritems():
+                context.modeling.set_input(name, value)
+        ConsumerChain(context, consumers).consume()
+        if fail_on_issues and context.validation.has_issues:
+            self.fail('consumption failed with issues: \n\t%s' % '\n\t'.join(
+                str(issue) for issue in context.validation.issues))
+        return context
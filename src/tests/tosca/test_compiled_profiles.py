@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read
+from aria.loading import UriLocation
+from aria.reading import AlreadyReadException
+from aria_extension_tosca.simple_v1_0 import ToscaSimplePresenter1_0
+from mock import patch
+from importlib import import_module
+import os, shutil, tempfile
+
+from .framework import AbstractTestTosca
+
+# install_aria_extensions removes the extension package from sys.modules, but not its modules, so
+# "from aria_extension_tosca import compiled_profiles" fails if it has already been called
+compiled_profiles = import_module('aria_extension_tosca.compiled_profiles')
+
+TEMPLATE = """
+topology_template:
+  node_templates:
+    server:
+      type: tosca.nodes.Compute
+"""
+
+PROFILE_LOCATION = ToscaSimplePresenter1_0.SIMPLE_PROFILE_LOCATION
+
+
+class TestCompiledProfiles(AbstractTestTosca):
+
+    def setUp(self):
+        super(TestCompiledProfiles, self).setUp()
+
+        # Compile into a copy of the profiles
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.profiles_dir = os.path.join(directory, 'profiles')
+        ignore = shutil.ignore_patterns('*' + compiled_profiles.COMPILED_PROFILE_EXTENSION)
+        shutil.copytree(compiled_profiles.PROFILES_DIR, self.profiles_dir, ignore=ignore)
+        for patcher in (patch.object(compiled_profiles, 'PROFILES_DIR', self.profiles_dir),
+                        patch.dict(compiled_profiles._COMPILED_PROFILES, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _read(self):
+        return self.consume(TEMPLATE, consumers=(Read,))
+
+    def test_compiled_profile(self):
+        # Not compiled yet, so the profile is read from YAML
+        context = self._read()
+        self.assertNotIn(PROFILE_LOCATION, compiled_profiles._COMPILED_PROFILES)
+        documents_count = context.reading.documents_count
+        documents_hash = context.reading.documents_hash
+        locations_count = len(context.reading.locations)
+
+        compiled_profiles.compile_profile(ToscaSimplePresenter1_0, PROFILE_LOCATION)
+        context = self._read()
+        self.assertIn(PROFILE_LOCATION, compiled_profiles._COMPILED_PROFILES)
+
+        # The profile documents are still counted
+        self.assertGreater(documents_count, 1)
+        self.assertEqual(documents_count, context.reading.documents_count)
+        self.assertEqual(documents_hash, context.reading.documents_hash)
+        self.assertEqual(locations_count, len(context.reading.locations))
+        self.assertIn('tosca.nodes.Compute',
+                      context.presentation.presenter.service_template.node_types)
+
+    def test_stale_compiled_profile(self):
+        documents_hash = self._read().reading.documents_hash
+
+        compiled_profiles.compile_profile(ToscaSimplePresenter1_0, PROFILE_LOCATION)
+        with open(os.path.join(self.profiles_dir, 'tosca-simple-1.0', 'nodes.yaml'), 'a') as f:
+            f.write('\n# changed\n')
+
+        # The artifact does not match the documents anymore, so it is ignored
+        context = self._read()
+        self.assertNotIn(PROFILE_LOCATION, compiled_profiles._COMPILED_PROFILES)
+        self.assertEqual(documents_hash, context.reading.documents_hash)
+
+    def test_compiled_profile_already_read(self):
+        compiled_profiles.compile_profile(ToscaSimplePresenter1_0, PROFILE_LOCATION)
+        context = self._read()
+        self.assertRaises(AlreadyReadException, compiled_profiles.load_compiled_profile, context,
+                          UriLocation(PROFILE_LOCATION), None)
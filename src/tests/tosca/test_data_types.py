@@ -0,0 +1,240 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate
+from aria.utils import LRUCache, cachedmethod
+from aria_extension_tosca.simple_v1_0.data_types import PARSED_VALUES, Version, coerce_version
+from aria_extension_tosca.simple_v1_0.modeling.data_types import ConstraintPredicate
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      ports:
+        type: list
+        entry_schema:
+          type: integer
+          constraints:
+            - less_than: 10000
+      names:
+        type: map
+        entry_schema:
+          type: string
+          constraints:
+            - max_length: 5
+topology_template:
+  node_templates:
+    server:
+      type: Server
+      properties:
+        ports: [ 80, 65536, 8080 ]
+        names: { a: short, b: much-too-long }
+"""
+
+VERSIONS_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      version:
+        type: version
+topology_template:
+  node_templates:
+    server1:
+      type: Server
+      properties:
+        version: 1.2.3
+    server2:
+      type: Server
+      properties:
+        version: 1.2.3
+    server3:
+      type: Server
+      properties:
+        version: 1.2.4
+"""
+
+CONSTRAINTS_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      port:
+        type: integer
+        constraints:
+          - in_range: [ 1024, UNBOUNDED ]
+      mode:
+        type: string
+        constraints:
+          - valid_values: [ active, passive ]
+      name:
+        type: string
+        constraints:
+          - pattern: '[a-z]+'
+topology_template:
+  node_templates:
+    valid:
+      type: Server
+      properties:
+        port: 65536
+        mode: passive
+        name: web
+    invalid:
+      type: Server
+      properties:
+        port: 80
+        mode: standby
+        name: Web
+"""
+
+
+class TestEntries(AbstractTestTosca):
+
+    def test_constraint_violations_keep_values(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate), fail_on_issues=False)
+        messages = [issue.message for issue in context.validation.issues]
+        self.assertIn('value is not less than 10000 per constraint in "ports[1]": 65536', messages)
+        self.assertIn('value has a length greater than 5 per constraint in "names[b]": \'much-too-long\'',
+                      messages)
+
+        node_template = context.presentation.presenter.service_template.topology_template \
+            .node_templates['server']
+        values = node_template._get_property_values(context)
+        self.assertEqual([80, 65536, 8080], list(values['ports'].value))
+        self.assertEqual({'a': 'short', 'b': 'much-too-long'}, dict(values['names'].value))
+
+    def test_constraint_type_errors_are_reported(self):
+        with patch.object(ConstraintPredicate, 'check', side_effect=TypeError('cannot compare')):
+            context = self.consume(TEMPLATE, consumers=(Read, Validate), fail_on_issues=False)
+        messages = [issue.message for issue in context.validation.issues]
+        self.assertIn('field "ports" is not a valid "int": 8080', messages)
+        self.assertIn('field "names" is not a valid "str": \'short\'', messages)
+
+
+class TestConstraints(AbstractTestTosca):
+
+    def test_compiled_constraints(self):
+        context = self.consume(CONSTRAINTS_TEMPLATE, consumers=(Read, Validate),
+                               fail_on_issues=False)
+        messages = sorted(issue.message for issue in context.validation.issues)
+        self.assertEqual([
+            'value does not match regular expression \'[a-z]+\' per constraint in "name": \'Web\'',
+            'value is not greater than or equal to lower bound 1024 per constraint in "port": 80',
+            'value is not one of (\'active\', \'passive\') per constraint in "mode": \'standby\''],
+                         messages)
+
+    def test_in_range_unbounded(self):
+        predicate = ConstraintPredicate('in_range', (10, 'UNBOUNDED'))
+        self.assertTrue(predicate(10))
+        self.assertTrue(predicate(10 ** 20))
+        self.assertEqual(('is not greater than or equal to lower bound', 10), predicate.check(9))
+
+        predicate = ConstraintPredicate('in_range', (10, 20))
+        self.assertTrue(predicate(20))
+        self.assertEqual(('is not lesser than or equal to upper bound', 20), predicate.check(21))
+
+    def test_valid_values_hashable(self):
+        predicate = ConstraintPredicate('valid_values', ('a', 'b', 1))
+        self.assertEqual(frozenset(('a', 'b', 1)), predicate._valid_values)
+        self.assertTrue(predicate('a'))
+        self.assertTrue(predicate(1))
+        self.assertEqual(('is not one of', ('a', 'b', 1)), predicate.check('c'))
+
+        # An unhashable value can't be in the set, but is still checked
+        self.assertFalse(predicate(['a']))
+
+    def test_valid_values_unhashable(self):
+        predicate = ConstraintPredicate('valid_values', ([1, 2], {'a': 1}))
+        self.assertIsNone(predicate._valid_values)
+        self.assertTrue(predicate([1, 2]))
+        self.assertTrue(predicate({'a': 1}))
+        self.assertFalse(predicate([2, 1]))
+        self.assertFalse(predicate('a'))
+
+    def test_pattern(self):
+        predicate = ConstraintPredicate('pattern', '[a-z]+$')
+        self.assertTrue(predicate('abc'))
+        self.assertFalse(predicate('Abc'))
+        self.assertFalse(predicate('abc1'))
+        self.assertTrue(predicate(u'xyz'))
+
+        # An invalid regular expression is reported elsewhere, so it isn't applied
+        self.assertTrue(ConstraintPredicate('pattern', '[a-z')('123'))
+
+
+class TestParsedValues(AbstractTestTosca):
+
+    def setUp(self):
+        super(TestParsedValues, self).setUp()
+        PARSED_VALUES.clear()
+        PARSED_VALUES.reset_cache_info()
+
+    def test_memo_hits(self):
+        context = self.consume(VERSIONS_TEMPLATE, consumers=(Read, Validate))
+        hits, misses, _, size = PARSED_VALUES.cache_info()
+        self.assertTrue(hits > 0) # the second "1.2.3"
+        self.assertEqual(misses, size)
+        self.assertEqual(PARSED_VALUES.cache_info(),
+                         context.presentation.presenter._method_cache_info['_parsed_values'])
+
+        version = coerce_version(context, None, None, None, None, '1.2.3', None)
+        self.assertIsInstance(version, Version)
+        self.assertIs(version, coerce_version(context, None, None, None, None, '1.2.3', None))
+        self.assertIsNot(version, coerce_version(context, None, None, None, None, '1.2.4', None))
+        self.assertEqual((hits + 1, misses + 2, 10000, size + 2), PARSED_VALUES.cache_info())
+
+    def test_disabled(self):
+        self.addCleanup(setattr, cachedmethod, 'ENABLED', cachedmethod.ENABLED)
+        cachedmethod.ENABLED = False
+
+        context = self.consume(VERSIONS_TEMPLATE, consumers=(Read, Validate))
+        version = coerce_version(context, None, None, None, None, '1.2.3', None)
+        self.assertIsNot(version, coerce_version(context, None, None, None, None, '1.2.3', None))
+        self.assertEqual((0, 0, PARSED_VALUES.maxsize, 0), PARSED_VALUES.cache_info())
+
+
+class TestLRUCache(AbstractTestTosca):
+
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        created = []
+        def get(key):
+            return cache.get(key, lambda: created.append(key) or key.upper())
+
+        self.assertEqual('A', get('a'))
+        self.assertEqual('B', get('b'))
+        self.assertEqual('A', get('a')) # hit, so "a" becomes the most recently used
+        self.assertEqual('C', get('c')) # evicts "b"
+        self.assertEqual('A', get('a'))
+        self.assertEqual('B', get('b')) # evicts "c"
+        self.assertEqual(['a', 'b', 'c', 'b'], created)
+        self.assertEqual((2, 4, 2, 2), cache.cache_info())
+
+        cache.reset_cache_info()
+        cache.clear()
+        self.assertEqual((0, 0, 2, 0), cache.cache_info())
+
+    def test_create_fn_exception(self):
+        cache = LRUCache()
+        def fail():
+            raise ValueError()
+
+        self.assertRaises(ValueError, cache.get, 'a', fail)
+        self.assertEqual('A', cache.get('a', lambda: 'A'))
+        self.assertEqual((0, 1, 128, 1), cache.cache_info())
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.modeling import diff, diff_instances
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      host:
+        type: string
+      url:
+        type: string
+  Client:
+    derived_from: tosca.nodes.Root
+    requirements:
+      - server:
+          capability: tosca.capabilities.Node
+          node: Server
+topology_template:
+  inputs:
+    host:
+      type: string
+      default: www.example.com
+  node_templates:
+    server:
+      type: Server
+      properties:
+        host: { get_input: host }
+        url: { concat: [ 'http://', { get_property: [ SELF, host ] } ] }
+    client:
+      type: Client
+      requirements:
+        - server: server
+%s"""
+
+CACHE_NODE_TEMPLATE = """
+    cache:
+      type: tosca.nodes.Root
+"""
+
+RETYPED_CACHE_NODE_TEMPLATE = """
+    cache:
+      type: tosca.nodes.Compute
+"""
+
+
+class TestDiff(AbstractTestTosca):
+
+    def _get_node_id(self, context, template_name):
+        return [n.id for n in context.modeling.instance.nodes.itervalues()
+                if n.template_name == template_name][0]
+
+    def _get_steps(self, steps):
+        return [(step['action'], step['entity_type'], step['entity_id']) for step in steps]
+
+    def test_same_instance(self):
+        context = self.consume(TEMPLATE % '')
+        new_context = self.consume(TEMPLATE % '')
+        self.assertEqual([], diff_instances(context.modeling.instance,
+                                            new_context.modeling.instance))
+
+    def test_changed_input(self):
+        context = self.consume(TEMPLATE % '')
+        new_context = self.consume(TEMPLATE % '', inputs={'host': 'db.example.org'})
+        steps = diff_instances(context.modeling.instance, new_context.modeling.instance)
+
+        # Nodes are matched by template name, so the patch uses the old IDs
+        server_id = self._get_node_id(context, 'server')
+        self.assertEqual(sorted([
+            ('modify', 'property', 'nodes:%s:properties:host' % server_id),
+            ('modify', 'property', 'nodes:%s:properties:url' % server_id),
+            ('modify', 'input', 'inputs:host')]), sorted(self._get_steps(steps)))
+        values = dict((step['entity_id'], step['value']['value']) for step in steps)
+        self.assertEqual('http://db.example.org', values['nodes:%s:properties:url' % server_id])
+
+    def test_changed_node_count(self):
+        context = self.consume(TEMPLATE % '')
+        new_context = self.consume(TEMPLATE % CACHE_NODE_TEMPLATE)
+
+        steps = diff_instances(context.modeling.instance, new_context.modeling.instance)
+        cache_id = self._get_node_id(new_context, 'cache')
+        self.assertEqual([('add', 'node', 'nodes:%s' % cache_id)], self._get_steps(steps))
+        self.assertEqual('cache', steps[0]['value']['template_name'])
+
+        steps = diff_instances(new_context.modeling.instance, context.modeling.instance)
+        self.assertEqual([('remove', 'node', 'nodes:%s' % cache_id)], self._get_steps(steps))
+
+    def test_only_matching_nodes_are_fingerprinted(self):
+        fingerprinted = []
+        original_fingerprint_node = diff._fingerprint_node
+        def fingerprint_node(raw):
+            fingerprinted.append(raw['template_name'])
+            return original_fingerprint_node(raw)
+
+        context = self.consume(TEMPLATE % '')
+        cache_context = self.consume(TEMPLATE % CACHE_NODE_TEMPLATE)
+        retyped_context = self.consume(TEMPLATE % RETYPED_CACHE_NODE_TEMPLATE)
+        with patch.object(diff, '_fingerprint_node', fingerprint_node):
+            diff_instances(context.modeling.instance, cache_context.modeling.instance)
+            diff_instances(cache_context.modeling.instance, context.modeling.instance)
+            steps = diff_instances(cache_context.modeling.instance,
+                                   retyped_context.modeling.instance)
+
+        # Added, removed and retyped nodes are not fingerprinted
+        self.assertNotIn('cache', fingerprinted)
+        cache_id = self._get_node_id(cache_context, 'cache')
+        self.assertEqual([('remove', 'node', 'nodes:%s' % cache_id),
+                          ('add', 'node', 'nodes:%s' % cache_id)], self._get_steps(steps))
+        self.assertEqual('tosca.nodes.Compute', steps[1]['value']['type_name'])
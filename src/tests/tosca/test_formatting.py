@@ -0,0 +1,130 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model, Instance
+from aria.utils import json_dumps, yaml_dumps, json_dump, yaml_dump, yaml_loads
+from aria.utils.rest_server import RestServer, RestRequestHandler
+from collections import OrderedDict
+from StringIO import StringIO
+import json
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      configuration:
+        type: map
+        entry_schema: string
+topology_template:
+  node_templates:
+    server:
+      type: Server
+      properties:
+        configuration: { a: x, b: y }
+    database:
+      type: Server
+      properties:
+        configuration: { c: z }
+"""
+
+
+class TestStreaming(AbstractTestTosca):
+
+    def consume_scaled_out(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        context.modeling.model.node_templates['server'].default_instances = 3
+        Instance(context).consume()
+        self.assertFalse(context.validation.has_issues)
+
+        # Scaled out instances share their values
+        nodes = context.modeling.instance.find_nodes('server')
+        self.assertIs(nodes[0].properties['configuration'].value,
+                      nodes[1].properties['configuration'].value)
+        return context
+
+    def test_json(self):
+        context = self.consume_scaled_out()
+
+        out = StringIO()
+        json_dump(context.modeling.instance_as_lazy_raw, out)
+        self.assertEqual(json_dumps(context.modeling.instance_as_raw), out.getvalue())
+
+        out = StringIO()
+        json_dump(context.modeling.model_as_lazy_raw, out)
+        self.assertEqual(json_dumps(context.modeling.model_as_raw), out.getvalue())
+
+    def test_yaml(self):
+        context = self.consume_scaled_out()
+
+        out = StringIO()
+        yaml_dump(context.modeling.instance_as_lazy_raw, out)
+        materialized = yaml_dumps(context.modeling.instance_as_raw)
+        self.assertEqual(materialized, out.getvalue())
+        self.assertNotIn('&id', materialized)
+        self.assertEqual(3, materialized.count('a: x'))
+
+        out = StringIO()
+        yaml_dump(context.modeling.model_as_lazy_raw, out)
+        self.assertEqual(yaml_dumps(context.modeling.model_as_raw), out.getvalue())
+
+    def test_yaml_empty_generator(self):
+        out = StringIO()
+        yaml_dump(OrderedDict((('a', 1), ('b', (v for v in ())))), out)
+        self.assertEqual({'a': 1, 'b': []}, yaml_loads(out.getvalue()))
+
+
+class TestRestServer(AbstractTestTosca):
+
+    def request(self, handler_fn):
+        rest_server = RestServer()
+        rest_server.routes['^/test'] = {'GET': handler_fn, 'media_type': 'application/json'}
+        handler = MockRestRequestHandler(rest_server, '/test')
+        handler.handle_method('GET')
+        head, body = handler.wfile.getvalue().split('\r\n\r\n', 1)
+        return head.split('\r\n', 1)[0], body
+
+    def test_generator(self):
+        status, body = self.request(lambda handler: {'values': (v for v in (1, 2, u'\xe9'))})
+        self.assertIn(' 200 ', status)
+        self.assertEqual({'values': [1, 2, u'\xe9']}, json.loads(body))
+
+    def test_error_while_encoding(self):
+        def fail():
+            yield 1
+            raise ValueError('failed while encoding')
+
+        status, body = self.request(lambda handler: {'values': fail()})
+        self.assertIn(' 500 ', status)
+        self.assertEqual('Internal error: failed while encoding\n', body)
+
+
+class MockRestRequestHandler(RestRequestHandler):
+    def __init__(self, rest_server, path):
+        self.rest_server = rest_server
+        self.handled = False
+        self.matched_re = None
+        self.matched_route = None
+        self.path = path
+        self.command = 'GET'
+        self.request_version = 'HTTP/1.0'
+        self.requestline = 'GET %s HTTP/1.0' % path
+        self.client_address = ('localhost', 0)
+        self.wfile = StringIO()
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,318 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model
+from aria.consumption.modeling import Instantiate, SatisfyRequirements
+from aria_extension_tosca.simple_v1_0 import ToscaSimplePresenter1_0
+from aria_extension_tosca.simple_v1_0.functions import (GetProperty, GetNodesOfType,
+                                                     get_named_modelable_entities)
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      host:
+        type: string
+      ports:
+        type: list
+        entry_schema: integer
+  Client:
+    derived_from: tosca.nodes.Root
+    properties:
+      server_host:
+        type: string
+      url:
+        type: string
+      domain:
+        type: string
+      port:
+        type: integer
+topology_template:
+  inputs:
+    host:
+      type: string
+      default: www.example.com
+  node_templates:
+    server:
+      type: Server
+      properties:
+        host: { get_input: host }
+        ports: [ 80, 8080 ]
+    client:
+      type: Client
+      properties:
+        server_host: { get_property: [ server, host ] }
+        url: { concat: [ 'http://', { get_property: [ client, server_host ] }, ':',
+                         { get_property: [ server, ports, 1 ] } ] }
+        domain: { token: [ { get_property: [ SELF, server_host ] }, '.', 1 ] }
+        port: { get_property: [ server, ports, 1 ] }
+"""
+
+CYCLE_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      a:
+        type: string
+      b:
+        type: string
+      c:
+        type: string
+topology_template:
+  node_templates:
+    server:
+      type: Server
+      properties:
+        c: { get_property: [ SELF, a ] }
+        a: { concat: [ { get_property: [ SELF, b ] } ] }
+        b: { get_property: [ SELF, a ] }
+"""
+
+CROSS_TEMPLATE_CYCLE_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      a:
+        type: string
+      b:
+        type: string
+topology_template:
+  node_templates:
+    server:
+      type: Server
+      properties:
+        a: { get_property: [ client, b ] }
+        b: b
+    client:
+      type: Server
+      properties:
+        a: a
+        b: { concat: [ { get_property: [ server, a ] } ] }
+"""
+
+NODES_OF_TYPE_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+  WebServer:
+    derived_from: Server
+  Client:
+    derived_from: tosca.nodes.Root
+    properties:
+      servers:
+        type: list
+        entry_schema: string
+      web_servers:
+        type: list
+        entry_schema: string
+topology_template:
+  node_templates:
+    web:
+      type: WebServer
+    database:
+      type: Server
+    client:
+      type: Client
+      properties:
+        servers: { get_nodes_of_type: Server }
+        web_servers: { get_nodes_of_type: WebServer }
+"""
+
+RELATIONSHIP_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    capabilities:
+      endpoint:
+        type: tosca.capabilities.Endpoint
+  Client:
+    derived_from: tosca.nodes.Root
+    requirements:
+      - server:
+          capability: tosca.capabilities.Endpoint
+          relationship:
+            type: tosca.relationships.ConnectsTo
+topology_template:
+  node_templates:
+    server:
+      type: Server
+    client:
+      type: Client
+      requirements:
+        - server:
+            node: server
+"""
+
+
+class TestFunctions(AbstractTestTosca):
+
+    def _get_properties(self, context, template_name):
+        node = context.modeling.instance.find_nodes(template_name)[0]
+        return dict((k, v.value) for k, v in node.properties.iteritems())
+
+    def test_nested_functions(self):
+        properties = self._get_properties(self.consume(TEMPLATE), 'client')
+        self.assertEqual('www.example.com', properties['server_host'])
+        self.assertEqual('http://www.example.com:8080', properties['url'])
+        self.assertEqual(8080, properties['port'])
+
+    def test_named_entities_are_model_elements(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        properties = context.modeling.model.node_templates['client'].properties
+        # The input is not available while modeling, but values that don't depend on it are
+        self.assertEqual(8080, properties['port'].value)
+        self.assertIsInstance(properties['server_host'].value, GetProperty)
+
+    def test_nested_functions_are_memoized(self):
+        evaluated = []
+        original_evaluate_entity = GetProperty._evaluate_entity
+        def evaluate_entity(function, context, modelable_entity):
+            evaluated.append((modelable_entity, tuple(function.nested_property_name_or_index)))
+            return original_evaluate_entity(function, context, modelable_entity)
+
+        with patch.object(GetProperty, '_evaluate_entity', evaluate_entity):
+            context = self.consume(TEMPLATE)
+
+        # Every property of every entity was read once, though "client.server_host" is read by
+        # "url" and "domain", and "server.ports.1" by "url" and "port"
+        server = context.modeling.instance.find_nodes('server')[0]
+        client = context.modeling.instance.find_nodes('client')[0]
+        evaluated = [(e, p) for e, p in evaluated if e in (server, client)]
+        self.assertEqual(len(set((id(e), p) for e, p in evaluated)), len(evaluated))
+        self.assertEqual(set([(id(server), ('host',)), (id(server), ('ports', 1)),
+                              (id(client), ('server_host',))]),
+                         set((id(e), p) for e, p in evaluated))
+
+    def test_inputs_invalidate_memoized_values(self):
+        context = self.consume(TEMPLATE, inputs={'host': 'db.example.org'})
+        properties = self._get_properties(context, 'client')
+        self.assertEqual('db.example.org', properties['server_host'])
+        self.assertEqual('http://db.example.org:8080', properties['url'])
+
+    def test_cyclical_functions(self):
+        context = self.consume(CYCLE_TEMPLATE, consumers=(Read, Validate, Model), fail_on_issues=False)
+        messages = [issue.message for issue in context.validation.issues]
+        self.assertIn('cyclical function evaluation: SELF.b -> SELF.a -> SELF.b', messages)
+
+        # "c" only depends on the cycle
+        self.assertFalse(any('SELF.c' in message for message in messages))
+
+    def test_cross_template_cyclical_functions(self):
+        context = self.consume(CROSS_TEMPLATE_CYCLE_TEMPLATE, consumers=(Read, Validate, Model),
+                               fail_on_issues=False)
+        messages = [issue.message for issue in context.validation.issues]
+        self.assertIn('cyclical function evaluation: client.b -> server.a -> client.b', messages)
+
+    def test_get_nodes_of_type(self):
+        context = self.consume(NODES_OF_TYPE_TEMPLATE)
+        properties = self._get_properties(context, 'client')
+        instance = context.modeling.instance
+        self.assertEqual(sorted(instance.get_node_ids('database') + instance.get_node_ids('web')),
+                         sorted(properties['servers']))
+        self.assertEqual(list(instance.get_node_ids('web')), properties['web_servers'])
+
+    def test_get_nodes_of_type_while_modeling(self):
+        context = self.consume(NODES_OF_TYPE_TEMPLATE, consumers=(Read, Validate, Model))
+        properties = context.modeling.model.node_templates['client'].properties
+        self.assertIsInstance(properties['servers'].value, GetNodesOfType)
+
+    def test_named_entities(self):
+        context = self.consume(RELATIONSHIP_TEMPLATE)
+        client = context.modeling.model.node_templates['client']
+        relationship_template = client.requirement_templates[0].relationship_template
+        relationship_template.template_name = 'connection'
+        relationship = context.modeling.instance.find_nodes('client')[0].relationships[0]
+        relationship.template_name = 'connection'
+        context.modeling.reset_instance_index()
+
+        # While modeling
+        self.assertEqual([client], get_named_modelable_entities(context, client, 'client'))
+        self.assertEqual([relationship_template],
+                         get_named_modelable_entities(context, client, 'connection'))
+
+        # For the service instance
+        self.assertEqual(list(context.modeling.instance.find_nodes('client')),
+                         get_named_modelable_entities(context, None, 'client'))
+        self.assertEqual([relationship],
+                         get_named_modelable_entities(context, None, 'connection'))
+        self.assertEqual([], get_named_modelable_entities(context, None, 'missing'))
+
+
+class TestInstanceIndex(AbstractTestTosca):
+
+    def test_find_nodes_and_relationships(self):
+        context = self.consume(RELATIONSHIP_TEMPLATE)
+        instance = context.modeling.instance
+        instance_index = context.modeling.instance_index
+        self.assertIs(instance_index, context.modeling.instance_index)
+        self.assertEqual(list(instance.find_nodes('server')), instance_index.find_nodes('server'))
+        self.assertEqual([], instance_index.find_nodes('missing'))
+
+        relationship = instance.find_nodes('client')[0].relationships[0]
+        relationship.template_name = 'connection'
+        context.modeling.reset_instance_index()
+        self.assertEqual([relationship], context.modeling.instance_index.find_relationships('connection'))
+
+    def test_reset_when_instance_changes(self):
+        context = self.consume(RELATIONSHIP_TEMPLATE, consumers=(Read, Validate, Model, Instantiate))
+        instance_index = context.modeling.instance_index
+        self.assertEqual(1, len(instance_index.find_nodes('server')))
+        SatisfyRequirements(context).consume()
+        self.assertIsNot(instance_index, context.modeling.instance_index)
+        context.modeling.model.instantiate(context, None)
+        self.assertIsNot(instance_index.instance, context.modeling.instance_index.instance)
+
+    def test_relationship_templates(self):
+        context = self.consume(RELATIONSHIP_TEMPLATE, consumers=(Read, Validate, Model))
+        requirement_template = context.modeling.model.node_templates['client'].requirement_templates[0]
+        requirement_template.relationship_template.template_name = 'connection'
+        node_template_index = context.modeling.node_template_index
+        self.assertEqual([requirement_template.relationship_template],
+                         node_template_index.get_relationship_templates('connection'))
+        self.assertEqual([], node_template_index.get_relationship_templates('client'))
+
+
+class TestTopologyIndex(AbstractTestTosca):
+
+    def test_by_type_with_ancestors(self):
+        context = self.consume(NODES_OF_TYPE_TEMPLATE, consumers=(Read, Validate))
+        topology_index = context.presentation.presenter._get_topology_index(context)
+        self.assertIs(topology_index, context.presentation.presenter._get_topology_index(context))
+
+        def get_names(type_name):
+            return sorted(v._name for v in topology_index.node_templates_by_type.get(type_name, ()))
+
+        self.assertEqual(['web'], get_names('WebServer'))
+        self.assertEqual(['database', 'web'], get_names('Server'))
+        self.assertEqual(['client', 'database', 'web'], get_names('tosca.nodes.Root'))
+        self.assertEqual([], get_names('tosca.nodes.Compute'))
+
+    def test_rebuilt_after_merge_import(self):
+        context = self.consume(NODES_OF_TYPE_TEMPLATE, consumers=(Read, Validate))
+        presenter = context.presentation.presenter
+        topology_index = presenter._get_topology_index(context)
+        self.assertNotIn('cache', [v._name for v in topology_index.node_templates_by_type['Server']])
+
+        presenter._merge_import(ToscaSimplePresenter1_0(raw={
+            'topology_template': {'node_templates': {'cache': {'type': 'Server'}}}}))
+        topology_index = presenter._get_topology_index(context)
+        self.assertEqual(['cache', 'database', 'web'],
+                         sorted(v._name for v in topology_index.node_templates_by_type['Server']))
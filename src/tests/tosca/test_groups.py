@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+group_types:
+  Group:
+    derived_from: tosca.groups.Root
+topology_template:
+  node_templates:
+    server:
+      type: tosca.nodes.Root
+    database:
+      type: tosca.nodes.Root
+    cache:
+      type: tosca.nodes.Root
+  groups:
+    all:
+      type: Group
+      members: [ server, database ]
+    servers:
+      type: Group
+      members: [ server ]
+"""
+
+
+class TestNodeGroups(AbstractTestTosca):
+
+    def test_node_in_several_groups(self):
+        context = self.consume(TEMPLATE)
+        instance = context.modeling.instance
+        server = instance.find_nodes('server')[0]
+        database = instance.find_nodes('database')[0]
+        cache = instance.find_nodes('cache')[0]
+
+        self.assertEqual(['all', 'servers'],
+                         [group.template_name for group in instance.find_node_groups(server.id)])
+        self.assertEqual(['all'],
+                         [group.template_name for group in instance.find_node_groups(database.id)])
+        self.assertEqual([], list(instance.find_node_groups(cache.id)))
+        self.assertEqual([], list(instance.find_node_groups('unknown')))
+
+    def test_reindex(self):
+        context = self.consume(TEMPLATE)
+        instance = context.modeling.instance
+        server = instance.find_nodes('server')[0]
+        cache = instance.find_nodes('cache')[0]
+        servers = instance.find_groups('servers')[0]
+        self.assertEqual(2, len(instance.find_node_groups(server.id)))
+
+        # Members listed more than once still belong to the group once
+        servers.member_node_ids.append(cache.id)
+        servers.member_node_ids.append(cache.id)
+        self.assertEqual([], list(instance.find_node_groups(cache.id)))
+        instance.index_node_groups()
+        self.assertEqual([servers], list(instance.find_node_groups(cache.id)))
+        self.assertEqual(2, len(instance.find_node_groups(server.id)))
@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model, Instance
+from aria.modeling import IdGenerator
+from aria.modeling.utils import ID_ALPHABET, ID_LENGTH
+from aria.tools import cli
+from mock import patch
+from StringIO import StringIO
+from threading import Thread
+import json, os, shutil, tempfile
+
+from .framework import AbstractTestTosca, TOSCA_VERSION_SECTION
+
+TEMPLATE = """
+topology_template:
+  node_templates:
+    server:
+      type: tosca.nodes.Root
+    database:
+      type: tosca.nodes.Root
+"""
+
+
+class TestIdGenerator(AbstractTestTosca):
+
+    def test_unique(self):
+        id_generator = IdGenerator()
+        ids = [id_generator.generate() for _ in xrange(10000)]
+        self.assertEqual(len(ids), len(set(ids)))
+        for the_id in ids:
+            self.assertEqual(ID_LENGTH, len(the_id))
+            self.assertEqual('', the_id.strip(ID_ALPHABET))
+
+    def test_length(self):
+        id_generator = IdGenerator(batch_size=8)
+        self.assertEqual(6, len(id_generator.generate(6)))
+        self.assertEqual(ID_LENGTH, len(id_generator.generate()))
+        self.assertEqual(100, len(id_generator.generate(100)))
+        self.assertEqual('', id_generator.generate(0))
+
+    def test_seeded(self):
+        def generate(seed):
+            id_generator = IdGenerator(seed, batch_size=16)
+            return [id_generator.generate(length) for length in (6, 25, 40)]
+
+        self.assertEqual(generate(1), generate(1))
+        self.assertNotEqual(generate(1), generate(2))
+
+    def test_threads(self):
+        id_generator = IdGenerator(batch_size=64)
+        ids = []
+        def generate():
+            ids.extend([id_generator.generate() for _ in xrange(1000)])
+
+        threads = [Thread(target=generate) for _ in xrange(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8000, len(set(ids)))
+
+    def test_fork(self):
+        id_generator = IdGenerator()
+        id_generator.generate()
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.write(write_fd, id_generator.generate())
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        child_id = os.read(read_fd, ID_LENGTH)
+        os.close(read_fd)
+
+        self.assertEqual(ID_LENGTH, len(child_id))
+        self.assertNotEqual(id_generator.generate(), child_id)
+
+    def test_seeded_instances(self):
+        def instantiate():
+            context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+            context.modeling.id_generator = IdGenerator('seed')
+            Instance(context).consume()
+            return context.modeling.instance.nodes.keys()
+
+        self.assertEqual(instantiate(), instantiate())
+
+    def test_cli_seed(self):
+        path = tempfile.mkdtemp()
+        try:
+            template_path = os.path.join(path, 'template.yaml')
+            with open(template_path, 'w') as f:
+                f.write(TOSCA_VERSION_SECTION + TEMPLATE)
+            outs = []
+            for seed in ('a', 'a', 'b'):
+                out = StringIO()
+                with patch('sys.argv', ['aria', template_path, 'instance', '--id-seed', seed, '--json']), \
+                    patch('sys.stdout', out):
+                    cli.main()
+                outs.append([node['id'] for node in json.loads(out.getvalue())['nodes']])
+        finally:
+            shutil.rmtree(path)
+
+        self.assertEqual(outs[0], outs[1])
+        self.assertNotEqual(outs[0], outs[2])
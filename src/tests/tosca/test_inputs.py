@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.modeling import Parameter
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      host:
+        type: string
+      url:
+        type: string
+      name:
+        type: string
+  Client:
+    derived_from: tosca.nodes.Root
+    properties:
+      host:
+        type: string
+  Database:
+    derived_from: tosca.nodes.Root
+    properties:
+      port:
+        type: integer
+      name:
+        type: string
+topology_template:
+  inputs:
+    host:
+      type: string
+      default: www.example.com
+    port:
+      type: integer
+      default: 5432
+  node_templates:
+    server:
+      type: Server
+      properties:
+        host: { get_input: host }
+        url: { concat: [ 'http://', { get_property: [ SELF, host ] } ] }
+        name: server
+    client:
+      type: Client
+      properties:
+        host: { get_property: [ server, host ] }
+    database:
+      type: Database
+      properties:
+        port: { get_input: port }
+        name: database
+"""
+
+
+class TestUpdateInputs(AbstractTestTosca):
+
+    def _get_properties(self, context):
+        return dict((node.template_name, dict((k, v.value) for k, v in node.properties.iteritems()))
+                    for node in context.modeling.instance.nodes.itervalues())
+
+    def test_update_inputs(self):
+        context = self.consume(TEMPLATE)
+        instance = context.modeling.instance
+        node_ids = sorted(instance.nodes.iterkeys())
+
+        coerced = []
+        original_coerce_values = Parameter.coerce_values
+        def coerce_values(parameter, *args, **kwargs):
+            coerced.append(parameter)
+            return original_coerce_values(parameter, *args, **kwargs)
+
+        with patch.object(Parameter, 'coerce_values', coerce_values):
+            changed_nodes = instance.update_inputs(context, {'host': 'db.example.org'})
+        self.assertFalse(context.validation.has_issues)
+
+        # Only the input and the parameters that depend on it, including those of other nodes,
+        # were re-evaluated
+        server = instance.find_nodes('server')[0]
+        client = instance.find_nodes('client')[0]
+        self.assertEqual(set([server.id, client.id]), set(node.id for node in changed_nodes))
+        self.assertEqual(set([id(server.properties['host']), id(server.properties['url']),
+                              id(client.properties['host'])]),
+                         set(id(v) for v in coerced))
+
+        # The result is the same as rebuilding everything, keeping the node IDs
+        self.assertEqual(node_ids, sorted(instance.nodes.iterkeys()))
+        rebuilt_context = self.consume(TEMPLATE, inputs={'host': 'db.example.org'})
+        self.assertEqual(self._get_properties(rebuilt_context), self._get_properties(context))
+        self.assertEqual('http://db.example.org', server.properties['url'].value)
+        self.assertEqual('db.example.org', client.properties['host'].value)
+
+    def test_update_inputs_unchanged(self):
+        context = self.consume(TEMPLATE)
+        changed_nodes = context.modeling.instance.update_inputs(context, {'port': 5432})
+        self.assertEqual([], list(changed_nodes))
+
+    def test_update_unsupported_input(self):
+        context = self.consume(TEMPLATE)
+        context.modeling.instance.update_inputs(context, {'user': 'admin'})
+        self.assertTrue(context.validation.has_issues)
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model, Instance, InstallPlan
+from aria.tools import cli
+from aria.validation import Issue
+from mock import patch
+from StringIO import StringIO
+import json, os, shutil, tempfile
+
+from .framework import AbstractTestTosca, TOSCA_VERSION_SECTION
+
+CONSUMERS = (Read, Validate, Model, Instance, InstallPlan)
+
+TEMPLATE = """
+topology_template:
+  node_templates:
+    database:
+      type: tosca.nodes.Root
+    cache:
+      type: tosca.nodes.Root
+    application:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: database
+    web:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: application
+    balancer:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: web
+        - dependency: cache
+"""
+
+CYCLICAL_TEMPLATE = """
+topology_template:
+  node_templates:
+    database:
+      type: tosca.nodes.Root
+    a:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: database
+        - dependency: b
+    b:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: a
+    client:
+      type: tosca.nodes.Root
+      requirements:
+        - dependency: b
+"""
+
+
+class TestInstallPlan(AbstractTestTosca):
+
+    def template_names(self, context, waves):
+        nodes = context.modeling.instance.nodes
+        return [sorted(nodes[node_id].template_name for node_id in wave) for wave in waves]
+
+    def test_waves(self):
+        context = self.consume(TEMPLATE, consumers=CONSUMERS)
+        self.assertEqual([['cache', 'database'], ['application'], ['web'], ['balancer']],
+                         self.template_names(context, context.modeling.install_waves))
+
+    def test_cyclical_relationships(self):
+        context = self.consume(CYCLICAL_TEMPLATE, consumers=CONSUMERS, fail_on_issues=False)
+        self.assertEqual([['database']],
+                         self.template_names(context, context.modeling.install_waves))
+
+        issues = context.validation.issues
+        self.assertEqual(1, len(issues))
+        self.assertEqual(Issue.BETWEEN_INSTANCES, issues[0].level)
+        self.assertIn('nodes have cyclical relationships', issues[0].message)
+        for node in context.modeling.instance.find_nodes('a') + context.modeling.instance.find_nodes('b'):
+            self.assertIn(node.id, issues[0].message)
+
+        # "client" only depends on the cycle
+        self.assertNotIn(context.modeling.instance.find_nodes('client')[0].id, issues[0].message)
+
+    def test_as_raw(self):
+        context = self.consume(TEMPLATE, consumers=CONSUMERS)
+        raw = context.modeling.install_plan_as_raw
+        self.assertEqual(['critical_path_length', 'fan_out', 'install', 'uninstall'], raw.keys())
+        self.assertEqual(4, raw['critical_path_length'])
+        self.assertEqual([2, 1, 1, 1], raw['fan_out'])
+        self.assertEqual([['cache', 'database'], ['application'], ['web'], ['balancer']],
+                         self.template_names(context, raw['install']))
+        self.assertEqual(raw['install'][::-1], raw['uninstall'])
+
+    def test_cli(self):
+        path = tempfile.mkdtemp()
+        try:
+            template_path = os.path.join(path, 'template.yaml')
+            with open(template_path, 'w') as f:
+                f.write(TOSCA_VERSION_SECTION + TEMPLATE)
+            out = StringIO()
+            with patch('sys.argv', ['aria', template_path, 'plan', '--json']), \
+                patch('sys.stdout', out):
+                cli.main()
+        finally:
+            shutil.rmtree(path)
+
+        raw = json.loads(out.getvalue())
+        self.assertEqual(4, raw['critical_path_length'])
+        self.assertEqual([2, 1, 1, 1], raw['fan_out'])
+        self.assertEqual(raw['install'][::-1], raw['uninstall'])
+        self.assertEqual(['balancer'], [node_id.rsplit('_', 1)[0] for node_id in raw['install'][3]])
@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model
+from aria.modeling import EvaluationGraph
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      name:
+        type: string
+  Client:
+    derived_from: tosca.nodes.Root
+    requirements:
+      - server:
+          capability: tosca.capabilities.Node
+          node: Server
+topology_template:
+  node_templates:
+    long_name:
+      type: Server
+      properties:
+        name: application-server
+    short_name:
+      type: Server
+      properties:
+        name: app
+    client:
+      type: Client
+      requirements:
+        - server:
+            node: Server
+            node_filter:
+              properties:
+                - name: { %s }
+"""
+
+PORT_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      port:
+        type: integer
+  Client:
+    derived_from: tosca.nodes.Root
+    requirements:
+      - server:
+          capability: tosca.capabilities.Node
+          node: Server
+topology_template:
+  node_templates:
+    web:
+      type: Server
+      properties:
+        port: 80
+    alternate:
+      type: Server
+      properties:
+        port: 8080
+    high:
+      type: Server
+      properties:
+        port: 9000
+    client:
+      type: Client
+      requirements:
+        - server:
+            node: Server
+            node_filter:
+              properties:
+                - port: { %s }
+"""
+
+
+class TestNodeFilters(AbstractTestTosca):
+
+    def _get_target_node_template_name(self, constraint):
+        context = self.consume(TEMPLATE % constraint)
+        nodes = context.modeling.instance.nodes
+        client = [n for n in nodes.itervalues() if n.template_name == 'client'][0]
+        self.assertEqual(1, len(client.relationships))
+        return nodes[client.relationships[0].target_node_id].template_name
+
+    def test_min_length(self):
+        self.assertEqual('long_name', self._get_target_node_template_name('min_length: 5'))
+
+    def test_max_length(self):
+        self.assertEqual('short_name', self._get_target_node_template_name('max_length: 5'))
+
+    def test_pattern(self):
+        self.assertEqual('short_name', self._get_target_node_template_name('pattern: "^app$"'))
+        self.assertEqual('long_name', self._get_target_node_template_name('pattern: ".*-server"'))
+
+
+class TestIndexedNodeFilters(AbstractTestTosca):
+
+    def _find_candidates(self, constraint):
+        context = self.consume(PORT_TEMPLATE % constraint, consumers=(Read, Validate, Model))
+        requirement_template = \
+            context.modeling.model.node_templates['client'].requirement_templates[0]
+        node_template_index = context.modeling.node_template_index
+        candidates = node_template_index.find_candidates(
+            context, 'Server', requirement_template.target_node_template_constraints)
+        return sorted(v.name for v in candidates), node_template_index
+
+    def _find_target(self, constraint):
+        context = self.consume(PORT_TEMPLATE % constraint, consumers=(Read, Validate, Model))
+        client = context.modeling.model.node_templates['client']
+        target_node_template, _ = client.requirement_templates[0].find_target(context, client)
+        return target_node_template.name if target_node_template is not None else None
+
+    def test_equal(self):
+        candidates, node_template_index = self._find_candidates('equal: 8080')
+        self.assertEqual(['alternate'], candidates)
+        self.assertIn((None, 'port'), node_template_index._value_indexes)
+        self.assertEqual('alternate', self._find_target('equal: 8080'))
+        self.assertIsNone(self._find_target('equal: 443'))
+
+    def test_range(self):
+        self.assertEqual(['alternate'], self._find_candidates('in_range: [ 8000, 8999 ]')[0])
+        self.assertEqual(['alternate', 'high'],
+                         self._find_candidates('in_range: [ 8000, UNBOUNDED ]')[0])
+        self.assertEqual(['high'], self._find_candidates('greater_than: 8080')[0])
+        self.assertEqual(['alternate', 'web'], self._find_candidates('less_or_equal: 8080')[0])
+        self.assertEqual('alternate', self._find_target('in_range: [ 8000, 8999 ]'))
+        self.assertEqual('web', self._find_target('less_than: 8080'))
+
+    def test_valid_values(self):
+        self.assertEqual(['high', 'web'], self._find_candidates('valid_values: [ 9000, 80 ]')[0])
+        self.assertEqual('high', self._find_target('valid_values: [ 9000, 443 ]'))
+        self.assertIsNone(self._find_target('valid_values: [ 443 ]'))
+
+    def test_function(self):
+        evaluated = []
+        original_evaluate_function = EvaluationGraph.evaluate_function
+        def evaluate_function(graph, context, container, function):
+            evaluated.append(function)
+            return original_evaluate_function(graph, context, container, function)
+
+        with patch.object(EvaluationGraph, 'evaluate_function', evaluate_function):
+            target = self._find_target('equal: { get_property: [ alternate, port ] }')
+        self.assertEqual('alternate', target)
+        self.assertTrue(any(getattr(v, 'modelable_entity_name', None) == 'alternate'
+                            for v in evaluated))
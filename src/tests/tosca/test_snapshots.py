@@ -0,0 +1,159 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import ConsumptionContext, ConsumerChain, Read, Validate, Model, Inputs, \
+    Instance, SaveSnapshot, LoadSnapshot
+from aria.loading import LiteralLocation
+from aria.modeling import InvalidSnapshotException, Parameter, save_snapshot, load_snapshot
+from StringIO import StringIO
+import os, shutil, tempfile
+
+from .framework import AbstractTestTosca, TOSCA_VERSION_SECTION
+
+TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      name:
+        type: string
+      host:
+        type: string
+      url:
+        type: string
+  Client:
+    derived_from: tosca.nodes.Root
+    properties:
+      server_name:
+        type: string
+      server_url:
+        type: string
+    requirements:
+      - server:
+          capability: tosca.capabilities.Node
+          node: Server
+topology_template:
+  inputs:
+    host:
+      type: string
+      default: www.example.com
+  node_templates:
+    server:
+      type: Server
+      properties:
+        name: server
+        host: { get_input: host }
+        url: { concat: [ 'http://', { get_property: [ SELF, host ] } ] }
+    client:
+      type: Client
+      properties:
+        server_name: { get_property: [ server, name ] }
+        server_url: { get_property: [ server, url ] }
+      requirements:
+        - server:
+            node: Server
+            node_filter:
+              properties:
+                - name: { min_length: 3 }
+"""
+
+
+class TestSnapshots(AbstractTestTosca):
+
+    def _get_nodes(self, context):
+        nodes = context.modeling.instance.nodes
+        return dict((node.template_name, (
+            dict((k, v.value) for k, v in node.properties.iteritems()),
+            [nodes[r.target_node_id].template_name for r in node.relationships]))
+            for node in nodes.itervalues())
+
+    def _save(self, context):
+        out = StringIO()
+        save_snapshot(context.modeling, out, context.reading.documents_hash)
+        return out.getvalue()
+
+    def test_round_trip(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        snapshot = self._save(context)
+
+        loaded_context = ConsumptionContext()
+        key = load_snapshot(loaded_context.modeling, StringIO(snapshot),
+                            context.reading.documents_hash)
+        self.assertEqual(context.reading.documents_hash, key)
+        loaded_context.modeling.set_input('host', 'db.example.org')
+        ConsumerChain(loaded_context, (Inputs, Instance)).consume()
+        self.assertFalse(loaded_context.validation.has_issues)
+
+        expected_context = self.consume(TEMPLATE, inputs={'host': 'db.example.org'})
+        self.assertEqual(self._get_nodes(expected_context), self._get_nodes(loaded_context))
+
+    def test_stale_key(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        snapshot = self._save(context)
+        self.assertRaises(InvalidSnapshotException, load_snapshot,
+                          ConsumptionContext().modeling, StringIO(snapshot), 'stale')
+
+    def test_stale_snapshot_is_not_loaded(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        snapshot = self._save(context)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'snapshot')
+        with open(path, 'wb') as f:
+            f.write(snapshot)
+
+        def load(template):
+            loaded_context = ConsumptionContext()
+            loaded_context.args = ['--snapshot=%s' % path]
+            loaded_context.presentation.location = LiteralLocation(TOSCA_VERSION_SECTION + template)
+            ConsumerChain(loaded_context, (Read, LoadSnapshot)).consume()
+            return loaded_context
+
+        loaded_context = load(TEMPLATE)
+        self.assertFalse(loaded_context.validation.has_issues)
+        self.assertIsNotNone(loaded_context.modeling.model)
+
+        loaded_context = load(TEMPLATE.replace('www.example.com', 'www.example.org'))
+        self.assertTrue(loaded_context.validation.has_issues)
+        self.assertIsNone(loaded_context.modeling.model)
+
+    def test_named_template_functions(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        # Evaluated while modeling
+        client = context.modeling.model.node_templates['client']
+        self.assertEqual('server', client.properties['server_name'].value)
+
+        loaded_context = ConsumptionContext()
+        load_snapshot(loaded_context.modeling, StringIO(self._save(context)))
+        loaded_context.modeling.set_input('host', 'db.example.org')
+        ConsumerChain(loaded_context, (Inputs, Instance)).consume()
+        self.assertFalse(loaded_context.validation.has_issues)
+        properties = self._get_nodes(loaded_context)['client'][0]
+        self.assertEqual('server', properties['server_name'])
+        self.assertEqual('http://db.example.org', properties['server_url'])
+
+    def test_failed_save_writes_nothing(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'snapshot')
+
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        context.modeling.model.node_templates['server'].properties['name'] = \
+            Parameter('string', lambda: 'server', None)
+        context.args = ['--snapshot=%s' % path]
+        ConsumerChain(context, (SaveSnapshot,)).consume()
+        self.assertTrue(context.validation.has_issues)
+        self.assertFalse(os.path.exists(path))
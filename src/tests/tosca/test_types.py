@@ -0,0 +1,308 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model
+from aria.utils import SequencedDict, FrozenSequencedDict
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+capability_types:
+  Endpoint:
+    derived_from: tosca.capabilities.Root
+    properties:
+      protocol:
+        type: string
+        default: http
+node_types:
+  Base:
+    derived_from: tosca.nodes.Root
+    properties:
+      port:
+        type: integer
+        default: 80
+      name:
+        type: string
+        default: base
+    capabilities:
+      endpoint:
+        type: Endpoint
+      admin:
+        type: Endpoint
+    interfaces:
+      Standard:
+        create: base.sh
+        configure: configure.sh
+  Derived:
+    derived_from: Base
+    properties:
+      port:
+        type: integer
+        default: 8080
+    capabilities:
+      endpoint:
+        type: Endpoint
+        properties:
+          protocol:
+            type: string
+    interfaces:
+      Standard:
+        create: derived.sh
+"""
+
+REQUIREMENTS_TEMPLATE = """
+node_types:
+  Base:
+    derived_from: tosca.nodes.Root
+    requirements:
+      - host:
+          capability: tosca.capabilities.Container
+      - database:
+          capability: tosca.capabilities.Node
+          occurrences: [ 0, UNBOUNDED ]
+  Derived:
+    derived_from: Base
+    requirements:
+      - host:
+          capability: tosca.capabilities.Container
+          node: tosca.nodes.Compute
+topology_template:
+  node_templates:
+    compute:
+      type: tosca.nodes.Compute
+    database1:
+      type: tosca.nodes.Root
+    database2:
+      type: tosca.nodes.Root
+    application:
+      type: Derived
+      requirements:
+        - database: database1
+        - host: compute
+        - database: database2
+"""
+
+INTERFACES_TEMPLATE = """
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    interfaces:
+      Standard:
+        inputs:
+          mode:
+            type: string
+            default: default
+        create:
+          implementation: create.sh
+          inputs:
+            level:
+              type: integer
+              default: 1
+            tags:
+              type: list
+              entry_schema: string
+              default: [ a ]
+topology_template:
+  node_templates:
+    server1:
+      type: Server
+      interfaces:
+        Standard:
+          inputs:
+            mode: custom
+          create:
+            implementation: custom.sh
+            inputs:
+              level: 2
+              tags: [ b ]
+    server2:
+      type: Server
+"""
+
+
+class TestInheritedDefinitions(AbstractTestTosca):
+
+    def _get_types(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate))
+        node_types = context.presentation.presenter.service_template.node_types
+        return context, node_types['Base'], node_types['Derived']
+
+    def _get_snapshot(self, context, the_type):
+        properties = the_type._get_properties(context)
+        capabilities = the_type._get_capabilities(context)
+        interfaces = the_type._get_interfaces(context)
+        operations = interfaces['Standard']._get_operations(context)
+        return (
+            dict((k, v.default) for k, v in properties.iteritems()),
+            dict((k, dict((n, p.default) for n, p in (v.properties or {}).iteritems()))
+                 for k, v in capabilities.iteritems()),
+            dict((k, v.implementation.primary) for k, v in operations.iteritems()
+                 if v.implementation is not None))
+
+    def test_overriding_subtype(self):
+        context, base, derived = self._get_types()
+        base_snapshot = self._get_snapshot(context, base)
+
+        # Overrides are applied to the subtype
+        properties, capabilities, operations = self._get_snapshot(context, derived)
+        self.assertEqual({'port': 8080, 'name': 'base'},
+                         dict((k, v) for k, v in properties.iteritems() if k in ('port', 'name')))
+        self.assertEqual({'protocol': 'http'}, capabilities['admin'])
+        self.assertEqual('derived.sh', operations['create'])
+        self.assertEqual('configure.sh', operations['configure'])
+
+        # Inherited capability definitions are shared unless overridden
+        base_capabilities = base._get_capabilities(context)
+        derived_capabilities = derived._get_capabilities(context)
+        self.assertIs(base_capabilities['admin'], derived_capabilities['admin'])
+        self.assertIsNot(base_capabilities['endpoint'], derived_capabilities['endpoint'])
+
+        # The parent's tables are unchanged
+        self.assertEqual(base_snapshot, self._get_snapshot(context, base))
+        properties, capabilities, operations = base_snapshot
+        self.assertEqual(80, properties['port'])
+        self.assertEqual({'protocol': 'http'}, capabilities['endpoint'])
+        self.assertEqual('base.sh', operations['create'])
+
+    def test_subtype_first(self):
+        # The parent's tables are built (and cached) while building the subtype's
+        context, base, derived = self._get_types()
+        derived_snapshot = self._get_snapshot(context, derived)
+        properties, capabilities, operations = self._get_snapshot(context, base)
+        self.assertEqual(80, properties['port'])
+        self.assertEqual({'protocol': 'http'}, capabilities['endpoint'])
+        self.assertEqual('base.sh', operations['create'])
+        self.assertEqual(derived_snapshot, self._get_snapshot(context, derived))
+
+
+class TestRequirements(AbstractTestTosca):
+
+    def test_override_moves_to_end(self):
+        context = self.consume(REQUIREMENTS_TEMPLATE, consumers=(Read, Validate))
+        node_types = context.presentation.presenter.service_template.node_types
+        base_requirements = node_types['Base']._get_requirements(context)
+        derived_requirements = node_types['Derived']._get_requirements(context)
+        self.assertEqual(['dependency', 'host', 'database'], [k for k, _ in base_requirements])
+        self.assertEqual(['dependency', 'database', 'host'], [k for k, _ in derived_requirements])
+        self.assertEqual('tosca.nodes.Compute', derived_requirements['host'].node)
+        self.assertIsNone(base_requirements.get('host').node)
+        self.assertIsInstance(derived_requirements, FrozenSequencedDict)
+
+    def test_repeated_assignments(self):
+        context = self.consume(REQUIREMENTS_TEMPLATE, consumers=(Read, Validate))
+        node_template = context.presentation.presenter.service_template.topology_template \
+            .node_templates['application']
+        requirements = node_template._get_requirements(context)
+        self.assertEqual(['database', 'host', 'database'],
+                         [k for k, _ in requirements])
+        self.assertEqual(['database1', 'database2'],
+                         [r.node for r in requirements.get_all('database')])
+        self.assertEqual(['database', 'host'], requirements.keys())
+
+    def test_too_many_occurrences(self):
+        template = REQUIREMENTS_TEMPLATE + """
+    client:
+      type: Derived
+      requirements:
+        - host: compute
+        - host: compute
+"""
+        context = self.consume(template, consumers=(Read, Validate), fail_on_issues=False)
+        self.assertEqual(['requirement "host" is allowed only one occurrence in "client": 2'],
+                         [issue.message for issue in context.validation.issues])
+
+
+class TestInterfaceTemplates(AbstractTestTosca):
+
+    def _get_values(self, interface_template):
+        operation_template = interface_template.operation_templates['create']
+        return (interface_template.inputs['mode'].value,
+                operation_template.implementation,
+                operation_template.inputs['level'].value,
+                list(operation_template.inputs['tags'].value))
+
+    def test_assignments_do_not_leak(self):
+        context = self.consume(INTERFACES_TEMPLATE, consumers=(Read, Validate, Model))
+        node_templates = context.modeling.model.node_templates
+        self.assertEqual(('custom', 'custom.sh', 2, ['b']),
+                         self._get_values(node_templates['server1'].interface_templates['Standard']))
+        self.assertEqual(('default', 'create.sh', 1, ['a']),
+                         self._get_values(node_templates['server2'].interface_templates['Standard']))
+
+        # The type's shared raw template is unchanged
+        interface_definition = context.presentation.presenter.service_template.node_types['Server'] \
+            ._get_interfaces(context)['Standard']
+        raw = interface_definition._get_raw_template(context)
+        self.assertEqual('default', raw['inputs']['mode'].value)
+        self.assertEqual('create.sh', raw['create']['implementation'])
+        self.assertEqual(1, raw['create']['inputs']['level'].value)
+        self.assertEqual(['a'], list(raw['create']['inputs']['tags'].value))
+
+    def test_template_order(self):
+        # The template without assignments is built first, so the shared raw template is copied
+        # before the other template assigns into it
+        template = INTERFACES_TEMPLATE.replace('    server1:', '    server0:\n      type: Server\n'
+                                               '    server1:')
+        context = self.consume(template, consumers=(Read, Validate, Model))
+        node_templates = context.modeling.model.node_templates
+        self.assertEqual(('custom', 'custom.sh', 2, ['b']),
+                         self._get_values(node_templates['server1'].interface_templates['Standard']))
+        for name in ('server0', 'server2'):
+            self.assertEqual(('default', 'create.sh', 1, ['a']),
+                             self._get_values(node_templates[name].interface_templates['Standard']))
+
+
+class TestSequencedDict(AbstractTestTosca):
+
+    def test_repeated_keys(self):
+        the_dict = SequencedDict([('a', 1), ('b', 2), ('a', 3)])
+        self.assertEqual([('a', 1), ('b', 2), ('a', 3)], list(the_dict))
+        self.assertEqual(3, len(the_dict))
+        self.assertEqual(2, the_dict.count('a'))
+        self.assertEqual(1, the_dict.count('b'))
+        self.assertEqual(0, the_dict.count('c'))
+        self.assertEqual(1, the_dict['a'])
+        self.assertEqual([1, 3], the_dict.get_all('a'))
+        self.assertEqual([], the_dict.get_all('c'))
+        self.assertIsNone(the_dict.get('c'))
+        self.assertRaises(KeyError, lambda: the_dict['c'])
+
+    def test_override_moves_to_end(self):
+        the_dict = SequencedDict([('a', 1), ('b', 2), ('a', 3), ('c', 4)])
+        the_dict['a'] = 5
+        self.assertEqual([('b', 2), ('c', 4), ('a', 5)], list(the_dict))
+        self.assertEqual(1, the_dict.count('a'))
+        the_dict['b'] = 6
+        self.assertEqual([('c', 4), ('a', 5), ('b', 6)], list(the_dict))
+
+        the_dict.append('c', 7)
+        del the_dict['c']
+        self.assertNotIn('c', the_dict)
+        self.assertEqual([('a', 5), ('b', 6)], list(the_dict))
+
+    def test_keys_in_sequence_order(self):
+        the_dict = SequencedDict([('c', 1), ('a', 2), ('b', 3), ('a', 4), ('d', 5), ('e', 6)])
+        self.assertEqual(['c', 'a', 'b', 'd', 'e'], the_dict.keys())
+        the_dict['c'] = 7
+        self.assertEqual(['a', 'b', 'd', 'e', 'c'], the_dict.keys())
+
+    def test_frozen(self):
+        the_dict = FrozenSequencedDict(SequencedDict([('a', 1), ('b', 2), ('a', 3)]))
+        self.assertEqual([('a', 1), ('b', 2), ('a', 3)], list(the_dict))
+        self.assertEqual([1, 3], the_dict.get_all('a'))
+        self.assertRaises(TypeError, the_dict.append, 'c', 4)
+        self.assertRaises(TypeError, the_dict.__setitem__, 'a', 5)
+        self.assertRaises(TypeError, the_dict.__delitem__, 'a')
+        self.assertEqual([('a', 1), ('b', 2), ('a', 3)], list(the_dict))
@@ -0,0 +1,217 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+from aria.consumption import Read, Validate, Model, Instance
+from aria.consumption.modeling import CoerceInstanceValues
+from aria.utils import json_dumps
+from mock import patch
+
+from .framework import AbstractTestTosca
+
+TEMPLATE = """
+data_types:
+  Configuration:
+    properties:
+      a:
+        type: list
+        entry_schema: string
+        required: false
+      b:
+        type: integer
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      configuration:
+        type: Configuration
+      tags:
+        type: map
+        entry_schema: string
+        required: false
+topology_template:
+  node_templates:
+    server:
+      type: Server
+      properties:
+        configuration: { a: [], b: 1 }
+        tags: {}
+"""
+
+FUNCTIONS_TEMPLATE = """
+data_types:
+  Configuration:
+    properties:
+      a:
+        type: list
+        entry_schema: string
+      b:
+        type: integer
+node_types:
+  Server:
+    derived_from: tosca.nodes.Root
+    properties:
+      configuration:
+        type: Configuration
+      host:
+        type: string
+      port:
+        type: integer
+topology_template:
+  inputs:
+    host:
+      type: string
+      default: www.example.com
+  node_templates:
+    server:
+      type: Server
+      properties:
+        configuration: { a: [ x, y ], b: { get_property: [ SELF, port ] } }
+        host: { get_input: host }
+        port: 8080
+"""
+
+
+class TestInstanceValues(AbstractTestTosca):
+
+    def test_instance_dump_does_not_change_model(self):
+        context = self.consume(TEMPLATE)
+        model_raw = json_dumps(context.modeling.model.as_raw)
+
+        context.modeling.instance_as_raw
+        self.assertEqual(model_raw, json_dumps(context.modeling.model.as_raw))
+
+        list(context.modeling.instance_as_lazy_raw['nodes'])
+        self.assertEqual(model_raw, json_dumps(context.modeling.model.as_raw))
+
+    def test_model_dump_does_not_change_model(self):
+        context = self.consume(TEMPLATE)
+        model_raw = json_dumps(context.modeling.model.as_raw)
+
+        context.modeling.model_as_raw
+        self.assertEqual(model_raw, json_dumps(context.modeling.model.as_raw))
+        configuration = context.modeling.model.node_templates['server'].properties['configuration'].value
+        self.assertEqual([], configuration['a'])
+
+    def test_instance_dump_is_pruned(self):
+        context = self.consume(TEMPLATE)
+        properties = context.modeling.instance_as_raw['nodes'][0]['properties']
+        self.assertEqual({'b': 1}, properties['configuration']['value'])
+        self.assertNotIn('value', properties['tags'])
+
+        node = context.modeling.instance.nodes.values()[0]
+        self.assertEqual([], node.properties['configuration'].value['a'])
+        self.assertEqual({}, node.properties['tags'].value)
+
+    def test_changing_instance_value_does_not_change_model(self):
+        context = self.consume(TEMPLATE)
+        model_raw = json_dumps(context.modeling.model.as_raw)
+        node = context.modeling.instance.nodes.values()[0]
+
+        configuration = node.properties['configuration']
+        self.assertTrue(configuration.is_shared)
+        configuration.mutable_value['a'].append('x')
+        configuration.mutable_value['b'] = 2
+        self.assertFalse(configuration.is_shared)
+        self.assertEqual({'a': ['x'], 'b': 2}, configuration.value)
+
+        node.properties['tags'].value = {'x': 'y'}
+        self.assertFalse(node.properties['tags'].is_shared)
+
+        self.assertEqual(model_raw, json_dumps(context.modeling.model.as_raw))
+
+    def test_coerced_values_are_not_shared(self):
+        context = self.consume(FUNCTIONS_TEMPLATE)
+        node = context.modeling.instance.nodes.values()[0]
+
+        # A scalar replaced by coercion is no longer shared
+        host = node.properties['host']
+        self.assertEqual('www.example.com', host.value)
+        self.assertFalse(host.is_shared)
+
+        # A dict replaced by coercion still shares the parts that had no functions with its
+        # source value, so modifying it must not change the source
+        model_configuration = \
+            context.modeling.model.node_templates['server'].properties['configuration']
+        self.assertEqual(8080, model_configuration.value['b'])
+        self.assertTrue(model_configuration.is_shared)
+        model_configuration.mutable_value['a'].append('z')
+        model_configuration.reset_value()
+        self.assertTrue(model_configuration.is_shared)
+        self.assertEqual(['x', 'y'], model_configuration.value['a'])
+
+        # The instance shares the template's value
+        configuration = node.properties['configuration']
+        self.assertTrue(configuration.is_shared)
+        configuration.mutable_value['a'].append('z')
+        self.assertEqual(['x', 'y'], model_configuration.value['a'])
+
+    def test_second_coercion_pass_skips_final_values(self):
+        context = self.consume(FUNCTIONS_TEMPLATE)
+        passes = context.modeling.coercion_passes
+        self.assertEqual(5, len(passes)) # one for the model and four for the instance
+        total = passes[-1].coerced + passes[-1].skipped
+        self.assertTrue(total > 0)
+
+        # Everything is final by now, so nothing is evaluated again
+        with patch('aria.modeling.elements.coerce_value') as coerce_value:
+            CoerceInstanceValues(context).consume()
+        self.assertFalse(coerce_value.called)
+        self.assertEqual(0, passes[-1].coerced)
+        self.assertEqual(total, passes[-1].skipped)
+
+        # A reset value is no longer final, so it alone is coerced again
+        node = context.modeling.instance.nodes.values()[0]
+        node.properties['host'].reset_value()
+        CoerceInstanceValues(context).consume()
+        self.assertEqual(7, len(passes))
+        self.assertEqual(1, passes[-1].coerced)
+        self.assertEqual(total - 1, passes[-1].skipped)
+        self.assertEqual('www.example.com', node.properties['host'].value)
+        self.assertTrue(node.properties['host'].is_final)
+
+    def test_scaled_out_instances_share_values(self):
+        context = self.consume(TEMPLATE, consumers=(Read, Validate, Model))
+        node_template = context.modeling.model.node_templates['server']
+        node_template.default_instances = 3
+        Instance(context).consume()
+        self.assertFalse(context.validation.has_issues)
+
+        nodes = context.modeling.instance.find_nodes('server')
+        self.assertEqual(3, len(set(node.id for node in nodes)))
+
+        # Values and descriptions are shared with the template, not copied per instance
+        template_configuration = node_template.properties['configuration'].value
+        template_operation = node_template.interface_templates['Standard'].operation_templates['create']
+        self.assertIsNotNone(template_operation.description)
+        for node in nodes:
+            self.assertIs(template_configuration, node.properties['configuration'].value)
+            self.assertIs(template_operation.description,
+                          node.interfaces['Standard'].operations['create'].description)
+
+        # Changing one instance doesn't change the others
+        nodes[0].properties['configuration'].mutable_value['b'] = 2
+        self.assertEqual([2, 1, 1], [node.properties['configuration'].value['b'] for node in nodes])
+
+    def test_changing_template_value_does_not_change_instances(self):
+        context = self.consume(TEMPLATE)
+        configuration = context.modeling.model.node_templates['server'].properties['configuration']
+        node = context.modeling.instance.nodes.values()[0]
+
+        self.assertTrue(configuration.is_shared)
+        configuration.mutable_value['a'].append('x')
+        configuration.mutable_value['b'] = 2
+        self.assertFalse(configuration.is_shared)
+        self.assertEqual({'a': ['x'], 'b': 2}, configuration.value)
+        self.assertEqual({'a': [], 'b': 1}, node.properties['configuration'].value)
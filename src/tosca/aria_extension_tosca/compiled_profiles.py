@@ -0,0 +1,188 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compiled profiles are the agnostic raw data of the TOSCA profiles (with their locators), already
+read and merged with their imports, and pickled into a binary artifact next to the profile. Loading
+them skips the YAML parsing of the profile documents, which is the bulk of the time it takes to
+read a small service template.
+
+Each artifact includes the SHA-1 checksums of the profile documents it was compiled from. If any of
+them no longer match the documents in :code:`profiles/`, the artifact is ignored and the profile
+is read from YAML as usual.
+
+The artifacts are built at install time by :code:`setup.py`. Build them in a source tree with::
+
+    python -m aria_extension_tosca.compiled_profiles
+"""
+
+import os
+import sys
+import struct
+import cPickle
+from threading import Lock
+from hashlib import sha1
+
+from aria.consumption import (ConsumptionContext, Read)
+from aria.loading import UriLocation
+from aria.utils import (print_exception, puts, colored)
+
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), 'profiles')
+
+COMPILED_PROFILE_MAGIC = 'ARIAPROF'
+COMPILED_PROFILE_VERSION = 1
+COMPILED_PROFILE_EXTENSION = '.compiled'
+
+# Pickled raw data of compiled profiles that passed the checksum guard, by profile location
+_COMPILED_PROFILES = {}
+_COMPILED_PROFILES_LOCK = Lock()
+
+def get_compiled_profile_path(location):
+    """
+    The path of the compiled artifact of a profile location (relative to :code:`profiles/`).
+    """
+
+    return os.path.join(PROFILES_DIR, location + COMPILED_PROFILE_EXTENSION)
+
+def compile_profile(presenter_class, location):
+    """
+    Reads the profile at the location (relative to :code:`profiles/`) together with its imports, and
+    writes the result to its compiled artifact.
+
+    Returns the path of the artifact.
+    """
+
+    context = ConsumptionContext()
+    context.presentation.location = UriLocation(os.path.join(PROFILES_DIR, location))
+    context.presentation.presenter_class = presenter_class
+    context.presentation.import_profile = False # we *are* the profile
+    Read(context).consume()
+    if context.validation.has_issues:
+        context.validation.dump_issues()
+        raise ValueError('could not compile profile: %s' % location)
+
+    raw = context.presentation.presenter._raw
+    # The imports have already been merged in
+    raw.pop('imports', None)
+
+    documents = []
+    for document_location in context.reading.locations:
+        path = os.path.relpath(document_location.uri, PROFILES_DIR)
+        documents.append((path, _checksum(document_location.uri)))
+    documents.sort()
+
+    path = get_compiled_profile_path(location)
+    with open(path, 'wb') as f:
+        f.write(COMPILED_PROFILE_MAGIC)
+        f.write(struct.pack('!H', COMPILED_PROFILE_VERSION))
+        cPickle.dump(documents, f, cPickle.HIGHEST_PROTOCOL)
+        cPickle.dump(raw, f, cPickle.HIGHEST_PROTOCOL)
+    return path
+
+def load_compiled_profile(context, location, origin_location):
+    """
+    Returns the agnostic raw data of the compiled profile for the location, or None if it isn't a
+    profile location, if the profile is not compiled, or if the artifact does not match the profile
+    documents.
+
+    The profile documents are recorded in the reading context as if they were read, so
+    :code:`ReadingContext.documents_hash` is not affected, and :code:`AlreadyReadException` is
+    raised if they already were.
+    """
+
+    if not isinstance(location, UriLocation):
+        return None
+
+    # Locations relative to the importer take precedence over our profiles
+    prefixes = [origin_location.prefix] if origin_location is not None else []
+    prefixes += context.loading.prefixes
+    for prefix in prefixes:
+        if prefix and os.path.isfile(os.path.join(prefix, location.uri)):
+            return None
+
+    with _COMPILED_PROFILES_LOCK:
+        compiled = _COMPILED_PROFILES.get(location.uri)
+        if compiled is None:
+            compiled = _read_compiled_profile(location.uri)
+            if compiled is None:
+                return None
+            _COMPILED_PROFILES[location.uri] = compiled
+    documents, data = compiled
+
+    entry_location = UriLocation(os.path.join(PROFILES_DIR, location.uri))
+    document_locations = [UriLocation(os.path.join(PROFILES_DIR, path)) for path, _ in documents]
+    context.reading.add_location(entry_location,
+                                 *[v for v in document_locations
+                                   if not v.is_equivalent(entry_location)])
+    for _, checksum in documents:
+        context.reading.add_hash(checksum)
+
+    # Every load gets its own copy, because the importer merges it into its own raw data
+    return cPickle.loads(data)
+
+def main():
+    from .simple_v1_0 import ToscaSimplePresenter1_0
+    from .simple_nfv_v1_0 import ToscaSimpleNfvPresenter1_0
+
+    try:
+        for presenter_class, location in (
+                (ToscaSimplePresenter1_0, ToscaSimplePresenter1_0.SIMPLE_PROFILE_LOCATION),
+                (ToscaSimpleNfvPresenter1_0,
+                 ToscaSimpleNfvPresenter1_0.SIMPLE_PROFILE_FOR_NFV_LOCATION)):
+            path = compile_profile(presenter_class, location)
+            puts('%s: %s' % (colored.blue(location), path))
+    except Exception as e: # pylint: disable=broad-except
+        print_exception(e)
+        return 1
+    return 0
+
+#
+# Utils
+#
+
+def _checksum(path):
+    with open(path, 'rb') as f:
+        return sha1(f.read()).hexdigest()
+
+def _read_compiled_profile(location):
+    """
+    Returns the documents and pickled raw data of the compiled profile, or None if there is no
+    valid artifact or if the documents have changed since it was compiled.
+    """
+
+    path = get_compiled_profile_path(location)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(COMPILED_PROFILE_MAGIC)) != COMPILED_PROFILE_MAGIC:
+                return None
+            version, = struct.unpack('!H', f.read(struct.calcsize('!H')))
+            if version != COMPILED_PROFILE_VERSION:
+                return None
+            documents = cPickle.load(f)
+            data = f.read()
+    except (IOError, struct.error, cPickle.UnpicklingError, EOFError):
+        return None
+
+    for document_path, checksum in documents:
+        document_path = os.path.join(PROFILES_DIR, document_path)
+        if (not os.path.isfile(document_path)) or (_checksum(document_path) != checksum):
+            return None
+
+    return documents, data
+
+if __name__ == '__main__':
+    sys.exit(main())
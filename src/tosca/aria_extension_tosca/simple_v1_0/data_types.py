@@ -19,10 +19,44 @@ from functools import total_ordering
 from datetime import datetime, tzinfo, timedelta
 
 from aria import dsl_specification
-from aria.utils import StrictDict, safe_repr
+from aria.utils import StrictDict, LRUCache, safe_repr
 
 from .modeling.data_types import (coerce_to_data_type_class, report_issue_for_bad_format,
-                                  coerce_value)
+                                  coerce_entries)
+
+PARSED_VALUES = LRUCache(maxsize=10000)
+"""
+Parsed values of the data type classes that derive from :class:`MemoizedDataType`, keyed by the data
+type class and the literal. Its :code:`cache_info` is included in the presenter's
+:code:`_method_cache_info`.
+"""
+
+class MemoizedDataType(object):
+    """
+    Base for data type classes that are parsed only from their literal value: coercing the same
+    literal again returns the same instance from :code:`PARSED_VALUES`, so instances must not be
+    modified.
+    """
+
+    @classmethod
+    def _create(cls, context, presentation, entry_schema, constraints, value, aspect): # pylint: disable=unused-argument
+        try:
+            key = (cls, literal_key(value))
+            hash(key)
+        except TypeError:
+            # Not hashable, so can't be memoized
+            return cls(entry_schema, constraints, value, aspect)
+        return PARSED_VALUES.get(key, lambda: cls(entry_schema, constraints, value, aspect))
+
+def literal_key(value):
+    """
+    Returns a hashable key for the literal that also distinguishes between equal values of different
+    types (such as :code:`1`, :code:`1.0` and :code:`True`), which do not parse the same.
+    """
+
+    if isinstance(value, list):
+        return (list, tuple(literal_key(v) for v in value))
+    return (type(value), value)
 
 class Timezone(tzinfo):
     """
@@ -48,7 +82,7 @@ UTC = Timezone()
 
 @total_ordering
 @dsl_specification('timestamp', 'yaml-1.1')
-class Timestamp(object):
+class Timestamp(MemoizedDataType):
     '''
     TOSCA timestamps follow the YAML specification, which in turn is a variant of ISO8601.
 
@@ -143,7 +177,7 @@ class Timestamp(object):
 
 @total_ordering
 @dsl_specification('3.2.2', 'tosca-simple-1.0')
-class Version(object):
+class Version(MemoizedDataType):
     """
     TOSCA supports the concept of "reuse" of type definitions, as well as template definitions which
     could be version and change over time. It is important to provide a reliable, normative means to
@@ -226,7 +260,7 @@ class Version(object):
         return False
 
 @dsl_specification('3.2.3', 'tosca-simple-1.0')
-class Range(object):
+class Range(MemoizedDataType):
     """
     The range type can be used to define numeric ranges with a lower and upper boundary. For
     example, this allows for specifying a range of ports to be opened in a firewall.
@@ -259,7 +293,7 @@ class Range(object):
                     'upper bound of range is not greater than the lower bound: %s >= %s'
                     % (safe_repr(value[0]), safe_repr(value[1])))
 
-        self.value = value
+        self.value = list(value)
 
     def is_in(self, value):
         if value < self.value[0]:
@@ -289,13 +323,8 @@ class List(list):
         if not isinstance(value, list):
             raise ValueError('"list" data type value is not a list: %s' % safe_repr(value))
 
-        entry_schema_type = entry_schema._get_type(context)
-        entry_schema_constraints = entry_schema.constraints
-
         the_list = List()
-        for v in value:
-            v = coerce_value(context, presentation, entry_schema_type, None,
-                             entry_schema_constraints, v, aspect)
+        for _, v in coerce_entries(context, presentation, entry_schema, enumerate(value), aspect):
             if v is not None:
                 the_list.append(v)
 
@@ -325,13 +354,8 @@ class Map(StrictDict):
         if entry_schema is None:
             raise ValueError('"map" data type does not define "entry_schema"')
 
-        entry_schema_type = entry_schema._get_type(context)
-        entry_schema_constraints = entry_schema.constraints
-
         the_map = Map()
-        for k, v in value.iteritems():
-            v = coerce_value(context, presentation, entry_schema_type, None,
-                             entry_schema_constraints, v, aspect)
+        for k, v in coerce_entries(context, presentation, entry_schema, value.iteritems(), aspect):
             if v is not None:
                 the_map[k] = v
 
@@ -346,7 +370,7 @@ class Map(StrictDict):
 
 @total_ordering
 @dsl_specification('3.2.6', 'tosca-simple-1.0')
-class Scalar(object):
+class Scalar(MemoizedDataType):
     """
     The scalar-unit type can be used to define scalar values along with a unit from the list of
     recognized units.
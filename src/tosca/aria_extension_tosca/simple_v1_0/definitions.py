@@ -30,7 +30,8 @@ from .presentation.types import (convert_shorthand_to_full_type_name,
                                  get_type_by_full_or_shorthand_name)
 from .modeling.data_types import get_data_type, get_property_constraints
 from .modeling.interfaces import (get_and_override_input_definitions_from_type,
-                                  get_and_override_operation_definitions_from_type)
+                                  get_and_override_operation_definitions_from_type,
+                                  get_raw_interface_template)
 
 @has_fields
 @dsl_specification('3.5.8', 'tosca-simple-1.0')
@@ -314,6 +315,10 @@ class InterfaceDefinition(ExtensiblePresentation):
     def _get_operations(self, context):
         return FrozenDict(get_and_override_operation_definitions_from_type(context, self))
 
+    @cachedmethod
+    def _get_raw_template(self, context):
+        return get_raw_interface_template(context, self)
+
     def _validate(self, context):
         super(InterfaceDefinition, self)._validate(context)
         if self.operations:
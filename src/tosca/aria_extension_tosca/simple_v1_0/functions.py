@@ -16,7 +16,7 @@
 from cStringIO import StringIO
 
 from aria import (dsl_specification, InvalidValueError)
-from aria.modeling import (Function, CannotEvaluateFunctionException)
+from aria.modeling import (Function, ModelElement, Parameter, CannotEvaluateFunctionException)
 from aria.utils import (FrozenList, as_raw, safe_repr)
 from aria.validation import Issue
 
@@ -58,9 +58,7 @@ class Concat(Function):
     def _evaluate(self, context, container):
         value = StringIO()
         for e in self.string_expressions:
-            if hasattr(e, '_evaluate'):
-                e = e._evaluate(context, container)
-            value.write(str(e))
+            value.write(str(evaluate(context, container, e)))
         return value.getvalue()
 
 @dsl_specification('4.3.2', 'tosca-simple-1.0')
@@ -97,9 +95,7 @@ class Token(Function):
         return {'token': [string_with_tokens, string_of_token_chars, self.substring_index]}
 
     def _evaluate(self, context, container):
-        string_with_tokens = self.string_with_tokens
-        if hasattr(string_with_tokens, '_evaluate'):
-            string_with_tokens = string_with_tokens._evaluate(context, container) # pylint: disable=no-member
+        evaluate(context, container, self.string_with_tokens)
 
 #
 # Property
@@ -135,6 +131,7 @@ class GetInput(Function):
     def _evaluate(self, context, container): # pylint: disable=unused-argument
         if not context.modeling.instance:
             raise CannotEvaluateFunctionException()
+        context.modeling.record_input_dependency(self.input_property_name)
         the_input = context.modeling.instance.inputs.get(
             self.input_property_name,
             context.modeling.model.inputs.get(self.input_property_name))
@@ -170,45 +167,59 @@ class GetProperty(Function):
         modelable_entities = get_modelable_entities(context, container, self.locator,
                                                     self.modelable_entity_name)
 
-        req_or_cap_name = self.nested_property_name_or_index[0]
+        # Property values are memoized per modelable entity in the evaluation graph, which also
+        # detects cyclical references
+        evaluation_graph = context.modeling.evaluation_graph
 
         for modelable_entity in modelable_entities:
-            if hasattr(modelable_entity, 'requirement_templates') \
-                and modelable_entity.requirement_templates \
-                and (req_or_cap_name in modelable_entity.requirement_templates):
-                # First argument refers to a requirement
-                properties = modelable_entity.requirement_templates[req_or_cap_name].properties
-                nested_property_name_or_index = self.nested_property_name_or_index[1:]
-            elif hasattr(modelable_entity, 'capability_templates') \
-                and modelable_entity.capability_templates \
-                and (req_or_cap_name in modelable_entity.capability_templates):
-                # First argument refers to a capability
-                properties = modelable_entity.capability_templates[req_or_cap_name].properties
-                nested_property_name_or_index = self.nested_property_name_or_index[1:]
-            else:
-                properties = modelable_entity.properties
-                nested_property_name_or_index = self.nested_property_name_or_index
-
-            if properties:
-                found = True
-                value = properties
-                for name in nested_property_name_or_index:
-                    if (isinstance(value, dict) and (name in value)) \
-                        or (isinstance(value, list) and name < len(list)):
-                        value = value[name]
-                        if hasattr(value, '_evaluate'):
-                            value = value._evaluate(context, modelable_entity)
-                    else:
-                        found = False
-                        break
-                if found:
-                    return value
+            found, value = evaluation_graph.evaluate(
+                modelable_entity, self.nested_property_name_or_index,
+                lambda e=modelable_entity: self._evaluate_entity(context, e),
+                self.locator, self.modelable_entity_name)
+            if found:
+                return value
 
         raise InvalidValueError(
             'function "get_property" could not find "%s" in modelable entity "%s"' \
             % ('.'.join(self.nested_property_name_or_index), self.modelable_entity_name),
             locator=self.locator)
 
+    def _evaluate_entity(self, context, modelable_entity):
+        req_or_cap_name = self.nested_property_name_or_index[0]
+        # Node templates have capability templates, and nodes have capabilities
+        capabilities = getattr(modelable_entity, 'capability_templates', None) \
+            or getattr(modelable_entity, 'capabilities', None) or {}
+
+        if hasattr(modelable_entity, 'requirement_templates') \
+            and modelable_entity.requirement_templates \
+            and (req_or_cap_name in modelable_entity.requirement_templates):
+            # First argument refers to a requirement
+            properties = modelable_entity.requirement_templates[req_or_cap_name].properties
+            nested_property_name_or_index = self.nested_property_name_or_index[1:]
+        elif req_or_cap_name in capabilities:
+            # First argument refers to a capability
+            properties = capabilities[req_or_cap_name].properties
+            nested_property_name_or_index = self.nested_property_name_or_index[1:]
+        else:
+            properties = modelable_entity.properties
+            nested_property_name_or_index = self.nested_property_name_or_index
+
+        if properties:
+            value = properties
+            for name in nested_property_name_or_index:
+                if (isinstance(value, dict) and (name in value)) \
+                    or (isinstance(value, list) and isinstance(name, int) and (name < len(value))):
+                    value = value[name]
+                    if isinstance(value, Parameter):
+                        context.modeling.record_parameter_dependency(value)
+                        value = value.value
+                    value = evaluate(context, modelable_entity, value)
+                else:
+                    return False, None
+            return True, value
+
+        return False, None
+
 #
 # Attribute
 #
@@ -320,7 +331,17 @@ class GetNodesOfType(Function):
         return {'get_nodes_of_type': node_type_name}
 
     def _evaluate(self, context, container):
-        pass
+        # The nodes are only known for the service instance
+        if (context.modeling.instance is None) or isinstance(container, ModelElement) \
+            or (context.presentation.presenter is None):
+            raise CannotEvaluateFunctionException()
+        node_type_name = evaluate(context, container, self.node_type_name)
+        node_templates = context.presentation.presenter._get_topology_index(context) \
+            .node_templates_by_type.get(node_type_name, ())
+        instance_index = context.modeling.instance_index
+        return FrozenList(node.id
+                          for node_template in node_templates
+                          for node in instance_index.find_nodes(node_template._name))
 
 #
 # Artifact
@@ -366,6 +387,16 @@ class GetArtifact(Function):
 # Utils
 #
 
+def evaluate(context, container, value):
+    """
+    Evaluates the value if it's a function, via the evaluation graph (so that it's memoized and
+    cycles are detected).
+    """
+
+    if hasattr(value, '_evaluate'):
+        return context.modeling.evaluation_graph.evaluate_function(context, container, value)
+    return value
+
 def get_function(context, presentation, value):
     functions = context.presentation.presenter.functions
     if isinstance(value, dict) and (len(value) == 1):
@@ -463,22 +494,37 @@ def get_modelable_entities(context, container, locator, modelable_entity_name):
     elif modelable_entity_name == 'TARGET':
         return get_target(context, container)
     elif isinstance(modelable_entity_name, basestring):
-        node_templates = \
-            context.presentation.get('service_template', 'topology_template', 'node_templates') \
-            or {}
-        if modelable_entity_name in node_templates:
-            return [node_templates[modelable_entity_name]]
-        relationship_templates = \
-            context.presentation.get('service_template', 'topology_template',
-                                     'relationship_templates') \
-            or {}
-        if modelable_entity_name in relationship_templates:
-            return [relationship_templates[modelable_entity_name]]
+        modelable_entities = get_named_modelable_entities(context, container,
+                                                          modelable_entity_name)
+        if modelable_entities:
+            return modelable_entities
 
     raise InvalidValueError('function "get_property" could not find modelable entity "%s"'
                             % modelable_entity_name,
                             locator=locator)
 
+def get_named_modelable_entities(context, container, modelable_entity_name):
+    """
+    Node or relationship template name: the model elements (node templates or relationship
+    templates) while modeling, or the instance elements created from them (nodes or relationships)
+    when evaluating for the service instance.
+
+    Returns an empty list if there are no such elements.
+    """
+
+    if (context.modeling.instance is not None) and (not isinstance(container, ModelElement)):
+        instance_index = context.modeling.instance_index
+        return instance_index.find_nodes(modelable_entity_name) \
+            or instance_index.find_relationships(modelable_entity_name)
+
+    model = context.modeling.model
+    if model is None:
+        return []
+    node_template = model.node_templates.get(modelable_entity_name)
+    if node_template is not None:
+        return [node_template]
+    return context.modeling.node_template_index.get_relationship_templates(modelable_entity_name)
+
 def get_self(context, container): # pylint: disable=unused-argument
     """
     A TOSCA orchestrator will interpret this keyword as the Node or Relationship Template instance
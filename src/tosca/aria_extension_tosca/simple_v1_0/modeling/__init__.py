@@ -21,7 +21,8 @@ from aria.modeling import (Type, RelationshipType, PolicyType, ServiceModel, Nod
                            InterfaceTemplate, OperationTemplate, ArtifactTemplate, Metadata,
                            Parameter)
 
-from ..data_types import coerce_value
+from ..functions import evaluate
+from .data_types import coerce_value
 
 def create_service_model(context): # pylint: disable=too-many-locals,too-many-branches
     model = ServiceModel()
@@ -131,8 +132,8 @@ def create_node_template(context, node_template):
             model.capability_templates[capability_name] = create_capability_template(context,
                                                                                      capability)
 
-    create_node_filter_constraint_lambdas(context, node_template.node_filter,
-                                          model.target_node_template_constraints)
+    create_node_filter_constraints(context, node_template.node_filter,
+                                   model.target_node_template_constraints)
 
     return model
 
@@ -219,8 +220,8 @@ def create_requirement_template(context, requirement):
 
     model = RequirementTemplate(**model)
 
-    create_node_filter_constraint_lambdas(context, requirement.node_filter,
-                                          model.target_node_template_constraints)
+    create_node_filter_constraints(context, requirement.node_filter,
+                                   model.target_node_template_constraints)
 
     relationship = requirement.relationship
     if relationship is not None:
@@ -355,17 +356,17 @@ def create_interface_templates(context, interfaces, source_interfaces):
             if interface is not None:
                 interfaces[interface_name] = interface
 
-def create_node_filter_constraint_lambdas(context, node_filter, node_type_constraints):
+def create_node_filter_constraints(context, node_filter, target_node_template_constraints):
     if node_filter is None:
         return
 
     properties = node_filter.properties
     if properties is not None:
         for property_name, constraint_clause in properties:
-            func = create_constraint_clause_lambda(context, node_filter, constraint_clause,
-                                                   property_name, None)
-            if func is not None:
-                node_type_constraints.append(func)
+            constraint = create_node_filter_constraint(context, node_filter, constraint_clause,
+                                                       property_name, None)
+            if constraint is not None:
+                target_node_template_constraints.append(constraint)
 
     capabilities = node_filter.capabilities
     if capabilities is not None:
@@ -373,125 +374,132 @@ def create_node_filter_constraint_lambdas(context, node_filter, node_type_constr
             properties = capability.properties
             if properties is not None:
                 for property_name, constraint_clause in properties:
-                    func = create_constraint_clause_lambda(context, node_filter, constraint_clause,
-                                                           property_name, capability_name)
-                    if func is not None:
-                        node_type_constraints.append(func)
-
-def create_constraint_clause_lambda(context, node_filter, constraint_clause, property_name, # pylint: disable=too-many-return-statements
-                                    capability_name):
-    constraint_key = constraint_clause._raw.keys()[0]
+                    constraint = create_node_filter_constraint(context, node_filter,
+                                                               constraint_clause, property_name,
+                                                               capability_name)
+                    if constraint is not None:
+                        target_node_template_constraints.append(constraint)
+
+def create_node_filter_constraint(context, node_filter, constraint_clause, property_name,
+                                  capability_name):
+    operator = constraint_clause._raw.keys()[0]
+    if operator not in NodeFilterConstraint.OPERATORS:
+        return None
+
     the_type = constraint_clause._get_type(context)
 
-    def coerce_constraint(constraint, container):
-        constraint = coerce_value(context, node_filter, the_type, None, None, constraint,
-                                  constraint_key) if the_type is not None else constraint
-        if hasattr(constraint, '_evaluate'):
-            constraint = constraint._evaluate(context, container)
+    def coerce_constraint(constraint):
+        if the_type is not None:
+            return coerce_value(context, node_filter, the_type, None, None, constraint, operator)
         return constraint
 
-    def get_value(node_type):
-        if capability_name is not None:
-            capability = node_type.capability_templates.get(capability_name)
-            prop = capability.properties.get(property_name) if capability is not None else None
-            return prop.value if prop is not None else None
-        value = node_type.properties.get(property_name)
-        return value.value if value is not None else None
-
-    if constraint_key == 'equal':
-        def equal(node_type, container):
-            constraint = coerce_constraint(constraint_clause.equal, container)
-            value = get_value(node_type)
-            return value == constraint
-
-        return equal
-
-    elif constraint_key == 'greater_than':
-        def greater_than(node_type, container):
-            constraint = coerce_constraint(constraint_clause.greater_than, container)
-            value = get_value(node_type)
-            return value > constraint
-
-        return greater_than
-
-    elif constraint_key == 'greater_or_equal':
-        def greater_or_equal(node_type, container):
-            constraint = coerce_constraint(constraint_clause.greater_or_equal, container)
-            value = get_value(node_type)
-            return value >= constraint
-
-        return greater_or_equal
-
-    elif constraint_key == 'less_than':
-        def less_than(node_type, container):
-            constraint = coerce_constraint(constraint_clause.less_than, container)
-            value = get_value(node_type)
-            return value < constraint
-
-        return less_than
-
-    elif constraint_key == 'less_or_equal':
-        def less_or_equal(node_type, container):
-            constraint = coerce_constraint(constraint_clause.less_or_equal, container)
-            value = get_value(node_type)
-            return value <= constraint
-
-        return less_or_equal
-
-    elif constraint_key == 'in_range':
-        def in_range(node_type, container):
-            lower, upper = constraint_clause.in_range
-            lower, upper = coerce_constraint(lower, container), coerce_constraint(upper, container)
-            value = get_value(node_type)
-            if value < lower:
-                return False
-            if (upper != 'UNBOUNDED') and (value > upper):
-                return False
-            return True
-
-        return in_range
-
-    elif constraint_key == 'valid_values':
-        def valid_values(node_type, container):
-            constraint = tuple(coerce_constraint(v, container)
-                               for v in constraint_clause.valid_values)
-            value = get_value(node_type)
-            return value in constraint
-
-        return valid_values
-
-    elif constraint_key == 'length':
-        def length(node_type, container): # pylint: disable=unused-argument
-            constraint = constraint_clause.length
-            value = get_value(node_type)
-            return len(value) == constraint
-
-        return length
-
-    elif constraint_key == 'min_length':
-        def min_length(node_type, container): # pylint: disable=unused-argument
-            constraint = constraint_clause.min_length
-            value = get_value(node_type)
-            return len(value) >= constraint
-
-        return min_length
-
-    elif constraint_key == 'max_length':
-        def max_length(node_type, container): # pylint: disable=unused-argument
-            constraint = constraint_clause.max_length
-            value = get_value(node_type)
-            return len(value) >= constraint
-
-        return max_length
-
-    elif constraint_key == 'pattern':
-        def pattern(node_type, container): # pylint: disable=unused-argument
-            constraint = constraint_clause.pattern
-            # Note: the TOSCA 1.0 spec does not specify the regular expression grammar, so we will
-            # just use Python's
-            value = node_type.properties.get(property_name)
-            return re.match(constraint, str(value)) is not None
-
-        return pattern
-
-    return None
+    constraint = getattr(constraint_clause, operator)
+    if operator == 'in_range':
+        lower, upper = constraint
+        constraint = (coerce_constraint(lower),
+                      coerce_constraint(upper) if upper != 'UNBOUNDED' else upper)
+    elif operator == 'valid_values':
+        constraint = tuple(coerce_constraint(v) for v in constraint)
+    elif operator not in ('length', 'min_length', 'max_length', 'pattern'):
+        constraint = coerce_constraint(constraint)
+
+    return NodeFilterConstraint(property_name, capability_name, operator, constraint)
+
+class NodeFilterConstraint(object):
+    """
+    A node filter constraint clause applied to the properties of target node templates.
+
+    The constraint is coerced when the model is created, so that only intrinsic functions in it
+    need to be evaluated when applied. Unlike a closure, it can be pickled (for snapshots).
+
+    Equality, valid values and range constraints can also be answered by a
+    :class:`aria.modeling.NodeTemplateIndex` (see :code:`select`), so that finding requirement
+    targets does not require applying them to every node template.
+    """
+
+    # Note: the TOSCA 1.0 spec does not specify the regular expression grammar for "pattern", so we
+    # will just use Python's
+    OPERATORS = {
+        'equal': lambda value, constraint: value == constraint,
+        'greater_than': lambda value, constraint: value > constraint,
+        'greater_or_equal': lambda value, constraint: value >= constraint,
+        'less_than': lambda value, constraint: value < constraint,
+        'less_or_equal': lambda value, constraint: value <= constraint,
+        'in_range': lambda value, constraint: (value >= constraint[0]) and \
+            ((constraint[1] == 'UNBOUNDED') or (value <= constraint[1])),
+        'valid_values': lambda value, constraint: value in constraint,
+        'length': lambda value, constraint: len(value) == constraint,
+        'min_length': lambda value, constraint: len(value) >= constraint,
+        'max_length': lambda value, constraint: len(value) <= constraint,
+        'pattern': lambda value, constraint: re.match(constraint, str(value)) is not None}
+
+    # Queries of a :class:`aria.modeling.ValueIndex` for the operators that can be answered by it
+    SELECTORS = {
+        'equal': lambda index, constraint: index.select_equal(constraint),
+        'valid_values': lambda index, constraint: index.select_equal_any(constraint),
+        'greater_than': lambda index, constraint: index.select_range(lower=constraint,
+                                                                     include_lower=False),
+        'greater_or_equal': lambda index, constraint: index.select_range(lower=constraint),
+        'less_than': lambda index, constraint: index.select_range(upper=constraint,
+                                                                  include_upper=False),
+        'less_or_equal': lambda index, constraint: index.select_range(upper=constraint),
+        'in_range': lambda index, constraint: select_in_range(index, *constraint)}
+
+    def __init__(self, property_name, capability_name, operator, constraint):
+        self.property_name = property_name
+        self.capability_name = capability_name
+        self.operator = operator
+        self.constraint = constraint
+
+    @property
+    def as_raw(self):
+        name = self.property_name if self.capability_name is None \
+            else '%s.%s' % (self.capability_name, self.property_name)
+        return {name: {self.operator: self.constraint}}
+
+    def __call__(self, context, node_template, container):
+        constraint = self.constraint
+        if isinstance(constraint, tuple):
+            constraint = tuple(evaluate(context, container, v) for v in constraint)
+        else:
+            constraint = evaluate(context, container, constraint)
+        value = self.get_value(node_template)
+        return self.OPERATORS[self.operator](value, constraint)
+
+    def select(self, context, index): # pylint: disable=unused-argument
+        """
+        Returns the positions of the node templates in the index that may match, or None if the
+        constraint cannot be answered by the index.
+
+        Constraints with intrinsic functions are not indexed, because their values depend on the
+        container.
+        """
+
+        selector = self.SELECTORS.get(self.operator)
+        if selector is None:
+            return None
+
+        constraint = self.constraint
+        values = constraint if isinstance(constraint, tuple) else (constraint,)
+        if any(hasattr(v, '_evaluate') for v in values):
+            return None
+
+        value_index = index.get_value_index((self.capability_name, self.property_name),
+                                            self.get_value)
+        return selector(value_index, constraint)
+
+    def get_value(self, node_template):
+        if self.capability_name is not None:
+            capability = node_template.capability_templates.get(self.capability_name)
+            prop = capability.properties.get(self.property_name) \
+                if capability is not None else None
+        else:
+            prop = node_template.properties.get(self.property_name)
+        return prop.value if prop is not None else None
+
+def select_in_range(value_index, lower, upper):
+    if upper == 'UNBOUNDED':
+        upper = None
+    elif upper is None:
+        return None
+    return value_index.select_range(lower, upper) if lower is not None else None
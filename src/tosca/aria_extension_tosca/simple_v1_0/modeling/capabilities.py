@@ -44,20 +44,22 @@ def get_inherited_valid_source_types(context, presentation):
 # NodeType
 #
 
-def get_inherited_capability_definitions(context, presentation, for_presentation=None):
+def get_inherited_capability_definitions(context, presentation):
     """
     Returns our capability capability definitions added on top of those of our parent, if we have
-    one (recursively).
+    one.
+
+    The parent's definitions are taken from its own cached table (:code:`_get_capabilities`), so
+    that every type is resolved only once. Inherited definitions are shared with the parent's
+    table, and are only cloned if we override them.
 
     Allows overriding all aspects of parent capability properties except data type.
     """
 
     # Get capability definitions from parent
     parent = presentation._get_parent(context)
-    capability_definitions = get_inherited_capability_definitions(context, parent,
-                                                                  for_presentation=presentation) \
-                                                                  if parent is not None \
-                                                                  else OrderedDict()
+    capability_definitions = OrderedDict(parent._get_capabilities(context)) \
+        if parent is not None else OrderedDict()
 
     # Add/merge our capability definitions
     our_capability_definitions = presentation.capabilities
@@ -75,17 +77,14 @@ def get_inherited_capability_definitions(context, presentation, for_presentation
                         % (type1, type2, presentation._fullname),
                         locator=our_capability_definition._locator, level=Issue.BETWEEN_TYPES)
 
-                # Already cloned?
-                #capability_definition = capability_definition._clone(for_presentation)
-                #capability_definitions[capability_name] = capability_definition
+                # The inherited definition may be shared, so we merge into a clone
+                capability_definition = capability_definition._clone()
             else:
-                capability_definition = our_capability_definition._clone(for_presentation)
-                capability_definitions[capability_name] = capability_definition
+                capability_definition = our_capability_definition._clone(presentation)
+            capability_definitions[capability_name] = capability_definition
 
             merge_capability_definition_from_type(context, presentation, capability_definition)
-
-    for capability_definition in capability_definitions.itervalues():
-        capability_definition._reset_method_cache()
+            capability_definition._reset_method_cache()
 
     return capability_definitions
 
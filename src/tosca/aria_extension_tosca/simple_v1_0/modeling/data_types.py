@@ -197,112 +197,173 @@ def get_property_constraints(context, presentation):
 # ConstraintClause
 #
 
-def apply_constraint_to_value(context, presentation, constraint_clause, value): # pylint: disable=too-many-statements,too-many-return-statements,too-many-branches
+def apply_constraint_to_value(context, presentation, constraint_clause, value):
     """
     Returns false if the value does not conform to the constraint.
     """
 
-    constraint_key = constraint_clause._raw.keys()[0]
-    the_type = constraint_clause._get_type(context)
+    violation = get_constraint_predicate(context, presentation, constraint_clause).check(value)
+    if violation is None:
+        return True
+
+    report_constraint_violation(context, presentation, violation, value)
+    return False
+
+def report_constraint_violation(context, presentation, violation, value, key=None):
+    """
+    Reports a violation returned by :code:`ConstraintPredicate.check`. The key is the index or key
+    of the value if it is an entry in a list or map.
+    """
+
+    message, constraint = violation
+    name = presentation._name or presentation._container._name
+    if key is not None:
+        name = '%s[%s]' % (name, key)
+    context.validation.report('value %s %s per constraint in "%s": %s'
+                              % (message, safe_repr(constraint), name, safe_repr(value)),
+                              locator=presentation._locator, level=Issue.BETWEEN_FIELDS)
+
+def get_constraint_predicate(context, presentation, constraint_clause):
+    """
+    Returns the :class:`ConstraintPredicate` for the constraint clause, compiling it on first use.
+
+    Predicates are cached on the clause per entry schema (which affects the coercion of operands),
+    so they are shared by all properties that use the clause.
+    """
+
     # PropertyAssignment does not have this:
     entry_schema = getattr(presentation, 'entry_schema', None)
+    try:
+        predicates = constraint_clause._predicates
+    except AttributeError:
+        predicates = constraint_clause._predicates = {}
+    predicate = predicates.get(entry_schema)
+    if predicate is None:
+        predicate = compile_constraint(context, presentation, constraint_clause, entry_schema)
+        predicate = predicates.setdefault(entry_schema, predicate)
+    return predicate
+
+def compile_constraint(context, presentation, constraint_clause, entry_schema):
+    """
+    Returns a :class:`ConstraintPredicate` for the constraint clause, with its operands coerced to
+    the clause's type.
+    """
+
+    operator = constraint_clause._raw.keys()[0]
+    the_type = constraint_clause._get_type(context)
 
     def coerce_constraint(constraint):
         return coerce_value(context, presentation, the_type, entry_schema, None, constraint,
-                            constraint_key)
-
-    def report(message, constraint):
-        context.validation.report('value %s %s per constraint in "%s": %s'
-                                  % (message, safe_repr(constraint),
-                                     presentation._name or presentation._container._name,
-                                     safe_repr(value)),
-                                  locator=presentation._locator, level=Issue.BETWEEN_FIELDS)
-
-    if constraint_key == 'equal':
-        constraint = coerce_constraint(constraint_clause.equal)
-        if value != constraint:
-            report('is not equal to', constraint)
-            return False
-
-    elif constraint_key == 'greater_than':
-        constraint = coerce_constraint(constraint_clause.greater_than)
-        if value <= constraint:
-            report('is not greater than', constraint)
-            return False
-
-    elif constraint_key == 'greater_or_equal':
-        constraint = coerce_constraint(constraint_clause.greater_or_equal)
-        if value < constraint:
-            report('is not greater than or equal to', constraint)
-            return False
-
-    elif constraint_key == 'less_than':
-        constraint = coerce_constraint(constraint_clause.less_than)
-        if value >= constraint:
-            report('is not less than', constraint)
-            return False
-
-    elif constraint_key == 'less_or_equal':
-        constraint = coerce_constraint(constraint_clause.less_or_equal)
-        if value > constraint:
-            report('is not less than or equal to', constraint)
-            return False
-
-    elif constraint_key == 'in_range':
+                            operator)
+
+    if operator == 'in_range':
         lower, upper = constraint_clause.in_range
-        lower, upper = coerce_constraint(lower), coerce_constraint(upper)
-        if value < lower:
-            report('is not greater than or equal to lower bound', lower)
-            return False
-        if (upper != 'UNBOUNDED') and (value > upper):
-            report('is not lesser than or equal to upper bound', upper)
-            return False
-
-    elif constraint_key == 'valid_values':
+        constraint = (coerce_constraint(lower),
+                      coerce_constraint(upper) if upper != 'UNBOUNDED' else upper)
+    elif operator == 'valid_values':
         constraint = tuple(coerce_constraint(v) for v in constraint_clause.valid_values)
-        if value not in constraint:
-            report('is not one of', constraint)
-            return False
+    elif operator in ('length', 'min_length', 'max_length', 'pattern'):
+        constraint = getattr(constraint_clause, operator)
+    else:
+        constraint = coerce_constraint(getattr(constraint_clause, operator))
 
-    elif constraint_key == 'length':
-        constraint = constraint_clause.length
-        try:
-            if len(value) != constraint:
-                report('is not of length', constraint)
-                return False
-        except TypeError:
-            pass # should be validated elsewhere
-
-    elif constraint_key == 'min_length':
-        constraint = constraint_clause.min_length
-        try:
-            if len(value) < constraint:
-                report('has a length lesser than', constraint)
-                return False
-        except TypeError:
-            pass # should be validated elsewhere
-
-    elif constraint_key == 'max_length':
-        constraint = constraint_clause.max_length
-        try:
-            if len(value) > constraint:
-                report('has a length greater than', constraint)
-                return False
-        except TypeError:
-            pass # should be validated elsewhere
-
-    elif constraint_key == 'pattern':
-        constraint = constraint_clause.pattern
-        try:
-            # Note: the TOSCA 1.0 spec does not specify the regular expression grammar, so we will
-            # just use Python's
-            if re.match(constraint, str(value)) is None:
-                report('does not match regular expression', constraint)
-                return False
-        except re.error:
-            pass # should be validated elsewhere
+    return ConstraintPredicate(operator, constraint)
 
-    return True
+class ConstraintPredicate(object):
+    """
+    A compiled :class:`ConstraintClause`: call it with a value to check whether the value conforms.
+
+    The operands are already coerced, "valid_values" of primitive types are looked up in a
+    frozenset, and "pattern" is a compiled regular expression.
+    """
+
+    MESSAGES = {
+        'equal': 'is not equal to',
+        'greater_than': 'is not greater than',
+        'greater_or_equal': 'is not greater than or equal to',
+        'less_than': 'is not less than',
+        'less_or_equal': 'is not less than or equal to',
+        'valid_values': 'is not one of',
+        'length': 'is not of length',
+        'min_length': 'has a length lesser than',
+        'max_length': 'has a length greater than',
+        'pattern': 'does not match regular expression'}
+
+    HASHABLE_TYPES = (basestring, int, long, float, bool)
+
+    def __init__(self, operator, constraint):
+        self.operator = operator
+        self.constraint = constraint
+        self._valid_values = None
+        self._pattern = None
+
+        if (operator == 'valid_values') \
+            and all(isinstance(v, self.HASHABLE_TYPES) for v in constraint):
+            self._valid_values = frozenset(constraint)
+        elif operator == 'pattern':
+            try:
+                # Note: the TOSCA 1.0 spec does not specify the regular expression grammar, so we
+                # will just use Python's
+                self._pattern = re.compile(constraint)
+            except re.error:
+                pass # should be validated elsewhere
+
+    def __call__(self, value):
+        return self.check(value) is None
+
+    def check(self, value): # pylint: disable=too-many-return-statements,too-many-branches
+        """
+        Returns None if the value conforms, otherwise a (message, constraint) tuple describing the
+        violation.
+        """
+
+        operator = self.operator
+        constraint = self.constraint
+
+        if operator == 'in_range':
+            lower, upper = constraint
+            if value < lower:
+                return 'is not greater than or equal to lower bound', lower
+            if (upper != 'UNBOUNDED') and (value > upper):
+                return 'is not lesser than or equal to upper bound', upper
+            return None
+
+        if operator == 'equal':
+            conforms = value == constraint
+        elif operator == 'greater_than':
+            conforms = value > constraint
+        elif operator == 'greater_or_equal':
+            conforms = value >= constraint
+        elif operator == 'less_than':
+            conforms = value < constraint
+        elif operator == 'less_or_equal':
+            conforms = value <= constraint
+        elif operator == 'valid_values':
+            conforms = None
+            if self._valid_values is not None:
+                try:
+                    conforms = value in self._valid_values
+                except TypeError:
+                    pass # unhashable value
+            if conforms is None:
+                conforms = value in constraint
+        elif operator in ('length', 'min_length', 'max_length'):
+            try:
+                length = len(value)
+            except TypeError:
+                return None # should be validated elsewhere
+            if operator == 'length':
+                conforms = length == constraint
+            elif operator == 'min_length':
+                conforms = length >= constraint
+            else:
+                conforms = length <= constraint
+        elif operator == 'pattern':
+            conforms = (self._pattern is None) or (self._pattern.match(str(value)) is not None)
+        else:
+            conforms = True
+
+        return None if conforms else (self.MESSAGES[operator], constraint)
 
 #
 # Repository
@@ -402,6 +463,59 @@ def coerce_value(context, presentation, the_type, entry_schema, constraints, val
     # Coerce to primitive type
     return coerce_to_primitive(context, presentation, the_type, constraints, value, aspect)
 
+def coerce_entries(context, presentation, entry_schema, entries, aspect=None):
+    """
+    Coerces the entries of a list or map to the entry schema, yielding (index or key, value) tuples
+    for the entries that could be coerced.
+
+    The entry type and the compiled constraints are resolved once for all entries. Primitive types
+    are coerced in a tight loop, with constraint violations reported per index or key. Other types
+    are coerced with :code:`coerce_value`.
+    """
+
+    the_type = entry_schema._get_type(context)
+    constraints = entry_schema.constraints
+
+    if (the_type is None) or (the_type == None.__class__) \
+        or hasattr(the_type, '_get_extension') or hasattr(the_type, '_coerce_value'):
+        for key, value in entries:
+            yield key, coerce_value(context, presentation, the_type, None, constraints, value,
+                                    aspect)
+        return
+
+    predicates = [get_constraint_predicate(context, presentation, v) for v in constraints] \
+        if constraints is not None else ()
+    allow_primitive_coersion = context.validation.allow_primitive_coersion
+    for key, value in entries:
+        if isinstance(value, dict):
+            is_function, func = get_function(context, presentation, value)
+            if is_function:
+                yield key, func
+                continue
+
+        if value is None:
+            yield key, None
+            continue
+
+        try:
+            value = validate_primitive(value, the_type, allow_primitive_coersion)
+        except (ValueError, TypeError) as e:
+            report_issue_for_bad_format(context, presentation, the_type, value, aspect, e)
+            yield key, None
+            continue
+
+        try:
+            for predicate in predicates:
+                violation = predicate.check(value)
+                if violation is not None:
+                    report_constraint_violation(context, presentation, violation, value, key)
+        except TypeError as e:
+            report_issue_for_bad_format(context, presentation, the_type, value, aspect, e)
+            yield key, None
+            continue
+
+        yield key, value
+
 def coerce_to_primitive(context, presentation, primitive_type, constraints, value, aspect=None):
     """
     Returns the value after it's coerced to a primitive type, translating exceptions to validation
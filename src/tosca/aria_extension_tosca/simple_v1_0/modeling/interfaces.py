@@ -15,8 +15,8 @@
 
 from collections import OrderedDict
 
-from aria.presentation import get_locator
-from aria.utils import (merge, deepcopy_with_locators)
+from aria.presentation import (Value, get_locator)
+from aria.utils import (FrozenDict, merge, deepcopy_with_locators, copy_raw_value)
 from aria.validation import Issue
 
 from .properties import (coerce_property_value, convert_property_definitions_to_values)
@@ -102,10 +102,14 @@ def get_and_override_operation_definitions_from_type(context, presentation):
 # NodeType, RelationshipType, GroupType
 #
 
-def get_inherited_interface_definitions(context, presentation, type_name, for_presentation=None):
+def get_inherited_interface_definitions(context, presentation):
     """
-    Returns our interface definitions added on top of those of our parent, if we have one
-    (recursively).
+    Returns our interface definitions added on top of those of our parent, if we have one.
+
+    The parent's definitions are taken from its own cached table (:code:`_get_interfaces`), so
+    that the hierarchy is not walked again for every type. Unlike inherited property and capability
+    definitions, they are not shared with the parent's table: the interface types are merged into
+    them at every level, so they are all cloned.
 
     Allows overriding all aspects of parent interfaces except interface and operation input data
     types.
@@ -113,7 +117,8 @@ def get_inherited_interface_definitions(context, presentation, type_name, for_pr
 
     # Get interfaces from parent
     parent = presentation._get_parent(context)
-    interfaces = get_inherited_interface_definitions(context, parent, type_name, presentation) \
+    interfaces = OrderedDict((k, v._clone(presentation))
+                             for k, v in parent._get_interfaces(context).iteritems()) \
         if parent is not None else OrderedDict()
 
     # Add/merge interfaces from their types
@@ -121,8 +126,7 @@ def get_inherited_interface_definitions(context, presentation, type_name, for_pr
 
     # Add/merge our interfaces
     our_interfaces = presentation.interfaces
-    merge_interface_definitions(context, interfaces, our_interfaces, presentation,
-                                for_presentation=for_presentation)
+    merge_interface_definitions(context, interfaces, our_interfaces, presentation)
 
     return interfaces
 
@@ -199,9 +203,53 @@ def convert_interface_definition_from_type_to_template(context, presentation, co
         # Nothing to convert, so just clone
         return presentation._clone(container)
 
-    raw = convert_interface_definition_from_type_to_raw_template(context, presentation)
+    # The type's table is resolved only once, so we just need our own copy to assign values into
+    raw = copy_raw_interface_template(presentation._get_raw_template(context))
     return InterfaceAssignment(name=presentation._name, raw=raw, container=container)
 
+def get_raw_interface_template(context, presentation):
+    """
+    Returns the interface definition converted to a raw interface template (see
+    :func:`convert_interface_definition_from_type_to_raw_template`), frozen so that it can be
+    shared by all templates of the type.
+
+    Use :func:`copy_raw_interface_template` to get a copy that can be modified.
+    """
+
+    raw = convert_interface_definition_from_type_to_raw_template(context, presentation)
+    for key, value in raw.iteritems():
+        if isinstance(value, dict):
+            if 'inputs' in value:
+                value['inputs'] = FrozenDict(value['inputs'])
+            raw[key] = FrozenDict(value)
+    return FrozenDict(raw)
+
+def copy_raw_interface_template(raw):
+    """
+    Copies a raw interface template, such that its interface and operation dicts and its input
+    values can be modified without affecting the original.
+    """
+
+    the_copy = OrderedDict()
+    for key, value in raw.iteritems():
+        if key == 'inputs':
+            the_copy[key] = copy_raw_values(value)
+        elif isinstance(value, dict):
+            the_copy[key] = OrderedDict()
+            for operation_key, operation_value in value.iteritems():
+                if operation_key == 'inputs':
+                    the_copy[key][operation_key] = copy_raw_values(operation_value)
+                else:
+                    the_copy[key][operation_key] = copy_raw_value(operation_value)
+        else:
+            the_copy[key] = copy_raw_value(value)
+    return the_copy
+
+def copy_raw_values(values):
+    if values is None:
+        return None
+    return OrderedDict((k, Value(v.type, v.value, v.description)) for k, v in values.iteritems())
+
 def convert_interface_definition_from_type_to_raw_template(context, presentation): # pylint: disable=invalid-name
     raw = OrderedDict()
 
@@ -26,10 +26,13 @@ from .data_types import coerce_value
 #
 
 # Works on properties, parameters, inputs, and attributes
-def get_inherited_property_definitions(context, presentation, field_name, for_presentation=None):
+def get_inherited_property_definitions(context, presentation, field_name):
     """
-    Returns our property definitions added on top of those of our parent, if we have one
-    (recursively).
+    Returns our property definitions added on top of those of our parent, if we have one.
+
+    The parent's definitions are taken from its own cached table (e.g. :code:`_get_properties`),
+    so that every type is resolved only once. Inherited definitions are shared with the parent's
+    table, and are only cloned if we override them.
 
     Allows overriding all aspects of parent properties except data type.
     """
@@ -37,22 +40,17 @@ def get_inherited_property_definitions(context, presentation, field_name, for_pr
     # Get definitions from parent
     # If we inherit from a primitive, it does not have a parent:
     parent = presentation._get_parent(context) if hasattr(presentation, '_get_parent') else None
-    definitions = get_inherited_property_definitions(context, parent, field_name,
-                                                     for_presentation=presentation) \
-                                                     if parent is not None else OrderedDict()
+    if parent is None:
+        definitions = OrderedDict()
+    elif hasattr(parent, '_get_%s' % field_name):
+        definitions = OrderedDict(getattr(parent, '_get_%s' % field_name)(context))
+    else:
+        definitions = get_inherited_property_definitions(context, parent, field_name)
 
     # Add/merge our definitions
     # If we inherit from a primitive, it does not have our field
     our_definitions = getattr(presentation, field_name, None)
-    if our_definitions:
-        our_definitions_clone = OrderedDict()
-        for name, our_definition in our_definitions.iteritems():
-            our_definitions_clone[name] = our_definition._clone(for_presentation)
-        our_definitions = our_definitions_clone
-        merge_property_definitions(context, presentation, definitions, our_definitions, field_name)
-
-    for definition in definitions.itervalues():
-        definition._reset_method_cache()
+    merge_property_definitions(context, presentation, definitions, our_definitions, field_name)
 
     return definitions
 
@@ -173,9 +171,12 @@ def merge_property_definitions(context, presentation, property_definitions,
         return
     for property_name, our_property_definition in our_property_definitions.iteritems():
         if property_name in property_definitions:
-            property_definition = property_definitions[property_name]
+            # The inherited definition may be shared, so we merge into a clone
+            property_definition = property_definitions[property_name]._clone()
             merge_raw_property_definition(context, presentation, property_definition._raw,
                                           our_property_definition, field_name, property_name)
+            property_definition._reset_method_cache()
+            property_definitions[property_name] = property_definition
         else:
             property_definitions[property_name] = our_property_definition
 
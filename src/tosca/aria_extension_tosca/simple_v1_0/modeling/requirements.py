@@ -16,7 +16,7 @@
 from collections import OrderedDict
 
 from aria.validation import Issue
-from aria.utils import deepcopy_with_locators
+from aria.utils import SequencedDict, deepcopy_with_locators
 
 from .properties import (convert_property_definitions_to_values, validate_required_values,
                          coerce_property_value)
@@ -29,25 +29,23 @@ from .interfaces import (convert_requirement_interface_definitions_from_type_to_
 
 def get_inherited_requirement_definitions(context, presentation):
     """
-    Returns our requirement definitions added on top of those of our parent, if we have one
-    (recursively).
+    Returns our requirement definitions added on top of those of our parent, if we have one.
 
-    Allows overriding requirement definitions if they have the same name.
+    The parent's definitions are taken from its own cached table (:code:`_get_requirements`), so
+    that every type is resolved only once.
+
+    Allows overriding requirement definitions if they have the same name: the overriding definition
+    replaces the existing one and is moved to the end.
     """
 
     parent = presentation._get_parent(context)
-    requirement_definitions = get_inherited_requirement_definitions(context, parent) \
-        if parent is not None else []
+    requirement_definitions = SequencedDict(parent._get_requirements(context)) \
+        if parent is not None else SequencedDict()
 
     our_requirement_definitions = presentation.requirements
     if our_requirement_definitions:
         for requirement_name, our_requirement_definition in our_requirement_definitions:
-            # Remove existing requirement definitions of this name if they exist
-            for name, requirement_definition in requirement_definitions:
-                if name == requirement_name:
-                    requirement_definitions.remove((name, requirement_definition))
-
-            requirement_definitions.append((requirement_name, our_requirement_definition))
+            requirement_definitions[requirement_name] = our_requirement_definition
 
     return requirement_definitions
 
@@ -66,10 +64,11 @@ def get_template_requirements(context, presentation):
     not assign them. Also makes sure that required properties and inputs indeed end up with a value.
     """
 
-    requirement_assignments = []
+    requirement_assignments = SequencedDict()
 
     the_type = presentation._get_type(context) # NodeType
-    requirement_definitions = the_type._get_requirements(context) if the_type is not None else None
+    requirement_definitions = the_type._get_requirements(context) \
+        if the_type is not None else None
 
     # Add our requirement assignments
     our_requirement_assignments = presentation.requirements
@@ -85,10 +84,7 @@ def get_template_requirements(context, presentation):
             allowed_occurrences = allowed_occurrences if allowed_occurrences is not None else None
 
             # Count actual occurrences
-            actual_occurrences = 0
-            for name, _ in requirement_assignments:
-                if name == requirement_name:
-                    actual_occurrences += 1
+            actual_occurrences = requirement_assignments.count(requirement_name)
 
             if allowed_occurrences is None:
                 # If not specified, we interpret this to mean that exactly 1 occurrence is required
@@ -104,7 +100,7 @@ def get_template_requirements(context, presentation):
                     validate_requirement_assignment(context, presentation, requirement_assignment,
                                                     relationship_property_definitions,
                                                     relationship_interface_definitions)
-                    requirement_assignments.append((requirement_name, requirement_assignment))
+                    requirement_assignments.append(requirement_name, requirement_assignment)
                 elif actual_occurrences > 1:
                     context.validation.report(
                         'requirement "%s" is allowed only one occurrence in "%s": %d'
@@ -224,7 +220,8 @@ def convert_requirement_from_definition_to_assignment(context, requirement_defin
 def add_requirement_assignments(context, presentation, requirement_assignments,
                                 requirement_definitions, our_requirement_assignments):
     for requirement_name, our_requirement_assignment in our_requirement_assignments:
-        requirement_definition = get_first_requirement(requirement_definitions, requirement_name)
+        requirement_definition = requirement_definitions.get(requirement_name) \
+            if requirement_definitions is not None else None
         if requirement_definition is not None:
             requirement_assignment, \
             relationship_property_definitions, \
@@ -242,7 +239,7 @@ def add_requirement_assignments(context, presentation, requirement_assignments,
                                             requirement_assignment,
                                             relationship_property_definitions,
                                             relationship_interface_definitions)
-            requirement_assignments.append((requirement_name, requirement_assignment))
+            requirement_assignments.append(requirement_name, requirement_assignment)
         else:
             context.validation.report('requirement "%s" not declared at node type "%s" in "%s"'
                                       % (requirement_name, presentation.type,
@@ -349,10 +346,3 @@ def validate_requirement_assignment(context, presentation, requirement_assignmen
                 if relationship.interfaces is not None else None
             validate_required_inputs(context, presentation, interface_assignment,
                                      relationship_interface_definition, None, interface_name)
-
-def get_first_requirement(requirement_definitions, name):
-    if requirement_definitions is not None:
-        for requirement_name, requirement_definition in requirement_definitions:
-            if requirement_name == name:
-                return requirement_definition
-    return None
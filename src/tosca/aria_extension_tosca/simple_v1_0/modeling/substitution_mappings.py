@@ -28,12 +28,7 @@ def validate_subtitution_mappings_requirement(context, presentation):
     if node_type is None:
         return
 
-    requirements = node_type._get_requirements(context)
-    type_requirement = None
-    for name, the_requirement in requirements:
-        if name == presentation._name:
-            type_requirement = the_requirement
-            break
+    type_requirement = node_type._get_requirements(context).get(presentation._name)
     if type_requirement is None:
         context.validation.report(
             'substitution mappings requirement "%s" is not declared in node type "%s"'
@@ -42,13 +37,7 @@ def validate_subtitution_mappings_requirement(context, presentation):
         return
 
     requirement_name = presentation._raw[1]
-    requirements = node_template._get_requirements(context)
-    requirement = None
-    for name, the_requirement in requirements:
-        if name == requirement_name:
-            requirement = the_requirement
-            break
-
+    requirement = node_template._get_requirements(context).get(requirement_name)
     if requirement is None:
         context.validation.report(
             'substitution mappings requirement "%s" refers to an unknown requirement of node '
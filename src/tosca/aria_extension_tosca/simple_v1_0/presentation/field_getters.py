@@ -18,7 +18,8 @@ from aria.utils import safe_repr
 
 def data_type_class_getter(cls):
     """
-    Wraps the field value in a specialized data type class.
+    Wraps the field value in a specialized data type class, using its :code:`_create` function if
+    available (for memoization).
 
     Can be used with the :func:`field_getter` decorator.
     """
@@ -27,6 +28,8 @@ def data_type_class_getter(cls):
         raw = field.default_get(presentation, context)
         if raw is not None:
             try:
+                if hasattr(cls, '_create'):
+                    return cls._create(context, presentation, None, None, raw, None)
                 return cls(None, None, raw, None)
             except ValueError as e:
                 raise InvalidValueError(
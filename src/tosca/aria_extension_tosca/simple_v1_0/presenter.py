@@ -14,8 +14,10 @@
 # limitations under the License.
 
 from aria.presentation import Presenter
-from aria.utils import (FrozenList, EMPTY_READ_ONLY_LIST, cachedmethod)
+from aria.utils import (FrozenList, EMPTY_READ_ONLY_LIST, FrozenDict, cachedmethod)
 
+from ..compiled_profiles import load_compiled_profile
+from .data_types import PARSED_VALUES
 from .functions import (Concat, Token, GetInput, GetProperty, GetAttribute, GetOperationOutput,
                         GetNodesOfType, GetArtifact)
 from .modeling import create_service_model
@@ -35,6 +37,9 @@ class ToscaSimplePresenter1_0(Presenter): # pylint: disable=invalid-name
     ALLOWED_IMPORTED_DSL_VERSIONS = ('tosca_simple_yaml_1_0',)
     SIMPLE_PROFILE_LOCATION = 'tosca-simple-1.0/tosca-simple-1.0.yaml'
 
+    # Included in _method_cache_info
+    _parsed_values = PARSED_VALUES
+
     @property
     @cachedmethod
     def service_template(self):
@@ -73,6 +78,44 @@ class ToscaSimplePresenter1_0(Presenter): # pylint: disable=invalid-name
             import_locations += [i.file for i in imports]
         return FrozenList(import_locations) if import_locations else EMPTY_READ_ONLY_LIST
 
+    @classmethod
+    def _get_compiled_import(cls, context, location, origin_location):
+        return load_compiled_profile(context, location, origin_location)
+
+    def _merge_import(self, presentation):
+        super(ToscaSimplePresenter1_0, self)._merge_import(presentation)
+        # Imports may add node and relationship templates, so the topology index (and anything else
+        # we cached) must be rebuilt
+        self._reset_method_cache()
+
     @cachedmethod
     def _get_service_model(self, context): # pylint: disable=no-self-use
         return create_service_model(context)
+
+    @cachedmethod
+    def _get_topology_index(self, context):
+        return TopologyIndex(context, self.service_template.topology_template)
+
+class TopologyIndex(object):
+    """
+    Index of the node templates of a topology template, built once so that functions can find them
+    with dict lookups.
+
+    * :code:`node_templates_by_type`: Dict of lists of :class:`NodeTemplate`, by the names of their
+      types and all their ancestor types
+    """
+
+    def __init__(self, context, topology_template):
+        node_templates = topology_template.node_templates \
+            if topology_template is not None else None
+
+        node_templates_by_type = {}
+        if node_templates:
+            for node_template in node_templates.itervalues():
+                the_type = node_template._get_type(context)
+                while the_type is not None:
+                    node_templates_by_type.setdefault(the_type._name, []).append(node_template)
+                    the_type = the_type._get_parent(context)
+
+        self.node_templates_by_type = FrozenDict((k, FrozenList(v))
+                                                 for k, v in node_templates_by_type.iteritems())
@@ -17,7 +17,7 @@ from aria import dsl_specification
 from aria.presentation import (has_fields, primitive_field, primitive_list_field, object_field,
                                object_list_field, object_dict_field, object_sequenced_list_field,
                                field_validator, type_validator, list_type_validator)
-from aria.utils import (FrozenDict, FrozenList, cachedmethod)
+from aria.utils import (FrozenDict, FrozenList, FrozenSequencedDict, cachedmethod)
 
 from .assignments import (PropertyAssignment, AttributeAssignment, RequirementAssignment,
                           CapabilityAssignment, InterfaceAssignment, ArtifactAssignment)
@@ -159,7 +159,7 @@ class NodeTemplate(ExtensiblePresentation):
 
     @cachedmethod
     def _get_requirements(self, context):
-        return FrozenList(get_template_requirements(context, self))
+        return FrozenSequencedDict(get_template_requirements(context, self))
 
     @cachedmethod
     def _get_capabilities(self, context):
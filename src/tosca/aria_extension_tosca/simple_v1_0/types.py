@@ -19,7 +19,7 @@ from aria.presentation import (has_fields, allow_unknown_fields, primitive_field
                                object_list_field, object_sequenced_list_field,
                                object_dict_unknown_fields, field_getter, field_validator,
                                list_type_validator, derived_from_validator, get_parent_presentation)
-from aria.utils import (FrozenDict, FrozenList, cachedmethod)
+from aria.utils import (FrozenDict, FrozenList, FrozenSequencedDict, cachedmethod)
 
 from .assignments import ArtifactAssignment
 from .data_types import Version
@@ -491,7 +491,7 @@ class RelationshipType(ExtensiblePresentation):
 
     @cachedmethod
     def _get_interfaces(self, context):
-        return FrozenDict(get_inherited_interface_definitions(context, self, 'relationship type'))
+        return FrozenDict(get_inherited_interface_definitions(context, self))
 
     def _validate(self, context):
         super(RelationshipType, self)._validate(context)
@@ -622,7 +622,7 @@ class NodeType(ExtensiblePresentation):
 
     @cachedmethod
     def _get_requirements(self, context):
-        return FrozenList(get_inherited_requirement_definitions(context, self))
+        return FrozenSequencedDict(get_inherited_requirement_definitions(context, self))
 
     @cachedmethod
     def _get_capabilities(self, context):
@@ -630,7 +630,7 @@ class NodeType(ExtensiblePresentation):
 
     @cachedmethod
     def _get_interfaces(self, context):
-        return FrozenDict(get_inherited_interface_definitions(context, self, 'node type'))
+        return FrozenDict(get_inherited_interface_definitions(context, self))
 
     @cachedmethod
     def _get_artifacts(self, context):
@@ -754,7 +754,7 @@ class GroupType(ExtensiblePresentation):
 
     @cachedmethod
     def _get_interfaces(self, context):
-        return FrozenDict(get_inherited_interface_definitions(context, self, 'group type'))
+        return FrozenDict(get_inherited_interface_definitions(context, self))
 
     def _validate(self, context):
         super(GroupType, self)._validate(context)